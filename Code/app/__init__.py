@@ -14,8 +14,8 @@ def strip_html(text):
     """Remove HTML tags from text"""
     if not text:
         return ''
-    # Remove HTML tags
-    clean = re.sub(r'<[^>]+>', ' ', text)
+    # Remove HTML tags (and a trailing tag cut off by a snippet)
+    clean = re.sub(r'<[^>]+>|</?[A-Za-z][^<>]*$', ' ', text)
     # Replace multiple spaces with single space
     clean = re.sub(r'\s+', ' ', clean)
     # Strip leading/trailing whitespace
@@ -40,12 +40,17 @@ def format_salary_lakhs(amount):
     except (ValueError, TypeError):
         return amount
 
-def create_app(config_name='default'):
+def create_app(config_name='default', background=False):
+    """Build the app; background=True (web servers only) also starts warm-ups and timers"""
     app = Flask(__name__)
 
     # Load configuration
     from app.config import config
     app.config.from_object(config[config_name])
+    if not background:
+        # Scripts and CLI commands get the hooks but no warm-up threads or timers
+        app.config.update(JOB_SEARCH_WARMUP=False, SKILLS_CACHE_WARMUP=False, INGEST_INTERVAL=0,
+                          INGEST_ON_INSERT=False, EVENT_SEATS_RECONCILE_INTERVAL=0)
 
     # Initialize database
     from app.database import init_db
@@ -54,7 +59,54 @@ def create_app(config_name='default'):
     # Initialize extensions
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
-    socketio.init_app(app, cors_allowed_origins="*")
+    # With a message queue any worker (or loader script) can emit to any client's room
+    socketio.init_app(app, cors_allowed_origins="*", message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'))
+
+    # In-process job search index (kept fresh from Job commits)
+    from app.utils import job_events
+    from app.utils import job_text
+    from app.utils.job_search import job_index
+    from app.utils.job_ranges import job_ranges
+    from app.utils.feed_sampler import feed_sampler
+    from app.utils.skill_match import skill_matcher
+    from app.utils.skills_cache import skills_cache
+    from app.utils.job_locations import job_locations
+    from app.utils.saved_jobs import saved_jobs
+    from app.utils.seen_jobs import seen_jobs
+    from app.utils.percolator import percolator
+    from app.utils.ingest import ingest
+    job_events.init_app(app)
+    job_text.init_app(app)
+    skills_cache.init_app(app)
+    job_index.init_app(app)
+    job_ranges.init_app(app)
+    feed_sampler.init_app(app)
+    skill_matcher.init_app(app)
+    job_locations.init_app(app)
+    saved_jobs.init_app(app)
+    seen_jobs.init_app(app)
+    percolator.init_app(app)
+    app.jinja_env.filters['job_summary'] = job_text.job_summary
+
+    # Typed rating / review / enrollment shadows and content-flag bitmap on Course
+    from app.utils import course_metrics
+    from app.utils.course_flags import course_flags
+    course_metrics.init_app(app)
+    course_flags.init_app(app)
+
+    # Per-row work for rows loaded outside the ORM (handlers registered above)
+    ingest.init_app(app)
+
+    # In-memory college catalogue (reloaded when college_collages changes)
+    from app.utils.college_catalog import college_catalog
+    college_catalog.init_app(app)
+
+    # Event.enrolled_count kept in step with enrollments, reconciled periodically;
+    # enroll/cancel reserve seats atomically (with an optional waitlist)
+    from app.utils.event_seats import event_seats
+    from app.utils.event_enrollment import enrollment_engine
+    event_seats.init_app(app)
+    enrollment_engine.init_app(app)
 
     # Register custom Jinja2 filters
     app.jinja_env.filters['strip_html'] = strip_html
@@ -37,6 +37,48 @@ class Config:
         }
     }
 
+    # Warm-ups and timers below only start in web servers - create_app(background=True)
+
+    # Job search index - build in the background when the app starts
+    JOB_SEARCH_WARMUP = True
+    JOB_SEARCH_TTL = 1800  # Full background rebuild after this many seconds (catches non-ORM updates/deletes)
+    JOB_LOCATIONS_TTL = 1800  # Location postings are reloaded from job_locations after this many seconds
+
+    # Parsed tagsAndSkills cache - bulk-load it in the background when the app starts
+    SKILLS_CACHE_WARMUP = True
+
+    # Run the ingest pass (text rendering, saved-search alerts) for newly loaded rows every this many seconds (0 = off)
+    INGEST_INTERVAL = 60
+    INGEST_ON_INSERT = True  # Also run it in the background right after ORM job inserts
+
+    # Socket.IO message queue, e.g. redis://localhost:6379/0 - lets every worker and
+    # run_ingest.py emit to a user's room (unset = this process's clients only)
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+
+    # Saved jobs - toggles are batched and written after this many seconds
+    SAVED_JOBS_FLUSH_DELAY = 0.5
+
+    # Saved sets are re-read from saved_jobs after this many seconds (picks up other workers' saves)
+    SAVED_JOBS_TTL = 30
+
+    # Seen-jobs Bloom filters (scroller) are written back after this many seconds
+    SEEN_JOBS_FLUSH_DELAY = 5.0
+
+    # Cached seen filters re-merge the stored row after this many seconds (picks up other workers' swipes)
+    SEEN_JOBS_TTL = 60
+
+    # Build the next scroller page in the background while the user swipes
+    FEED_PREFETCH = True
+
+    # Memory budget for cached shuffle permutations (evicted ones are re-derived from their seed)
+    FEED_PERMUTATION_CACHE_MB = 64
+
+    # Recompute Event.enrolled_count from event_enrollments every this many seconds (0 = off)
+    EVENT_SEATS_RECONCILE_INTERVAL = 900
+
+    # Put users on a FIFO waitlist when an event is full (promoted as seats free up)
+    EVENT_WAITLIST = True
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -54,6 +96,16 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # pool_size/max_overflow/timeout are not valid for SQLite
+    JOB_SEARCH_WARMUP = False
+    SKILLS_CACHE_WARMUP = False
+    INGEST_INTERVAL = 0
+    INGEST_ON_INSERT = False
+    SOCKETIO_MESSAGE_QUEUE = None
+    SAVED_JOBS_FLUSH_DELAY = 0  # Write saves inline
+    SEEN_JOBS_FLUSH_DELAY = 0
+    FEED_PREFETCH = False
+    EVENT_SEATS_RECONCILE_INTERVAL = 0
 
 
 # Configuration dictionary
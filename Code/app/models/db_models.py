@@ -1,6 +1,7 @@
 from app.database import db
 from datetime import datetime
 from sqlalchemy import Index
+from sqlalchemy.orm import deferred
 import json
 
 
@@ -134,6 +135,7 @@ class Event(db.Model):
     location_type = db.Column(db.String(50))  # online, in-person, hybrid
     location = db.Column(db.String(500))
     max_participants = db.Column(db.Integer)
+    enrolled_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # See utils/event_seats.py
     price = db.Column(db.Integer, default=0)
     tags = db.Column(db.Text)  # JSON array
     image_url = db.Column(db.String(500))
@@ -146,6 +148,13 @@ class Event(db.Model):
     # Relationships
     enrollments = db.relationship('EventEnrollment', backref='event', cascade='all, delete-orphan')
 
+    # Columns an event card needs (events.browse)
+    CARD_COLUMNS = (
+        'id', 'title', 'description', 'event_type', 'category', 'level', 'start_date', 'end_date',
+        'location_type', 'price', 'image_url', 'registration_url', 'featured',
+        'max_participants', 'enrolled_count',
+    )
+
     __table_args__ = (
         Index('idx_event_category', 'category'),
         Index('idx_event_type', 'event_type'),
@@ -233,29 +242,118 @@ class Job(db.Model):
     __table_args__ = {'extend_existing': True}
 
     # All columns from actual database (18 total, NO id column exists!)
+    # VARCHAR(MAX) columns are deferred - list views load card columns only (see CARD_COLUMNS)
     jobId = db.Column(db.BigInteger, primary_key=True)  # Using as PK for SQLAlchemy
     title = db.Column(db.String(255))
     currency = db.Column(db.String(255))
     jobUploaded = db.Column(db.String(255))  # Stored as VARCHAR in DB
     companyName = db.Column(db.String(255))
-    tagsAndSkills = db.Column(db.String(None))  # VARCHAR(MAX)
+    tagsAndSkills = deferred(db.Column(db.String(None)), group='skills')  # VARCHAR(MAX), read via skills cache
     experience = db.Column(db.String(255))
     salary = db.Column(db.String(255))
     location = db.Column(db.String(255))
     companyId = db.Column(db.BigInteger)  # BIGINT in DB
     ReviewsCount = db.Column(db.Float)  # FLOAT in DB
     AggregateRating = db.Column(db.Float)
-    jobDescription = db.Column(db.String(None))  # VARCHAR(MAX)
+    jobDescription = deferred(db.Column(db.String(None)), group='text')  # VARCHAR(MAX), detail view only
     minimumSalary = db.Column(db.Float)  # FLOAT in DB
     maximumSalary = db.Column(db.Float)  # FLOAT in DB
     minimumExperience = db.Column(db.Float)  # FLOAT in DB
     maximumExperience = db.Column(db.Float)  # FLOAT in DB
     application_url = db.Column(db.String(500))  # Cached application URL
+    description_text = deferred(db.Column(db.String(None)), group='text')  # Plain-text jobDescription (materialized)
+    description_snippet = db.Column(db.String(300))  # Bounded summary for list views
+
+    # Columns a job card needs (browse list, scroller feed)
+    CARD_COLUMNS = (
+        'jobId', 'title', 'companyName', 'companyId', 'location', 'experience', 'salary',
+        'currency', 'minimumSalary', 'maximumSalary', 'minimumExperience', 'maximumExperience',
+        'ReviewsCount', 'AggregateRating', 'jobUploaded', 'description_snippet',
+    )
 
     def __repr__(self):
         return f'<Job {self.title} at {self.companyName}>'
 
 
+class SeenJobFilter(db.Model):
+    """Bloom filter of jobs a user has swiped past in the scroller"""
+    __tablename__ = 'seen_job_filters'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    current_bits = db.Column(db.LargeBinary)  # 4 KB bit array
+    current_count = db.Column(db.Integer, default=0)  # Items added to current_bits
+    previous_bits = db.Column(db.LargeBinary)  # Previous full generation (nullable)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SeenJobFilter {self.user_id}>'
+
+
+class SavedSearch(db.Model):
+    """Saved jobs.browse query - new matching jobs are pushed to the user"""
+    __tablename__ = 'saved_searches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    search = db.Column(db.String(255))
+    location = db.Column(db.String(255))
+    min_salary = db.Column(db.Float)  # Rupees, like Job.minimumSalary
+    max_salary = db.Column(db.Float)
+    max_exp = db.Column(db.Float)  # Years
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_user_saved_searches', 'user_id'),
+    )
+
+    def __repr__(self):
+        return f'<SavedSearch {self.search} in {self.location}>'
+
+
+class IngestWatermark(db.Model):
+    """Highest id processed by an ingest pass (see utils/ingest.py)"""
+    __tablename__ = 'ingest_watermarks'
+
+    name = db.Column(db.String(50), primary_key=True)  # 'jobs', 'courses'
+    last_id = db.Column(db.BigInteger, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<IngestWatermark {self.name}:{self.last_id}>'
+
+
+class JobLocation(db.Model):
+    """Canonical city ids for each job (normalized from Job.location)"""
+    __tablename__ = 'job_locations'
+
+    jobId = db.Column(db.BigInteger, primary_key=True)  # No FK - jobs has no real PK in the database
+    city = db.Column(db.String(100), primary_key=True)  # Canonical city id, e.g. 'bengaluru'
+
+    __table_args__ = (
+        Index('idx_job_locations_city', 'city', 'jobId'),
+    )
+
+    def __repr__(self):
+        return f'<JobLocation {self.jobId}:{self.city}>'
+
+
+class SavedJob(db.Model):
+    """Jobs bookmarked by a user"""
+    __tablename__ = 'saved_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    jobId = db.Column(db.BigInteger, nullable=False)  # No FK - jobs has no real PK in the database
+    saved_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'jobId', name='unique_user_saved_job'),
+    )
+
+    def __repr__(self):
+        return f'<SavedJob {self.user_id}:{self.jobId}>'
+
+
 class Conversation(db.Model):
     """Messaging conversations"""
     __tablename__ = 'conversations'
@@ -414,100 +512,128 @@ class Course(db.Model):
     """Online courses - WARNING: Table has NO primary key in database!"""
     __tablename__ = 'courses'
 
-    __table_args__ = {'extend_existing': True}
+    # Sort/filter indexes on the typed shadow columns (url is VARCHAR(MAX), so it
+    # can only ride along as an included column)
+    __table_args__ = (
+        Index('idx_course_rating_value', 'rating_value', mssql_include=['url']),
+        Index('idx_course_enrollment_count', 'enrollment_count', mssql_include=['url']),
+        Index('idx_course_duration', 'Duration', mssql_include=['url']),
+        Index('idx_course_content_flags', 'content_flags', mssql_include=['url']),
+        {'extend_existing': True},
+    )
 
     # Using url as primary key for SQLAlchemy (not a real PK in DB)
     url = db.Column(db.String(None), primary_key=True)
-    type = db.Column(db.String(None))
+
+    # Nearly every column is VARCHAR(MAX) or a wide float. Only the "card" group
+    # loads eagerly; the rest are deferred in groups and come in one round trip
+    # the first time any column of the group is read (or via undefer_group).
+
+    # --- card: what a course card renders (see CARD_COLUMNS) ---
     course_name = db.Column(db.String(None))
     organization = db.Column(db.String(None))
     instructor = db.Column(db.String(None))
+    provider = db.Column(db.String(None))
     rating = db.Column(db.String(None))  # VARCHAR in DB, not FLOAT
-    nu_reviews = db.Column(db.String(None))  # VARCHAR in DB
-    description = db.Column(db.String(None))
-    skills = db.Column(db.String(None))
     level = db.Column(db.String(None))
     Duration = db.Column(db.Float)
-    reviews = db.Column(db.String(None))  # VARCHAR in DB
+    card_image_url = db.Column(db.String(None))
+    description = db.Column(db.String(None))  # Cards read a snippet (see courses.CARD_DESCRIPTION_CHARS)
+
+    # --- typed shadows of rating / nu_reviews / enrollments (see utils/course_metrics.py) ---
+    rating_value = db.Column(db.Float)  # Parsed rating (0-5), NULL when unrated, -1 when unparseable
+    review_count = db.Column(db.BigInteger)  # Parsed nu_reviews (-1 when unparseable)
+    enrollment_count = db.Column(db.BigInteger)  # enrollments as an integer
+    content_flags = db.Column(db.Integer)  # has_* flags packed into one bitmask (see utils/course_flags.py)
+
+    # --- detail: course detail page ---
+    type = deferred(db.Column(db.String(None)), group='detail')
+    nu_reviews = deferred(db.Column(db.String(None)), group='detail')  # VARCHAR in DB
+    skills = deferred(db.Column(db.String(None)), group='detail')
+    reviews = deferred(db.Column(db.String(None)), group='detail')  # VARCHAR in DB
+    enrollments = deferred(db.Column(db.Float), group='detail')
+    subject = deferred(db.Column(db.Float), group='detail')
+    course_titles = deferred(db.Column(db.String(None)), group='detail')
+    owners = deferred(db.Column(db.String(None)), group='detail')
+    primary_description = deferred(db.Column(db.String(None)), group='detail')
+    secondary_description = deferred(db.Column(db.String(None)), group='detail')
+    tertiary_description = deferred(db.Column(db.String(None)), group='detail')
+    tags = deferred(db.Column(db.String(None)), group='detail')
+    learning_type = deferred(db.Column(db.String(None)), group='detail')
+    learning_type_exp = deferred(db.Column(db.String(None)), group='detail')
+    language = deferred(db.Column(db.String(None)), group='detail')
+    translation_languages = deferred(db.Column(db.String(None)), group='detail')
+    weeks_to_complete = deferred(db.Column(db.Float), group='detail')
+    min_effort = deferred(db.Column(db.Float), group='detail')
+    max_effort = deferred(db.Column(db.Float), group='detail')
+    program_type = deferred(db.Column(db.String(None)), group='detail')
+    uuid = deferred(db.Column(db.String(None)), group='detail')
+    objectID = deferred(db.Column(db.String(None)), group='detail')
 
     # Total counts for different content types
-    total_assignment = db.Column(db.Float)
-    total_app = db.Column(db.Float)
-    total_programming = db.Column(db.Float)
-    total_reading = db.Column(db.Float)
-    total_plugin = db.Column(db.Float)
-    total_ungraded = db.Column(db.Float)
-    total_quiz = db.Column(db.Float)
-    total_teammate = db.Column(db.Float)
-    total_peer = db.Column(db.Float)
-    total_discussion = db.Column(db.Float)
-    total_video = db.Column(db.Float)
+    total_assignment = deferred(db.Column(db.Float), group='detail')
+    total_app = deferred(db.Column(db.Float), group='detail')
+    total_programming = deferred(db.Column(db.Float), group='detail')
+    total_reading = deferred(db.Column(db.Float), group='detail')
+    total_plugin = deferred(db.Column(db.Float), group='detail')
+    total_ungraded = deferred(db.Column(db.Float), group='detail')
+    total_quiz = deferred(db.Column(db.Float), group='detail')
+    total_teammate = deferred(db.Column(db.Float), group='detail')
+    total_peer = deferred(db.Column(db.Float), group='detail')
+    total_discussion = deferred(db.Column(db.Float), group='detail')
+    total_video = deferred(db.Column(db.Float), group='detail')
 
     # Boolean flags (stored as BIGINT in DB)
-    has_assignment = db.Column(db.BigInteger)
-    has_app = db.Column(db.BigInteger)
-    has_programming = db.Column(db.BigInteger)
-    has_reading = db.Column(db.BigInteger)
-    has_plugin = db.Column(db.BigInteger)
-    has_ungraded = db.Column(db.BigInteger)
-    has_quiz = db.Column(db.BigInteger)
-    has_teammate = db.Column(db.BigInteger)
-    has_peer = db.Column(db.BigInteger)
-    has_discussion = db.Column(db.BigInteger)
-    has_video = db.Column(db.BigInteger)
-
-    # Additional metadata
-    has_no_enrol = db.Column(db.BigInteger)
-    enrollments = db.Column(db.Float)
-    has_rating = db.Column(db.BigInteger)
-    subject = db.Column(db.Float)
-    has_subject = db.Column(db.BigInteger)
-    provider = db.Column(db.String(None))
-
-    # Extra columns from actual database
-    allowed_in = db.Column(db.String(None))
-    value_per_lead_usa = db.Column(db.Float)
-    recent_enrollment_count = db.Column(db.Float)
-    card_image_url = db.Column(db.String(None))
-    value_per_lead_international = db.Column(db.Float)
-    blocked_in = db.Column(db.String(None))
-    value_per_click_international = db.Column(db.Float)
-    min_effort = db.Column(db.Float)
-    subscription_prices = db.Column(db.String(None))
-    product_marketing_video_url = db.Column(db.Float)
-    uuid = db.Column(db.String(None))
-    primary_description = db.Column(db.String(None))
-    learning_type_exp = db.Column(db.String(None))
-    course_titles = db.Column(db.String(None))
-    objectID = db.Column(db.String(None))
-    subscription_eligible = db.Column(db.Float)
-    active_run_start = db.Column(db.Float)
-    organization_short_code_override = db.Column(db.String(None))
-    tags = db.Column(db.String(None))
-    _highlightResult = db.Column(db.String(None))
-    value_per_click_usa = db.Column(db.Float)
-    product_source = db.Column(db.String(None))
-    active_run_key = db.Column(db.Float)
-    availability_rank = db.Column(db.Float)
-    availability = db.Column(db.String(None))
-    weeks_to_complete = db.Column(db.Float)
-    owners = db.Column(db.String(None))
-    max_effort = db.Column(db.Float)
-    language = db.Column(db.String(None))
-    contentful_fields = db.Column(db.Float)
-    tertiary_description = db.Column(db.String(None))
-    program_type = db.Column(db.String(None))
-    partner_keys = db.Column(db.String(None))
-    organization_logo_override = db.Column(db.String(None))
-    active_run_type = db.Column(db.Float)
-    product_key = db.Column(db.Float)
-    external_url = db.Column(db.Float)
-    meta_title = db.Column(db.Float)
-    secondary_description = db.Column(db.String(None))
-    learning_type = db.Column(db.String(None))
-    display_on_org_page = db.Column(db.Float)
-    _geoloc = db.Column(db.String(None))
-    translation_languages = db.Column(db.String(None))
+    has_assignment = deferred(db.Column(db.BigInteger), group='detail')
+    has_app = deferred(db.Column(db.BigInteger), group='detail')
+    has_programming = deferred(db.Column(db.BigInteger), group='detail')
+    has_reading = deferred(db.Column(db.BigInteger), group='detail')
+    has_plugin = deferred(db.Column(db.BigInteger), group='detail')
+    has_ungraded = deferred(db.Column(db.BigInteger), group='detail')
+    has_quiz = deferred(db.Column(db.BigInteger), group='detail')
+    has_teammate = deferred(db.Column(db.BigInteger), group='detail')
+    has_peer = deferred(db.Column(db.BigInteger), group='detail')
+    has_discussion = deferred(db.Column(db.BigInteger), group='detail')
+    has_video = deferred(db.Column(db.BigInteger), group='detail')
+    has_no_enrol = deferred(db.Column(db.BigInteger), group='detail')
+    has_rating = deferred(db.Column(db.BigInteger), group='detail')
+    has_subject = deferred(db.Column(db.BigInteger), group='detail')
+
+    # --- marketing: scraped catalogue/ads metadata, never rendered ---
+    value_per_lead_usa = deferred(db.Column(db.Float), group='marketing')
+    value_per_lead_international = deferred(db.Column(db.Float), group='marketing')
+    value_per_click_usa = deferred(db.Column(db.Float), group='marketing')
+    value_per_click_international = deferred(db.Column(db.Float), group='marketing')
+    recent_enrollment_count = deferred(db.Column(db.Float), group='marketing')
+    subscription_prices = deferred(db.Column(db.String(None)), group='marketing')
+    subscription_eligible = deferred(db.Column(db.Float), group='marketing')
+    product_marketing_video_url = deferred(db.Column(db.Float), group='marketing')
+    product_source = deferred(db.Column(db.String(None)), group='marketing')
+    product_key = deferred(db.Column(db.Float), group='marketing')
+    external_url = deferred(db.Column(db.Float), group='marketing')
+    meta_title = deferred(db.Column(db.Float), group='marketing')
+    partner_keys = deferred(db.Column(db.String(None)), group='marketing')
+    organization_logo_override = deferred(db.Column(db.String(None)), group='marketing')
+    organization_short_code_override = deferred(db.Column(db.String(None)), group='marketing')
+    display_on_org_page = deferred(db.Column(db.Float), group='marketing')
+    contentful_fields = deferred(db.Column(db.Float), group='marketing')
+    _highlightResult = deferred(db.Column(db.String(None)), group='marketing')
+
+    # --- availability: region and run scheduling ---
+    allowed_in = deferred(db.Column(db.String(None)), group='availability')
+    blocked_in = deferred(db.Column(db.String(None)), group='availability')
+    availability = deferred(db.Column(db.String(None)), group='availability')
+    availability_rank = deferred(db.Column(db.Float), group='availability')
+    active_run_start = deferred(db.Column(db.Float), group='availability')
+    active_run_key = deferred(db.Column(db.Float), group='availability')
+    active_run_type = deferred(db.Column(db.Float), group='availability')
+    _geoloc = deferred(db.Column(db.String(None)), group='availability')
+
+    # Columns a course card needs (courses.browse, courses API) - the "card" group
+    CARD_COLUMNS = (
+        'url', 'course_name', 'organization', 'instructor', 'provider', 'rating', 'level',
+        'Duration', 'card_image_url', 'description',
+    )
 
     def __repr__(self):
         return f'<Course {self.course_name}>'
@@ -1,65 +1,59 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort
 from flask_login import login_required, current_user
-from app.models.db_models import College
-from app.database import db
-import json
+from app.utils.college_catalog import college_catalog
+from app.utils.college_stats import METRICS, as_number
+from app.utils.exam_cutoffs import exam_key
 
 bp = Blueprint('colleges', __name__, url_prefix='/colleges')
 
+MAX_COMPARE = 10
+
+
+def _filtered_colleges(stream, state, city, college_type, search):
+    """Row positions in the catalogue snapshot matching the filters (browse order)"""
+    catalog = college_catalog.snapshot()
+    return catalog, catalog.filter(stream, state, city, college_type, search)
+
 
 @bp.route('/')
 @bp.route('/browse')
 def browse():
     """Browse colleges"""
     page = request.args.get('page', 1, type=int)
+    after = request.args.get('after')  # Cursor mode when present (even empty)
     stream = request.args.get('stream', '')
     state = request.args.get('state', '')
     city = request.args.get('city', '')
     college_type = request.args.get('college_type', '')
     search = request.args.get('search', '')
 
-    # Build query
-    query = College.query
-
-    # Stream filter
-    if stream:
-        query = query.filter(College.stream.ilike(f'%{stream}%'))
-
-    # State filter
-    if state:
-        query = query.filter(College.state.ilike(f'%{state}%'))
-
-    # City filter
-    if city:
-        query = query.filter(College.city.ilike(f'%{city}%'))
-
-    # College type filter
-    if college_type:
-        query = query.filter(College.college_type.ilike(f'%{college_type}%'))
-
-    # General search (searches name, city, state)
-    if search:
-        search_filter = db.or_(
-            College.college_name.ilike(f'%{search}%'),
-            College.city.ilike(f'%{search}%'),
-            College.state.ilike(f'%{search}%'),
-            College.stream.ilike(f'%{search}%')
-        )
-        query = query.filter(search_filter)
+    # Filter the in-memory catalogue - no database round trip
+    catalog, matches = _filtered_colleges(stream, state, city, college_type, search)
 
-    # Paginate results
     per_page = 20
-    colleges_pagination = query.order_by(College.tier_rank, College.college_name).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-
-    colleges = colleges_pagination.items
-    total_pages = colleges_pagination.pages
+    next_cursor = None
+    has_more = False
+    if after is not None:
+        # Keyset pagination on (tier_rank, college_name, id)
+        result = catalog.keyset_page(matches, after=after, per_page=per_page)
+        colleges = result.items
+        next_cursor = result.next_cursor
+        has_more = result.has_more
+        total_pages = 0
+    else:
+        # Paginate results
+        colleges_pagination = catalog.paginate(matches, page=page, per_page=per_page)
+
+        colleges = colleges_pagination.items
+        total_pages = colleges_pagination.pages
 
     return render_template('colleges/browse.html',
                           colleges=colleges,
                           page=page,
                           total_pages=total_pages,
+                          cursor_mode=after is not None,
+                          next_cursor=next_cursor,
+                          has_more=has_more,
                           stream=stream,
                           state=state,
                           city=city,
@@ -67,55 +61,152 @@ def browse():
                           search=search)
 
 
+@bp.route('/api/list')
+def api_list():
+    """Cursor-paginated college listing for API clients"""
+    after = request.args.get('after', '')
+    per_page = max(1, min(request.args.get('per_page', 20, type=int), 100))
+
+    catalog, matches = _filtered_colleges(
+        request.args.get('stream', ''),
+        request.args.get('state', ''),
+        request.args.get('city', ''),
+        request.args.get('college_type', ''),
+        request.args.get('search', '')
+    )
+    result = catalog.keyset_page(matches, after=after, per_page=per_page)
+
+    return jsonify({
+        'colleges': [{
+            'id': college.id,
+            'college_name': college.college_name,
+            'stream': college.stream,
+            'city': college.city,
+            'state': college.state,
+            'college_type': college.college_type,
+            'tier_rank': college.tier_rank,
+            'seat_intake': college.seat_intake,
+            'placement_average_salary': college.placement_average_salary,
+        } for college in result.items],
+        'next_cursor': result.next_cursor,
+        'has_more': result.has_more
+    })
+
+
+@bp.route('/api/eligible')
+def api_eligible():
+    """Colleges a student qualifies for on one exam, ranked by tier
+
+    ?exam=JEE Main&rank=12000 matches rank cutoffs ("Rank under 15000");
+    ?exam=JEE Main&score=300 matches score and percentage cutoffs ("Score 300+",
+    "95%"); ?exam=JEE Main&percentile=97.5 matches percentile cutoffs
+    ("97 percentile", "Top 2%").
+    """
+    exam = request.args.get('exam', '').strip()
+    rank = request.args.get('rank', type=float)
+    score = request.args.get('score', type=float)
+    percentile = request.args.get('percentile', type=float)
+
+    catalog = college_catalog.snapshot()
+    if not exam or (rank is None and score is None and percentile is None):
+        return jsonify({'error': 'exam and one of rank, score or percentile are required'}), 400
+    if exam not in catalog.cutoffs:
+        return jsonify({'error': f'No cutoffs known for exam: {exam}', 'exams': catalog.cutoffs.exams()}), 404
+
+    colleges = []
+    for college, cutoff, text in catalog.eligible(exam, rank=rank, score=score, percentile=percentile):
+        student = {'rank': rank, 'percentile': percentile}.get(cutoff.unit, score)
+        colleges.append({
+            'id': college.id,
+            'college_name': college.college_name,
+            'stream': college.stream,
+            'city': college.city,
+            'state': college.state,
+            'college_type': college.college_type,
+            'tier_rank': college.tier_rank,
+            'cutoff': text,
+            'cutoff_type': cutoff.unit,
+            'cutoff_value': cutoff.value,
+            # Headroom over the cutoff - ranks to spare, or points above the minimum
+            'margin': cutoff.value - student if cutoff.kind == 'rank' else student - cutoff.value,
+        })
+
+    return jsonify({
+        'exam': catalog.cutoffs.names[exam_key(exam)],
+        'rank': rank,
+        'score': score,
+        'percentile': percentile,
+        'count': len(colleges),
+        'colleges': colleges
+    })
+
+
+@bp.route('/api/compare')
+def api_compare():
+    """Side-by-side comparison of up to MAX_COMPARE colleges
+
+    ?ids=3,7,12 (or repeated ids=). Each college gets its raw metric values,
+    0-1 normalized values (1 = better end of the catalogue range) and
+    percentile ranks against the whole catalogue.
+    """
+    ids = []
+    for value in request.args.getlist('ids'):
+        ids.extend(int(v) for v in value.split(',') if v.strip().isdigit())
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return jsonify({'error': 'ids must list at least one college id'}), 400
+    if len(ids) > MAX_COMPARE:
+        return jsonify({'error': f'At most {MAX_COMPARE} colleges can be compared'}), 400
+
+    catalog = college_catalog.snapshot()
+    positions = [catalog.by_id[i] for i in ids if i in catalog.by_id]
+    values, normalized, percentiles, best = catalog.stats.compare(positions)
+
+    colleges = []
+    for i, position in enumerate(positions):
+        college, parsed = catalog.rows[position], catalog.parsed[position]
+        colleges.append({
+            'id': college.id,
+            'college_name': college.college_name,
+            'stream': college.stream,
+            'city': college.city,
+            'state': college.state,
+            'college_type': college.college_type,
+            'entrance_exams': parsed['entrance_exams'],
+            'required_skills': parsed['required_skills'],
+            'values': {m.key: as_number(values[i, j]) for j, m in enumerate(METRICS)},
+            'normalized': {m.key: as_number(normalized[i, j], 3) for j, m in enumerate(METRICS)},
+            'percentiles': {m.key: as_number(percentiles[i, j], 1) for j, m in enumerate(METRICS)},
+            'best_in': [m.key for j, m in enumerate(METRICS) if best[i, j]],
+        })
+
+    return jsonify({
+        'metrics': catalog.stats.summary(),
+        'colleges': colleges,
+        'missing': [i for i in ids if i not in catalog.by_id],
+        'catalog_size': len(catalog.rows)
+    })
+
+
 @bp.route('/<int:college_id>')
 def detail(college_id):
     """College detail page"""
-    college = College.query.get_or_404(college_id)
-
-    # Parse JSON fields
-    entrance_exams = []
-    required_skills = []
-    typical_exam_cutoffs = {}
-    fee_structure = {}
-
-    try:
-        entrance_exams = json.loads(college.entrance_exams) if college.entrance_exams else []
-    except:
-        entrance_exams = []
-
-    try:
-        required_skills = json.loads(college.required_skills) if college.required_skills else []
-    except:
-        required_skills = []
-
-    try:
-        typical_exam_cutoffs = json.loads(college.typical_exam_cutoffs) if college.typical_exam_cutoffs else {}
-    except:
-        typical_exam_cutoffs = {}
-
-    try:
-        fee_structure = json.loads(college.fee_structure) if college.fee_structure else {}
-    except:
-        fee_structure = {}
+    entry = college_catalog.snapshot().get(college_id)
+    if entry is None:
+        abort(404)
 
+    # JSON fields are parsed once per snapshot
+    college, parsed = entry
     return render_template('colleges/detail.html',
                           college=college,
-                          entrance_exams=entrance_exams,
-                          required_skills=required_skills,
-                          typical_exam_cutoffs=typical_exam_cutoffs,
-                          fee_structure=fee_structure)
+                          entrance_exams=parsed['entrance_exams'],
+                          required_skills=parsed['required_skills'],
+                          typical_exam_cutoffs=parsed['typical_exam_cutoffs'],
+                          fee_structure=parsed['fee_structure'])
 
 
 @bp.route('/api/filters')
 def api_filters():
     """Get filter options for colleges"""
-    # Get unique values for filters
-    streams = db.session.query(College.stream).distinct().filter(College.stream.isnot(None)).all()
-    states = db.session.query(College.state).distinct().filter(College.state.isnot(None)).all()
-    college_types = db.session.query(College.college_type).distinct().filter(College.college_type.isnot(None)).all()
-
-    return jsonify({
-        'streams': [s[0] for s in streams],
-        'states': [s[0] for s in states],
-        'college_types': [c[0] for c in college_types]
-    })
+    # Distinct values are precomputed per catalogue snapshot
+    return jsonify(college_catalog.snapshot().options)
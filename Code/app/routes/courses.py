@@ -1,20 +1,44 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, render_template, request, jsonify
 from app.models.db_models import Course
+from app.utils.pagination import keyset_paginate
+from app.utils.read_models import CardQuery
+from app.utils.course_flags import course_flags, parse_flags, CONTENT_FLAGS, FLAG_LABELS
+from urllib.parse import urlencode
 from sqlalchemy import or_, and_, func
 
 bp = Blueprint('courses', __name__, url_prefix='/courses')
 
+# Keyset ordering - url is the (pseudo) primary key, so it is already unique
+COURSE_KEYS = [(Course.url, False)]
 
-@bp.route('/')
-def browse():
-    """Browse all courses"""
-    page = request.args.get('page', 1, type=int)
-    search = request.args.get('search', '')
-    level = request.args.get('level', '')
-    provider = request.args.get('provider', '')
+# sort= options over the indexed shadow columns; url breaks ties
+COURSE_SORTS = {
+    'rating': [(Course.rating_value, True), (Course.url, False)],
+    'popular': [(Course.enrollment_count, True), (Course.url, False)],
+    'duration': [(Course.Duration, False), (Course.url, False)],
+}
+
+# Cards clamp the description to three lines - fetch a snippet, not the VARCHAR(MAX) body
+CARD_DESCRIPTION_CHARS = 600
 
-    # Build query
-    query = Course.query
+
+def course_cards(extra_columns=()):
+    """CourseCard projection - the model's "card" group with a bounded description"""
+    return CardQuery(Course, Course.CARD_COLUMNS + tuple(extra_columns), 'CourseCard', expressions={
+        'description': func.substring(Course.description, 1, CARD_DESCRIPTION_CHARS),
+    })
+
+
+def course_keys(sort):
+    """Keyset ordering for a sort= value (unknown values fall back to url)"""
+    return COURSE_SORTS.get(sort, COURSE_KEYS)
+
+
+def _filtered_courses(search, level, provider, min_rating=None, sort='', require=(), exclude=()):
+    """Build the filtered course query shared by browse and the JSON API"""
+    # Read-only CourseCard rows - the 80-column ORM object is never built for a list.
+    # Sort keys ride along so keyset cursors can be read off the last card.
+    query = course_cards(column.key for column, _ in course_keys(sort))
 
     if search:
         # Search in course name, organization, and skills
@@ -31,15 +55,55 @@ def browse():
     if provider:
         query = query.filter_by(provider=provider)
 
-    # Paginate results - order by URL (primary key) for MSSQL compatibility
+    if min_rating is not None:
+        query = query.filter(Course.rating_value >= max(min_rating, 0))  # Unparseable ratings are -1
+
+    # Content-type flags are resolved on the in-memory bitmaps first
+    flags = course_flags.condition(require, exclude)
+    if flags is not None:
+        query = query.filter(flags)
+
+    return query
+
+
+@bp.route('/')
+def browse():
+    """Browse all courses"""
+    page = request.args.get('page', 1, type=int)
+    after = request.args.get('after')  # Cursor mode when present (even empty)
+    search = request.args.get('search', '')
+    level = request.args.get('level', '')
+    provider = request.args.get('provider', '')
+    sort = request.args.get('sort', '')
+    min_rating = request.args.get('min_rating', type=float)
+    require = parse_flags(request.args.getlist('has'))
+    exclude = [f for f in parse_flags(request.args.getlist('without')) if f not in require]
+    keys = course_keys(sort)
+
+    # Build query
+    query = _filtered_courses(search, level, provider, min_rating, sort, require, exclude)
+
     per_page = 12
-    # MSSQL requires ORDER BY when using OFFSET/LIMIT, so we order by the primary key
-    courses_pagination = query.order_by(Course.url).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    next_cursor = None
+    has_more = False
+    if after is not None:
+        # Keyset pagination on url - no OFFSET, no COUNT(*)
+        result = keyset_paginate(query, keys, after=after, per_page=per_page)
+        courses = result.items
+        next_cursor = result.next_cursor
+        has_more = result.has_more
+        total_pages = 0
+    else:
+        # Paginate results - the sort key plus URL (primary key) gives a stable order
+        # MSSQL requires ORDER BY when using OFFSET/LIMIT, so we always order by the primary key
+        courses_pagination = query.order_by(
+            *[column.desc() if descending else column.asc() for column, descending in keys]
+        ).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
 
-    courses = courses_pagination.items
-    total_pages = courses_pagination.pages
+        courses = courses_pagination.items
+        total_pages = courses_pagination.pages
 
     # Get unique providers for filter dropdown
     providers = Course.query.with_entities(Course.provider).distinct().filter(
@@ -51,7 +115,49 @@ def browse():
                           courses=courses,
                           page=page,
                           total_pages=total_pages,
+                          cursor_mode=after is not None,
+                          next_cursor=next_cursor,
+                          has_more=has_more,
                           search=search,
                           level=level,
                           provider=provider,
+                          sort=sort if sort in COURSE_SORTS else '',
+                          min_rating=min_rating,
+                          require=require,
+                          exclude=exclude,
+                          content_flags=[(f, FLAG_LABELS[f]) for f in CONTENT_FLAGS],
+                          flag_counts=course_flags.facet_counts(require, exclude),
+                          content_query=urlencode([('has', f) for f in require] + [('without', f) for f in exclude]),
                           providers=providers)
+
+
+@bp.route('/api/list')
+def api_list():
+    """Cursor-paginated course listing for API clients"""
+    after = request.args.get('after', '')
+    search = request.args.get('search', '')
+    level = request.args.get('level', '')
+    provider = request.args.get('provider', '')
+    sort = request.args.get('sort', '')
+    min_rating = request.args.get('min_rating', type=float)
+    require = parse_flags(request.args.getlist('has'))
+    exclude = [f for f in parse_flags(request.args.getlist('without')) if f not in require]
+    per_page = max(1, min(request.args.get('per_page', 12, type=int), 100))
+
+    query = _filtered_courses(search, level, provider, min_rating, sort, require, exclude)
+    result = keyset_paginate(query, course_keys(sort), after=after, per_page=per_page)
+
+    return jsonify({
+        'courses': [{
+            'url': course.url,
+            'course_name': course.course_name,
+            'organization': course.organization,
+            'provider': course.provider,
+            'rating': course.rating,
+            'level': course.level,
+            'Duration': course.Duration,
+            'card_image_url': course.card_image_url,
+        } for course in result.items],
+        'next_cursor': result.next_cursor,
+        'has_more': result.has_more
+    })
@@ -1,8 +1,11 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort
 from flask_login import login_required, current_user
 from app.forms.events import EventCreateForm, EventEnrollForm
 from app.models.db_models import Event, EventEnrollment, User as DBUser
 from app.database import db
+from app.utils.event_enrollment import enrollment_engine
+from app.utils.event_seats import seats_left
+from app.utils.read_models import CardQuery
 import json
 
 bp = Blueprint('events', __name__, url_prefix='/events')
@@ -16,8 +19,8 @@ def browse():
     level = request.args.get('level', '')
     event_type = request.args.get('type', '')
 
-    # Build query
-    query = Event.query
+    # Build query - read-only EventCard rows, no ORM instances
+    query = CardQuery(Event, Event.CARD_COLUMNS, 'EventCard')
 
     if category:
         query = query.filter_by(category=category)
@@ -49,8 +52,8 @@ def detail(event_id):
     """Event detail page"""
     event = Event.query.get_or_404(event_id)
 
-    # Get enrollment count
-    enrollment_count = EventEnrollment.query.filter_by(event_id=event_id, status='enrolled').count()
+    # Seat counter maintained with the enrollments (utils/event_seats.py)
+    enrollment_count = event.enrolled_count
 
     # Check if current user is enrolled
     is_enrolled = False
@@ -61,7 +64,8 @@ def detail(event_id):
             status='enrolled'
         ).first() is not None
 
-    return render_template('events/detail.html', event=event, enrollment_count=enrollment_count, is_enrolled=is_enrolled)
+    return render_template('events/detail.html', event=event, enrollment_count=enrollment_count,
+                           seats_left=seats_left(event), is_enrolled=is_enrolled)
 
 
 @bp.route('/create', methods=['GET', 'POST'])
@@ -106,44 +110,42 @@ def create():
 @bp.route('/<int:event_id>/enroll', methods=['POST'])
 @login_required
 def enroll(event_id):
-    """Enroll in event"""
-    event = Event.query.get_or_404(event_id)
-
-    # Check if already enrolled
-    existing_enrollment = EventEnrollment.query.filter_by(
-        event_id=event_id,
-        user_id=current_user.id
-    ).first()
-
-    if existing_enrollment:
-        if existing_enrollment.status == 'enrolled':
-            return jsonify({'success': False, 'message': 'Already enrolled in this event'}), 400
-        else:
-            # Reactivate enrollment
-            existing_enrollment.status = 'enrolled'
-            db.session.commit()
-            return jsonify({'success': True, 'message': 'Successfully enrolled!'})
-
-    # Check if event is full
-    if event.max_participants:
-        current_enrollments = EventEnrollment.query.filter_by(
-            event_id=event_id,
-            status='enrolled'
-        ).count()
-        if current_enrollments >= event.max_participants:
-            return jsonify({'success': False, 'message': 'Event is full'}), 400
-
-    # Create new enrollment
-    enrollment = EventEnrollment(
-        user_id=current_user.id,
-        event_id=event_id,
-        status='enrolled'
-    )
+    """Enroll in event (waitlisted when full) - see utils/event_enrollment.py"""
+    result = enrollment_engine.enroll(current_user.id, event_id)
+
+    if result.outcome == 'not_found':
+        abort(404)
+    if result.outcome == 'enrolled':
+        return jsonify({'success': True, 'status': 'enrolled', 'message': 'Successfully enrolled!'})
+    if result.outcome == 'waitlisted':
+        return jsonify({
+            'success': True,
+            'status': 'waitlisted',
+            'waitlist_position': result.position,
+            'message': f'Event is full - you are #{result.position} on the waitlist'
+        })
+    if result.outcome == 'already_waitlisted':
+        return jsonify({
+            'success': False,
+            'status': 'waitlisted',
+            'waitlist_position': result.position,
+            'message': 'Already on the waitlist for this event'
+        }), 400
+    if result.outcome == 'already_enrolled':
+        return jsonify({'success': False, 'status': 'enrolled', 'message': 'Already enrolled in this event'}), 400
+    return jsonify({'success': False, 'message': 'Event is full'}), 400
+
+
+@bp.route('/<int:event_id>/cancel', methods=['POST'])
+@login_required
+def cancel(event_id):
+    """Cancel enrollment (or waitlist entry) in event"""
+    result = enrollment_engine.cancel(current_user.id, event_id)
 
-    db.session.add(enrollment)
-    db.session.commit()
+    if result.outcome == 'not_enrolled':
+        return jsonify({'success': False, 'message': 'Not enrolled in this event'}), 400
 
-    return jsonify({'success': True, 'message': 'Successfully enrolled!'})
+    return jsonify({'success': True, 'message': 'Enrollment cancelled'})
 
 
 @bp.route('/<int:event_id>/bookmark', methods=['POST'])
@@ -1,26 +1,31 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort, session, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
-from app.models.db_models import Job, Profile, User as DBUser
+from flask_socketio import join_room
+from app import socketio
+from app.models.db_models import Job, Profile, SavedSearch, User as DBUser
 from app.database import db
+from app.utils.application_urls import resolve_application_url
+from app.utils.job_search import job_index
+from app.utils.job_ranges import job_ranges, range_filters
+from app.utils.job_locations import job_locations
+from app.utils.job_text import FALLBACK_COLUMN, job_summary, job_full_text, snippet_fallback
+from app.utils.feed_sampler import feed_sampler
+from app.utils.feed_prefetch import feed_prefetcher
+from app.utils.saved_jobs import saved_jobs
+from app.utils.seen_jobs import seen_jobs
+from app.utils.percolator import CompiledSearch, percolator, user_room
+from app.utils.skill_match import skill_matcher
+from app.utils.skills_cache import skills_cache
+from app.utils.pagination import keyset_paginate, encode_cursor, decode_cursor
+from app.utils.read_models import CardQuery
+from sqlalchemy.orm import undefer_group
 import json
+import numpy as np
 from functools import wraps
-import re
 
 bp = Blueprint('jobs', __name__, url_prefix='/jobs')
 
 
-def strip_html(text):
-    """Remove HTML tags from text"""
-    if not text:
-        return ''
-    # Remove HTML tags
-    clean = re.sub(r'<[^>]+>', ' ', text)
-    # Replace multiple spaces with single space
-    clean = re.sub(r'\s+', ' ', clean)
-    # Strip leading/trailing whitespace
-    return clean.strip()
-
-
 def adult_only(f):
     """Decorator to restrict access to adult users only"""
     @wraps(f)
@@ -34,71 +39,148 @@ def adult_only(f):
     return decorated_function
 
 
-@bp.route('/')
-@bp.route('/browse')
-@adult_only
-def browse():
-    """Browse jobs (passive mode)"""
-    page = request.args.get('page', 1, type=int)
-    category = request.args.get('category', '')
-    location = request.args.get('location', '')
-    search = request.args.get('search', '')  # General search term
+def card_query(columns=Job.CARD_COLUMNS):
+    """Read-only JobCard query over the given columns (no ORM instances, VARCHAR(MAX) text stays on the server)"""
+    columns = ('jobId',) + tuple(columns)
+    if 'description_snippet' not in columns:
+        return CardQuery(Job, columns, 'JobCard')
+    # Rows without a materialized snippet also bring a bounded slice of their HTML
+    return CardQuery(Job, columns + (FALLBACK_COLUMN,), 'JobCard',
+                     expressions={FALLBACK_COLUMN: snippet_fallback()})
 
-    # Build query (no 'active' field in database)
-    query = Job.query
 
-    # Location filter
+def _candidate_ids(location, ranges=None):
+    """Sorted jobId array allowed by the location and range filters (None = no filter)"""
+    candidates = job_ranges.candidates(**(ranges or {}))
     if location:
-        # Case-insensitive search for location
-        query = query.filter(Job.location.ilike(f'%{location}%'))
-
-    # General search (searches title and skills only - optimized for performance)
-    if search:
-        # Expand common tech abbreviations for better matching (limit to 2 terms max)
-        search_lower = search.lower()
-
-        # Map common abbreviations to full terms (reduced to avoid query timeout)
-        expansions = {
-            'ai': ['artificial intelligence', 'ai/ml'],
-            'ml': ['machine learning', 'ml engineer'],
-            'nlp': ['natural language processing'],
-            'cv': ['computer vision'],
-            'dl': ['deep learning'],
-        }
-
-        # Check if search matches an abbreviation and expand it
-        if search_lower in expansions:
-            search_terms = expansions[search_lower]
-        else:
-            search_terms = [search]
+        # Exact canonical-city lookup in the location index
+        located = job_locations.lookup(location)
+        candidates = located if candidates is None else np.intersect1d(candidates, located, assume_unique=True)
+    return candidates
+
 
-        # Build OR conditions - only search title and tagsAndSkills (not jobDescription to avoid timeout)
-        conditions = []
-        for term in search_terms:
-            conditions.extend([
-                Job.title.ilike(f'%{term}%'),
-                Job.tagsAndSkills.ilike(f'%{term}%'),
-            ])
+def _list_jobs(search, location, page=1, after=None, per_page=20, ranges=None):
+    """Shared listing for browse and the JSON API
 
-        search_filter = db.or_(*conditions)
-        query = query.filter(search_filter)
+    Returns (jobs, total_pages, next_cursor, has_more). When after is not None
+    the listing is cursor based and total_pages is None (no COUNT query).
+    ranges holds min_salary/max_salary/max_exp for the range index.
+    """
+    candidates = _candidate_ids(location, ranges)
+
+    # Search, location and range filters go through the in-process indexes,
+    # then only the requested page of rows is hydrated from SQL
+    if search or candidates is not None:
+        if search:
+            ranked_ids = job_index.search(search)
+            if candidates is not None:
+                allowed = set(candidates.tolist())
+                ranked_ids = [job_id for job_id in ranked_ids if job_id in allowed]
+        else:
+            # Browse default ordering - newest jobId first (candidates are sorted ascending)
+            ranked_ids = candidates[::-1]
+        if after is not None:
+            # Cursor is the last jobId seen - resume right after it in rank order
+            last = decode_cursor(after)
+            last_id = last[0] if last and isinstance(last[0], int) else None
+            if last_id is None:
+                start = 0
+            elif search:
+                rank = {job_id: i for i, job_id in enumerate(ranked_ids)}
+                start = rank.get(last_id, -1) + 1
+            else:
+                # Every jobId >= the cursor was served already (also when the cursor job is gone)
+                start = len(candidates) - int(np.searchsorted(candidates, last_id, side='left'))
+            total_pages = None
+        else:
+            page = max(page or 1, 1)
+            start = (page - 1) * per_page
+            total_pages = (len(ranked_ids) + per_page - 1) // per_page
+        page_ids = [int(job_id) for job_id in ranked_ids[start:start + per_page]]
+        has_more = start + per_page < len(ranked_ids)
+        next_cursor = encode_cursor([page_ids[-1]]) if page_ids and has_more else None
+
+        jobs = []
+        if page_ids:
+            rows = card_query().filter(Job.jobId.in_(page_ids)).all()
+            rank = {job_id: i for i, job_id in enumerate(page_ids)}
+            jobs = sorted(rows, key=lambda job: rank[job.jobId])
+        return jobs, total_pages, next_cursor, has_more
+
+    # Build query (no 'active' field in database) - card columns only
+    query = card_query()
+
+    if after is not None:
+        # Keyset pagination on jobId (newest first) - no OFFSET, no COUNT(*)
+        result = keyset_paginate(query, [(Job.jobId, True)], after=after, per_page=per_page)
+        return result.items, None, result.next_cursor, result.has_more
 
     # Paginate results (order by jobId since there's no id or posted_at)
-    per_page = 20
     jobs_pagination = query.order_by(Job.jobId.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
+    return jobs_pagination.items, jobs_pagination.pages, None, jobs_pagination.has_next
 
-    jobs = jobs_pagination.items
-    total_pages = jobs_pagination.pages
+
+@bp.route('/')
+@bp.route('/browse')
+@adult_only
+def browse():
+    """Browse jobs (passive mode)"""
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    after = request.args.get('after')  # Cursor mode when present (even empty)
+    category = request.args.get('category', '')
+    location = request.args.get('location', '')
+    search = request.args.get('search', '')  # General search term
+    ranges = range_filters(request.args)  # min_salary/max_salary in lakhs, max_exp in years
+
+    jobs, total_pages, next_cursor, has_more = _list_jobs(search, location, page=page, after=after, ranges=ranges)
+    job_skills = {job_id: list(skills) for job_id, skills in skills_cache.get_many([job.jobId for job in jobs]).items()}
+    saved_ids = saved_jobs.saved_ids(current_user.id)
 
     return render_template('jobs/browse.html',
                           jobs=jobs,
+                          job_skills=job_skills,
+                          saved_ids=saved_ids,
                           page=page,
-                          total_pages=total_pages,
+                          total_pages=total_pages or 0,
+                          cursor_mode=after is not None,
+                          next_cursor=next_cursor,
+                          has_more=has_more,
                           category=category,
                           location=location,
-                          search=search)
+                          search=search,
+                          min_salary=request.args.get('min_salary', ''),
+                          max_salary=request.args.get('max_salary', ''),
+                          max_exp=request.args.get('max_exp', ''))
+
+
+@bp.route('/api/list')
+@adult_only
+def api_list():
+    """Cursor-paginated job listing for API clients"""
+    after = request.args.get('after', '')
+    location = request.args.get('location', '')
+    search = request.args.get('search', '')
+    per_page = max(1, min(request.args.get('per_page', 20, type=int), 100))
+    ranges = range_filters(request.args)
+
+    jobs, _, next_cursor, has_more = _list_jobs(search, location, after=after, per_page=per_page, ranges=ranges)
+
+    return jsonify({
+        'jobs': [{
+            'id': job.jobId,
+            'jobId': job.jobId,
+            'title': job.title,
+            'company': job.companyName,
+            'location': job.location,
+            'experience': job.experience,
+            'salary': job.salary,
+            'AggregateRating': job.AggregateRating,
+        } for job in jobs],
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    })
 
 
 @bp.route('/scroller')
@@ -108,12 +190,123 @@ def scroller():
     return render_template('jobs/scroller.html')
 
 
+# Feed card fields and the Job column each is read from (None = computed, no column)
+FEED_FIELDS = {
+    'id': 'jobId',  # Using jobId as id since there's no id column
+    'title': 'title',
+    'jobId': 'jobId',
+    'company': 'companyName',
+    'companyId': 'companyId',
+    'description': 'description_snippet',  # Materialized plain-text snippet
+    'location': 'location',
+    'experience': 'experience',
+    'salary': 'salary',
+    'minimumSalary': 'minimumSalary',
+    'maximumSalary': 'maximumSalary',
+    'minimumExperience': 'minimumExperience',
+    'maximumExperience': 'maximumExperience',
+    'currency': 'currency',
+    'skills': None,  # From the skills cache
+    'ReviewsCount': 'ReviewsCount',
+    'AggregateRating': 'AggregateRating',
+    'match_score': None,  # From the skill matrix
+    'saved': None,  # From the user's cached saved set
+    'jobUploaded': 'jobUploaded',
+}
+
+
+def _feed_page(user_id, user_skills, mode, position, per_page, fields, ranges, unseen):
+    """Pick the jobIds for one feed page
+
+    Returns (page_ids, match_scores, next_position, has_more); position is
+    [offset] in best mode and [seed, offset] in shuffle mode.
+    """
+    # Salary/experience filters resolve to a jobId set from the range index
+    candidates = job_ranges.candidates(**ranges)
+
+    if mode == 'best':
+        # Best match - rank the whole catalogue by skill overlap in one vectorized pass
+        offset, = position
+        page_ids, page_scores, has_more = skill_matcher.top_matches(user_skills, offset, per_page, candidates=candidates)
+        return page_ids, dict(zip(page_ids, page_scores)), [offset + per_page], has_more
+
+    # Jobs the user already swiped past are skipped via their seen-jobs Bloom filter
+    seed, offset = position
+    exclude = seen_jobs.exclude(user_id) if unseen else None
+    page_ids, next_offset, has_more = feed_sampler.page(seed, offset, per_page, candidates=candidates, exclude=exclude)
+    match_scores = {}
+    if user_skills and 'match_score' in fields:
+        match_scores = skill_matcher.scores_for(user_skills, page_ids)
+    return page_ids, match_scores, [seed, next_offset], has_more
+
+
+def _feed_cards(user_id, page_ids, match_scores, fields, batch_size=5):
+    """Serialized cards in page order, yielded as rows come off the cursor"""
+    if not page_ids:
+        return
+
+    # Parsed skills come from the process-wide cache (no json.loads per card)
+    job_skills = skills_cache.get_many(page_ids) if 'skills' in fields else {}
+    saved_ids = saved_jobs.saved_ids(user_id) if 'saved' in fields else set()
+
+    def serialize(job):
+        card = {}
+        for field in fields:
+            if field == 'skills':
+                card[field] = list(job_skills.get(job.jobId, ()))
+            elif field == 'match_score':
+                # Match score comes from the vectorized skill matrix
+                card[field] = match_scores.get(job.jobId, 0)
+            elif field == 'saved':
+                card[field] = job.jobId in saved_ids
+            elif field == 'description':
+                card[field] = job_summary(job)
+            else:
+                card[field] = getattr(job, FEED_FIELDS[field])
+        return card
+
+    # Rows arrive in database order; a card is released as soon as every card
+    # before it in page order has been sent
+    rank = {job_id: i for i, job_id in enumerate(page_ids)}
+    pending = {}
+    next_rank = 0
+    query = card_query(FEED_FIELDS[f] for f in fields if FEED_FIELDS[f])
+    for job in query.filter(Job.jobId.in_(page_ids)).yield_per(batch_size):
+        pending[rank[job.jobId]] = serialize(job)
+        while next_rank in pending:
+            yield pending.pop(next_rank)
+            next_rank += 1
+    # Jobs deleted since the page was picked leave gaps - send what is left
+    for i in sorted(pending):
+        yield pending[i]
+
+
+def _build_feed_page(user_id, user_skills, mode, position, per_page, fields, ranges, unseen):
+    """Whole feed page for the prefetcher: (cards, next_position, has_more)"""
+    page_ids, match_scores, next_position, has_more = _feed_page(
+        user_id, user_skills, mode, position, per_page, fields, ranges, unseen)
+    return list(_feed_cards(user_id, page_ids, match_scores, fields)), next_position, has_more
+
+
+def _prefetch_key(user_id, mode, position, per_page, fields, ranges, unseen):
+    return (user_id, mode, tuple(position), per_page, tuple(fields), tuple(sorted(ranges.items())), unseen)
+
+
 @bp.route('/feed')
 @adult_only
 def feed():
-    """API endpoint for job feed (used by scroller)"""
+    """API endpoint for job feed (used by scroller)
+
+    ?format=ndjson streams one JSON card per line as rows are read, followed
+    by a {"meta": {...}} line with the cursor.
+    """
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    per_page = max(1, min(request.args.get('per_page', 10, type=int), 50))
+
+    # Sparse fieldset: ?fields=id,title,company - only those keys are serialized
+    # and only their columns are selected
+    requested = [f.strip() for f in request.args.get('fields', '').split(',')]
+    fields = tuple(f for f in requested if f in FEED_FIELDS) or tuple(FEED_FIELDS)
 
     # Get user's skills for matching
     db_user = DBUser.query.get(current_user.id)
@@ -124,184 +317,174 @@ def feed():
         except:
             user_skills = []
 
-    # Fetch jobs in random order for variety (no 'active' or 'posted_at' fields in database, no 'id' column!)
-    # Use NEWID() for SQL Server random ordering
-    from sqlalchemy import func
-    jobs_pagination = Job.query.order_by(
-        func.newid()  # SQL Server random function
-    ).paginate(page=page, per_page=per_page, error_out=False)
-
-    jobs_data = []
-    for job in jobs_pagination.items:
-        # Parse job skills (using new tagsAndSkills field)
-        job_skills = []
-        try:
-            job_skills = json.loads(job.tagsAndSkills) if job.tagsAndSkills else []
-        except:
-            job_skills = []
+    mode = request.args.get('mode', 'shuffle')  # 'shuffle' or 'best' (ranked by match)
+    after = decode_cursor(request.args.get('after'))
+    ranges = range_filters(request.args)
+    unseen = request.args.get('unseen', '1') != '0'
 
-        # Calculate match score
-        match_score = 0
-        if user_skills and job_skills:
-            matching_skills = set(user_skills).intersection(set(job_skills))
-            match_score = int((len(matching_skills) / len(job_skills)) * 100) if job_skills else 0
+    if mode == 'best':
+        if after and len(after) == 1 and isinstance(after[0], int):
+            position = [after[0]]
+        else:
+            position = [(page - 1) * per_page]
+    else:
+        # Shuffled order comes from a seeded permutation of jobIds, so each page is
+        # a primary-key lookup instead of ORDER BY NEWID() over the whole table.
+        # The cursor carries (seed, offset); page= falls back to the session seed.
+        if after and len(after) == 2 and all(isinstance(v, int) for v in after):
+            position = list(after)
+        else:
+            if page <= 1 or 'feed_seed' not in session:
+                session['feed_seed'] = feed_sampler.new_seed()
+            position = [session['feed_seed'], (page - 1) * per_page]
+
+    # The previous request may already have built this page in the background
+    prefetched = None
+    if current_app.config.get('FEED_PREFETCH', True):
+        prefetched = feed_prefetcher.take(
+            _prefetch_key(current_user.id, mode, position, per_page, fields, ranges, unseen))
+    if prefetched is not None:
+        cards, next_position, has_more = prefetched
+    else:
+        page_ids, match_scores, next_position, has_more = _feed_page(
+            current_user.id, user_skills, mode, position, per_page, fields, ranges, unseen)
+        cards = _feed_cards(current_user.id, page_ids, match_scores, fields)
+    next_cursor = encode_cursor(next_position) if has_more else None
+
+    # Build the next page while the user swipes through this one
+    if has_more and current_app.config.get('FEED_PREFETCH', True):
+        feed_prefetcher.schedule(
+            _prefetch_key(current_user.id, mode, next_position, per_page, fields, ranges, unseen),
+            _build_feed_page, current_user.id, user_skills, mode, next_position, per_page, fields, ranges, unseen)
+
+    meta = {
+        'page': page,
+        'mode': mode,
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    }
 
-        jobs_data.append({
-            'id': job.jobId,  # Using jobId as id since there's no id column
-            'title': job.title,
-            'jobId': job.jobId,
-            'company': job.companyName,
-            'companyId': job.companyId,
-            'description': strip_html(job.jobDescription),  # Strip HTML tags
-            'location': job.location,
-            'experience': job.experience,
-            'salary': job.salary,
-            'minimumSalary': job.minimumSalary,
-            'maximumSalary': job.maximumSalary,
-            'minimumExperience': job.minimumExperience,
-            'maximumExperience': job.maximumExperience,
-            'currency': job.currency,
-            'skills': job_skills,
-            'ReviewsCount': job.ReviewsCount,
-            'AggregateRating': job.AggregateRating,
-            'match_score': match_score,
-            'jobUploaded': job.jobUploaded
-        })
+    if request.args.get('format') == 'ndjson':
+        def generate():
+            for card in cards:
+                yield json.dumps(card) + '\n'
+            yield json.dumps({'meta': meta}) + '\n'
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
-    return jsonify({
-        'jobs': jobs_data,
-        'page': page,
-        'total_pages': jobs_pagination.pages,
-        'has_more': jobs_pagination.has_next
-    })
+    return jsonify({'jobs': list(cards), **meta})
+
+
+@bp.route('/seen', methods=['POST'])
+@adult_only
+def seen():
+    """Record jobs the user swiped past in the scroller"""
+    data = request.get_json(silent=True) or {}
+    job_ids = [job_id for job_id in data.get('job_ids', []) if isinstance(job_id, int)][:200]
+    if job_ids:
+        seen_jobs.mark_seen(current_user.id, job_ids)
+    return jsonify({'success': True})
 
 
 @bp.route('/<int:job_id>')
 def detail(job_id):
     """Job detail page"""
-    job = Job.query.get_or_404(job_id)
+    # Full text is only loaded here - undefer it so it arrives with the row
+    job = Job.query.options(undefer_group('text')).get_or_404(job_id)
 
-    # Parse skills (using new tagsAndSkills field)
-    skills = []
-    try:
-        skills = json.loads(job.tagsAndSkills) if job.tagsAndSkills else []
-    except:
-        skills = []
+    # Parsed skills come from the process-wide cache
+    skills = list(skills_cache.get(job.jobId))
 
-    return render_template('jobs/detail.html', job=job, skills=skills)
+    return render_template('jobs/detail.html', job=job, skills=skills, description=job_full_text(job))
 
 
 @bp.route('/<int:job_id>/apply')
 @adult_only
 def apply(job_id):
-    """Find and redirect to external job application URL"""
-    job = Job.query.get_or_404(job_id)
+    """Redirect to the external job application URL
 
-    # Check if we already have a cached application URL
-    if job.application_url:
-        return redirect(job.application_url)
+    application_url is filled in bulk by resolve_application_urls.py, so this
+    is a single primary-key read with no writes.
+    """
+    row = db.session.query(
+        Job.application_url, Job.companyName, Job.title, Job.location
+    ).filter(Job.jobId == job_id).first()
+    if row is None:
+        abort(404)
 
-    # Try to find the application URL
-    application_url = find_job_application_url(job)
+    # Not resolved yet (new job since the last resolver run) - compute it without writing
+    application_url = row.application_url or resolve_application_url(row.companyName, row.title, row.location)
 
     if application_url:
-        # Save the URL to the database for future use
-        try:
-            job.application_url = application_url
-            db.session.commit()
-        except Exception as e:
-            # If saving fails, just log it and continue
-            print(f"Failed to save application URL: {e}")
-            db.session.rollback()
-
-        # Redirect to the application page
         return redirect(application_url)
     else:
         flash('Could not find application URL for this job. Please search for it manually.', 'warning')
         return redirect(url_for('jobs.detail', job_id=job_id))
 
 
-def find_job_application_url(job):
-    """
-    Find job application URL using web search or construct it
-    Returns the application URL or None
-    """
-    import re
-    from urllib.parse import quote_plus
-
-    # Check if we have a company website or known job board pattern
-    company_name = job.companyName
-    job_title = job.title
-    location = job.location or ''
-
-    if not company_name or not job_title:
-        return None
-
-    # Clean up location - extract city/country
-    location_clean = location.strip()
-
-    # Detect location for job board URLs
-    location_param = ''
-    if location_clean:
-        # Extract main location (before comma if multiple parts)
-        location_parts = location_clean.split(',')
-        main_location = location_parts[0].strip()
-        location_param = quote_plus(main_location)
-
-    # Build search query with location
-    full_search_query = f"{job_title} {company_name}"
-    if location_clean:
-        full_search_query += f" {location_clean}"
-
-    # Common job board patterns with location
-    job_boards = {
-        'linkedin': f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(job_title + ' ' + company_name)}&location={location_param}" if location_param else f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(job_title + ' ' + company_name)}",
-        'indeed': f"https://www.indeed.com/jobs?q={quote_plus(job_title + ' ' + company_name)}&l={location_param}" if location_param else f"https://www.indeed.com/jobs?q={quote_plus(job_title + ' ' + company_name)}",
-        'google': f"https://www.google.com/search?q={quote_plus(full_search_query + ' job application')}",
-    }
-
-    # Try to detect which job board this might be from based on company patterns
-    company_lower = company_name.lower()
-
-    # Check for major tech companies with direct career pages
-    major_companies = {
-        'google': 'https://careers.google.com/jobs/results/',
-        'microsoft': 'https://careers.microsoft.com/professionals/us/en/search-results',
-        'amazon': 'https://www.amazon.jobs/en/search',
-        'meta': 'https://www.metacareers.com/jobs',
-        'facebook': 'https://www.metacareers.com/jobs',
-        'apple': 'https://jobs.apple.com/en-us/search',
-        'netflix': 'https://jobs.netflix.com/search',
-        'tesla': 'https://www.tesla.com/careers/search',
-        'ibm': 'https://www.ibm.com/employment/',
-        'oracle': 'https://careers.oracle.com/jobs/',
-        'nvidia': 'https://nvidia.wd5.myworkdayjobs.com/NVIDIAExternalCareerSite',
-        'intel': 'https://jobs.intel.com/en/search-jobs',
-        'salesforce': 'https://www.salesforce.com/company/careers/',
-        'adobe': 'https://careers.adobe.com/us/en/search-results',
-    }
-
-    for company_key, career_url in major_companies.items():
-        if company_key in company_lower:
-            return career_url
-
-    # Default to Google search (most comprehensive)
-    # This allows users to find the exact job posting
-    return job_boards['google']
-
-
 @bp.route('/<int:job_id>/save', methods=['POST'])
 @adult_only
 def save(job_id):
-    """Save/bookmark job"""
-    # TODO: Implement saved jobs functionality (requires separate saved_jobs table)
-    return jsonify({'success': True})
+    """Save/bookmark job (toggles - a second call removes the bookmark)"""
+    # The write is queued and batched; the saved set is updated immediately
+    now_saved = saved_jobs.toggle(current_user.id, job_id)
+    return jsonify({'success': True, 'saved': now_saved})
 
 
 @bp.route('/saved')
 @adult_only
 def saved():
     """View saved jobs"""
-    # TODO: Implement saved jobs functionality (requires separate saved_jobs table)
-    jobs = []
-    return render_template('jobs/saved.html', jobs=jobs)
+    # Most recently saved first, straight from the cached saved set
+    job_ids = saved_jobs.recent(current_user.id)
+    jobs = feed_sampler.fetch(job_ids, card_query()) if job_ids else []
+    searches = SavedSearch.query.filter_by(user_id=current_user.id).order_by(SavedSearch.created_at.desc()).all()
+    return render_template('jobs/saved.html', jobs=jobs, searches=searches)
+
+
+@bp.route('/searches', methods=['POST'])
+@adult_only
+def save_search():
+    """Save the current browse query - new matching jobs are pushed over Socket.IO"""
+    search = request.form.get('search', '').strip()
+    location = request.form.get('location', '').strip()
+    ranges = range_filters(request.form)
+
+    if not search and not location and all(v is None for v in ranges.values()):
+        flash('Add a search term, location or salary filter before saving a search.', 'warning')
+        return redirect(url_for('jobs.browse'))
+
+    saved_search = SavedSearch(user_id=current_user.id, search=search or None, location=location or None, **ranges)
+    if not CompiledSearch(saved_search).matchable:
+        # Only stop words - it would alert on every new job
+        flash('That search is too general to alert on - add a more specific keyword.', 'warning')
+        return redirect(url_for('jobs.browse', search=search, location=location))
+
+    db.session.add(saved_search)
+    db.session.commit()
+    percolator.add(saved_search)
+
+    flash('Search saved! You will be notified about new matching jobs.', 'success')
+    return redirect(url_for('jobs.browse', search=search, location=location,
+                            min_salary=request.form.get('min_salary', ''),
+                            max_salary=request.form.get('max_salary', ''),
+                            max_exp=request.form.get('max_exp', '')))
+
+
+@bp.route('/searches/<int:search_id>/delete', methods=['POST'])
+@adult_only
+def delete_search(search_id):
+    """Delete a saved search"""
+    saved_search = SavedSearch.query.filter_by(id=search_id, user_id=current_user.id).first_or_404()
+    db.session.delete(saved_search)
+    db.session.commit()
+    percolator.remove(search_id)
+
+    flash('Saved search removed.', 'info')
+    return redirect(url_for('jobs.saved'))
+
+
+@socketio.on('connect')
+def join_user_room():
+    """Every socket of a signed-in user joins their room (saved-search alerts)"""
+    if current_user.is_authenticated:
+        join_room(user_room(current_user.id))
@@ -179,19 +179,19 @@ def ai_chat():
 
 @bp.route('/api/recommend-courses', methods=['POST'])
 def recommend_courses():
-    """Get course recommendations based on college or job skills using fuzzy matching AI
+    """Get course recommendations based on college or job skills
 
     Features:
-    - Fuzzy skill matching with 80% threshold for better accuracy
-    - Ranks courses by match score based on skill overlap
+    - Skill matching through the skill taxonomy, plus word overlap for partial matches
+    - Ranks courses by TF-IDF similarity, nudged by course rating
     - Supports both college name lookup and direct skill input
     - Returns top 10 matched courses with ratings and URLs
     """
     from flask import request, jsonify
-    import requests
-    import os
+    from app.utils.college_catalog import college_catalog
+    from app.utils.course_recommender import course_recommender, roadmap_text
 
-    data = request.get_json()
+    data = request.get_json() or {}
     college_name = data.get('college_name')
     skills = data.get('skills')
 
@@ -199,75 +199,36 @@ def recommend_courses():
         return jsonify({'error': 'Either college_name or skills must be provided'}), 400
 
     try:
-        # Build request payload
-        payload = {}
-        if college_name:
-            payload['college_name'] = college_name
-        if skills:
-            # If skills is a list, send as array (Azure Function handles both formats)
-            if isinstance(skills, list):
-                payload['skills'] = skills
-            else:
-                payload['skills'] = skills
-
-        # Use environment variable for API URL, fallback to default
-        api_url = os.environ.get(
-            'RECOMMEND_API_URL',
-            'https://gptapi-ghd5dghhdvbvaqg3.centralindia-01.azurewebsites.net/recommend'
-        )
-
-        print(f"Calling Recommendation API: {api_url}")
-        print(f"Payload: {payload}")
-
-        # Make POST request with longer timeout (fuzzy matching + DB queries take time)
-        response = requests.post(api_url, json=payload, timeout=90)
-
-        print(f"API Status: {response.status_code}")
-        print(f"API Response: {response.text[:500]}")
-
-        if response.status_code == 200:
-            json_response = response.json()
-
-            # Handle both structured JSON and plain text responses
-            if isinstance(json_response, dict):
-                # New structured format from Azure Function
-                if 'courses' in json_response:
-                    return jsonify({
-                        'success': True,
-                        'roadmap': json_response.get('roadmap', ''),
-                        'courses': json_response.get('courses', []),
-                        'input_skills': json_response.get('input_skills', []),
-                        'matched_skills': json_response.get('matched_skills', [])
-                    })
-                # Old format compatibility
-                else:
-                    return jsonify({
-                        'success': True,
-                        'roadmap': json_response.get('roadmap', json_response)
-                    })
-            else:
-                # Plain text response
-                return jsonify({
-                    'success': True,
-                    'roadmap': str(json_response)
-                })
-        else:
-            return jsonify({
-                'success': False,
-                'error': f'API returned status {response.status_code}',
-                'details': response.text
-            }), 200
+        if isinstance(skills, str):
+            skills = [s.strip() for s in skills.split(',') if s.strip()]
+        skills = [str(s) for s in skills or [] if s]
+        target = ', '.join(skills[:3]) or 'your skills'
 
-    except requests.exceptions.Timeout:
-        return jsonify({
-            'success': False,
-            'error': 'API request timed out. The recommendation engine is taking longer than expected. Please try again.'
-        }), 200
-    except requests.exceptions.ConnectionError:
+        if college_name:
+            catalog = college_catalog.snapshot()
+            college = catalog.find_by_name(college_name)
+            if college is None and not skills:
+                return jsonify({'success': False, 'error': f'College not found: {college_name}'}), 200
+            if college is not None:
+                college_skills = catalog.get(college.id)[1]['required_skills']
+                if not college_skills and college.required_skills:
+                    # Comma-separated rather than JSON
+                    college_skills = [s.strip() for s in college.required_skills.split(',') if s.strip()]
+                skills = list(dict.fromkeys(skills + [str(s) for s in college_skills if s]))
+                target = college.college_name
+
+        if not skills:
+            return jsonify({'success': False, 'error': 'No skills found to match courses against'}), 200
+
+        courses, matched_skills = course_recommender.recommend(skills, limit=10)
         return jsonify({
-            'success': False,
-            'error': 'Could not connect to recommendation service. Please check your internet connection.'
-        }), 200
+            'success': True,
+            'roadmap': roadmap_text(courses, target),
+            'courses': courses,
+            'input_skills': skills,
+            'matched_skills': matched_skills
+        })
+
     except Exception as e:
         print(f"Exception: {type(e).__name__}: {str(e)}")
         import traceback
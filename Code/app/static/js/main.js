@@ -54,6 +54,11 @@ if (typeof io !== 'undefined') {
     socket.on('message_count', function(data) {
         updateMessageCount(data.count);
     });
+
+    socket.on('job_match', function(data) {
+        // New job matching one of the user's saved searches
+        showNotification(`New job: ${data.title} at ${data.company}`, 'info');
+    });
 }
 
 function handleNewMessage(data) {
@@ -190,12 +195,21 @@ function saveJob(jobId) {
     .then(response => response.json())
     .then(data => {
         if (data.success) {
-            showNotification('Job saved!', 'success');
+            markSaved(jobId, data.saved);
+            showNotification(data.saved ? 'Job saved!' : 'Removed from saved jobs', 'success');
         }
     })
     .catch(error => console.error('Error saving job:', error));
 }
 
+function markSaved(jobId, saved) {
+    // Reflect the saved state on every bookmark button for this job
+    document.querySelectorAll(`[data-save-job="${jobId}"]`).forEach(button => {
+        button.classList.toggle('saved', saved);
+        button.classList.toggle('text-blue-600', saved);
+    });
+}
+
 function applyJob(jobId) {
     window.location.href = `/jobs/${jobId}/apply`;
 }
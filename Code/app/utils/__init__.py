@@ -1,3 +1 @@
-from .api_client import APIClient
-
-__all__ = ['APIClient']
+# Utility modules (search indexes, caches and other in-process helpers)
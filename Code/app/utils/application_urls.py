@@ -0,0 +1,102 @@
+"""
+Job application URL resolution
+
+Resolves Job.application_url in bulk so jobs.apply is a single indexed read
+and redirect. Company names are matched against known career pages with one
+compiled alternation regex instead of a linear scan over the dict.
+"""
+
+import re
+from urllib.parse import quote_plus
+
+from sqlalchemy import update
+
+from app.database import db
+from app.models.db_models import Job
+
+
+# Major tech companies with direct career pages
+MAJOR_COMPANIES = {
+    'google': 'https://careers.google.com/jobs/results/',
+    'microsoft': 'https://careers.microsoft.com/professionals/us/en/search-results',
+    'amazon': 'https://www.amazon.jobs/en/search',
+    'meta': 'https://www.metacareers.com/jobs',
+    'facebook': 'https://www.metacareers.com/jobs',
+    'apple': 'https://jobs.apple.com/en-us/search',
+    'netflix': 'https://jobs.netflix.com/search',
+    'tesla': 'https://www.tesla.com/careers/search',
+    'ibm': 'https://www.ibm.com/employment/',
+    'oracle': 'https://careers.oracle.com/jobs/',
+    'nvidia': 'https://nvidia.wd5.myworkdayjobs.com/NVIDIAExternalCareerSite',
+    'intel': 'https://jobs.intel.com/en/search-jobs',
+    'salesforce': 'https://www.salesforce.com/company/careers/',
+    'adobe': 'https://careers.adobe.com/us/en/search-results',
+}
+
+# Substring match like the original `key in company_lower`; longest keys first
+# so a longer name wins over a shorter one starting at the same position
+COMPANY_RE = re.compile('|'.join(
+    re.escape(key) for key in sorted(MAJOR_COMPANIES, key=len, reverse=True)
+))
+
+
+def match_company(company_name):
+    """Career page URL for a known company, or None"""
+    if not company_name:
+        return None
+    match = COMPANY_RE.search(company_name.lower())
+    return MAJOR_COMPANIES[match.group(0)] if match else None
+
+
+def resolve_application_url(company_name, job_title, location=None):
+    """
+    Find job application URL for a job
+    Returns the application URL or None
+    """
+    if not company_name or not job_title:
+        return None
+
+    career_url = match_company(company_name)
+    if career_url:
+        return career_url
+
+    # Default to Google search (most comprehensive)
+    # This allows users to find the exact job posting
+    full_search_query = f"{job_title} {company_name}"
+    location_clean = (location or '').strip()
+    if location_clean:
+        full_search_query += f" {location_clean}"
+    return f"https://www.google.com/search?q={quote_plus(full_search_query + ' job application')}"
+
+
+def resolve_all(batch_size=1000, only_missing=True):
+    """Fill application_url for the jobs table in chunks; returns rows written
+
+    Rows are read with keyset pagination on jobId and written back with ORM
+    bulk UPDATEs by primary key. With only_missing, only jobs where
+    application_url IS NULL are processed (incremental run).
+    """
+    written = 0
+    last_id = None
+    while True:
+        query = db.session.query(Job.jobId, Job.companyName, Job.title, Job.location)
+        if only_missing:
+            query = query.filter(Job.application_url.is_(None))
+        if last_id is not None:
+            query = query.filter(Job.jobId > last_id)
+        rows = query.order_by(Job.jobId).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for job_id, company_name, title, location in rows:
+            url = resolve_application_url(company_name, title, location)
+            if url:
+                updates.append({'jobId': job_id, 'application_url': url})
+        if updates:
+            db.session.execute(update(Job), updates)
+            db.session.commit()
+            written += len(updates)
+        print(f"  ✓ Resolved {written} application URLs")
+    return written
@@ -0,0 +1,278 @@
+"""
+In-process snapshot of the college catalogue
+
+college_collages is small and read-mostly, yet browse stacked up to eight
+ilike('%...%') predicates over it, the filter options ran three SELECT
+DISTINCTs per call and detail re-parsed four JSON fields per view. The whole
+catalogue is loaded once into a versioned, immutable snapshot:
+
+- rows as namedtuples (every College column), pre-sorted in browse order
+  (tier_rank, college_name, id)
+- the JSON fields parsed once per college, exam cutoffs into a sorted
+  per-exam index (see exam_cutoffs.py)
+- per-column lowercase token postings for the filterable columns, so a
+  substring filter only checks the rows whose tokens contain the needle
+- distinct filter options and the comparison statistics (college_stats.py)
+
+The snapshot is replaced after a commit that touched the table (mapper
+events) and, for writes from other processes or scripts, when a cheap
+background probe (row count + latest updated_at) sees a change.
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.database import db
+from app.models.db_models import College, CollegeCollage
+from app.utils.college_stats import CatalogStats
+from app.utils.exam_cutoffs import ExamCutoffIndex, cutoff_texts
+from app.utils.pagination import KeysetPage, decode_cursor, encode_cursor
+from app.utils.read_models import CardPage, card_type
+from app.utils.skill_taxonomy import TOKEN_RE
+
+
+COLUMNS = tuple(College.__mapper__.columns.keys())
+FILTER_COLUMNS = ('college_name', 'stream', 'state', 'city', 'college_type')
+SEARCH_COLUMNS = ('college_name', 'city', 'state', 'stream')
+JSON_FIELDS = {
+    'entrance_exams': list,
+    'required_skills': list,
+    'fee_structure': dict,
+}
+
+CollegeRow = card_type(College, COLUMNS, 'CollegeRow')
+
+
+def parse_json_field(raw, default):
+    """json.loads a text column, falling back to an empty default of the expected type"""
+    if not isinstance(raw, str) or not raw:
+        return default()
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return default()
+    return value if isinstance(value, default) else default()
+
+
+def sort_key(row):
+    """Browse order - NULL tier first (as SQL Server/SQLite sort it), then name, then id"""
+    return (row.tier_rank is not None, row.tier_rank or 0, (row.college_name or '').casefold(), row.id)
+
+
+def _cursor_key(values):
+    tier_rank, college_name, college_id = values
+    return (tier_rank is not None, tier_rank or 0, (college_name or '').casefold(), college_id)
+
+
+class CatalogSnapshot:
+    """Immutable catalogue version"""
+
+    def __init__(self, rows, version, signature):
+        self.version = version
+        self.signature = signature
+        self.rows = sorted(rows, key=sort_key)
+        self.keys = [sort_key(row) for row in self.rows]
+        self.by_id = {row.id: position for position, row in enumerate(self.rows)}
+        self.parsed = []
+        for row in self.rows:
+            parsed = {field: parse_json_field(getattr(row, field), kind) for field, kind in JSON_FIELDS.items()}
+            parsed['typical_exam_cutoffs'] = cutoff_texts(row.typical_exam_cutoffs)
+            self.parsed.append(parsed)
+        self.cutoffs = ExamCutoffIndex(
+            (position, exam, text)
+            for position, parsed in enumerate(self.parsed)
+            for exam, text in parsed['typical_exam_cutoffs'].items()
+        )
+
+        # column -> token -> sorted row positions
+        self.postings = {}
+        for column in FILTER_COLUMNS:
+            tokens = defaultdict(list)
+            for position, row in enumerate(self.rows):
+                for token in set(TOKEN_RE.findall((getattr(row, column) or '').lower())):
+                    tokens[token].append(position)
+            self.postings[column] = {token: np.array(rows, dtype=np.int32) for token, rows in tokens.items()}
+
+        self.options = {
+            name: sorted({getattr(row, column) for row in self.rows if getattr(row, column)})
+            for name, column in (('streams', 'stream'), ('states', 'state'), ('college_types', 'college_type'))
+        }
+        self.stats = CatalogStats(self.rows)
+
+    def _contains(self, column, needle):
+        """Sorted row positions whose column contains needle (case-insensitive, like ilike '%needle%')"""
+        needle = needle.lower()
+        tokens = TOKEN_RE.findall(needle)
+        if tokens:
+            # Narrow with postings: every needle token must appear inside some token of the value
+            postings = self.postings[column]
+            candidates = None
+            for token in tokens:
+                rows = [p for t, p in postings.items() if token in t]
+                hits = np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int32)
+                candidates = hits if candidates is None else np.intersect1d(candidates, hits, assume_unique=True)
+        else:
+            candidates = np.arange(len(self.rows), dtype=np.int32)
+        return np.array(
+            [p for p in candidates.tolist() if needle in (getattr(self.rows[p], column) or '').lower()],
+            dtype=np.int32,
+        )
+
+    def filter(self, stream='', state='', city='', college_type='', search=''):
+        """Row positions (in browse order) matching the browse filters"""
+        selected = None
+
+        def narrow(positions):
+            return positions if selected is None else np.intersect1d(selected, positions, assume_unique=True)
+
+        for column, needle in (('stream', stream), ('state', state), ('city', city), ('college_type', college_type)):
+            if needle:
+                selected = narrow(self._contains(column, needle))
+        if search:
+            matches = [self._contains(column, search) for column in SEARCH_COLUMNS]
+            selected = narrow(np.unique(np.concatenate(matches)))
+        return np.arange(len(self.rows), dtype=np.int32) if selected is None else selected
+
+    def paginate(self, positions, page=1, per_page=20):
+        """Offset page over filtered positions (CardPage, like the ORM paginate)"""
+        page = max(page or 1, 1)
+        start = (page - 1) * per_page
+        items = [self.rows[p] for p in positions[start:start + per_page].tolist()]
+        return CardPage(items, page, per_page, len(positions))
+
+    def keyset_page(self, positions, after=None, per_page=20):
+        """Cursor page over filtered positions (after= tokens encode [tier_rank, college_name, id])"""
+        start = 0
+        values = decode_cursor(after)
+        if values is not None and len(values) == 3:
+            try:
+                key = _cursor_key(values)
+                start = bisect.bisect_right([self.keys[p] for p in positions.tolist()], key)
+            except TypeError:
+                start = 0  # Malformed cursor - start from the top, like keyset_paginate
+        window = positions[start:start + per_page + 1].tolist()
+        has_more = len(window) > per_page
+        items = [self.rows[p] for p in window[:per_page]]
+        next_cursor = None
+        if items and has_more:
+            last = items[-1]
+            next_cursor = encode_cursor([last.tier_rank, last.college_name, last.id])
+        return KeysetPage(items, next_cursor, has_more)
+
+    def get(self, college_id):
+        """(row, parsed JSON fields) for a college id, or None"""
+        position = self.by_id.get(college_id)
+        if position is None:
+            return None
+        return self.rows[position], self.parsed[position]
+
+    def eligible(self, exam, rank=None, score=None, percentile=None):
+        """[(row, Cutoff, cutoff text)] for colleges the student clears, best tier first (unranked last)"""
+        matches = {}
+        for position, cutoff, text in self.cutoffs.eligible(exam, rank, score, percentile):
+            matches.setdefault(position, (cutoff, text))
+        # Positions are in (tier_rank, college_name, id) order already
+        order = sorted(matches, key=lambda p: (self.rows[p].tier_rank is None, p))
+        return [(self.rows[p], *matches[p]) for p in order]
+
+    def find_by_name(self, name):
+        """Exact name match first, then the first college whose name contains it"""
+        if not name:
+            return None
+        lowered = name.lower()
+        for row in self.rows:
+            if (row.college_name or '').lower() == lowered:
+                return row
+        positions = self._contains('college_name', name)
+        return self.rows[int(positions[0])] if len(positions) else None
+
+
+class CollegeCatalog:
+    """Process-wide catalogue snapshot, replaced when the table changes"""
+
+    def __init__(self, check_interval=30):
+        self.check_interval = check_interval  # seconds between background change probes
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = 0
+        self._checked_at = 0.0
+        self._checking = False
+
+    def init_app(self, app):
+        """Register the commit hooks (idempotent across app instances)"""
+        if not event.contains(Session, 'after_flush', _collect_college_changes):
+            event.listen(Session, 'after_flush', _collect_college_changes)
+            event.listen(Session, 'after_commit', _invalidate_after_commit)
+            event.listen(Session, 'after_rollback', _discard_college_changes)
+
+    @staticmethod
+    def _signature():
+        """Cheap change probe - row count and latest update"""
+        count, updated = db.session.query(func.count(College.id), func.max(College.updated_at)).one()
+        return count, updated
+
+    def _load(self):
+        signature = self._signature()
+        rows = [CollegeRow._make(row) for row in db.session.execute(
+            select(*[getattr(College, c) for c in COLUMNS])
+        )]
+        with self._lock:
+            self._version += 1
+            self._snapshot = CatalogSnapshot(rows, self._version, signature)
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        """Drop the snapshot; the next request reloads it"""
+        with self._lock:
+            self._snapshot = None
+
+    def snapshot(self):
+        """Current snapshot; a background probe reloads it if the table changed elsewhere"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self._load()
+        if time.monotonic() - self._checked_at > self.check_interval and not self._checking:
+            self._checking = True
+            app = current_app._get_current_object()
+            threading.Thread(target=self._probe, args=(app, snapshot), daemon=True).start()
+        return snapshot
+
+    def _probe(self, app, snapshot):
+        with app.app_context():
+            try:
+                if self._signature() != snapshot.signature:
+                    self._load()
+                else:
+                    self._checked_at = time.monotonic()
+            except Exception as e:
+                print(f"College catalog probe failed: {e}")
+            finally:
+                self._checking = False
+
+
+def _collect_college_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (College, CollegeCollage)):
+            session.info['colleges_changed'] = True
+            return
+
+
+def _invalidate_after_commit(session):
+    if session.info.pop('colleges_changed', False):
+        college_catalog.invalidate()
+
+
+def _discard_college_changes(session):
+    session.info.pop('colleges_changed', None)
+
+
+college_catalog = CollegeCatalog()
@@ -0,0 +1,104 @@
+"""
+Catalogue-wide statistics for comparing colleges
+
+For the comparison metrics (fee, placement salary, seat intake, tier, year
+established) the whole catalogue is held as one float matrix (NaN = missing)
+with a sorted copy of every column. Comparing N colleges is then a handful
+of array operations: min-max normalization and a searchsorted per metric for
+percentile ranks.
+
+Stats belong to a college catalogue snapshot, so they are computed once per
+catalogue version and recomputed only when the table changes.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+Metric = namedtuple('Metric', 'key label higher_is_better')
+
+METRICS = (
+    Metric('fee_structure', 'Total Fee', False),
+    Metric('placement_average_salary', 'Average Placement (LPA)', True),
+    Metric('seat_intake', 'Seat Intake', True),
+    Metric('tier_rank', 'Tier', False),
+    Metric('year_established', 'Year Established', False),  # Older = more established
+)
+
+
+class CatalogStats:
+    """Value matrix and per-metric distributions over every college in a snapshot"""
+
+    def __init__(self, rows):
+        self.values = np.array(
+            [[np.nan if getattr(row, m.key) is None else getattr(row, m.key) for m in METRICS] for row in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(METRICS))
+        self.higher_is_better = np.array([m.higher_is_better for m in METRICS])
+
+        # Sorted finite values per metric
+        self.sorted = [np.sort(column[~np.isnan(column)]) for column in self.values.T]
+        self.low = np.array([c[0] if len(c) else np.nan for c in self.sorted])
+        self.high = np.array([c[-1] if len(c) else np.nan for c in self.sorted])
+        self.median = np.array([np.median(c) if len(c) else np.nan for c in self.sorted])
+
+    def normalized(self, values):
+        """Min-max scale (N, M) values to 0-1, oriented so 1 is the better end"""
+        spread = self.high - self.low
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scaled = np.where(spread > 0, (values - self.low) / np.where(spread > 0, spread, 1), 1.0)
+        scaled = np.where(self.higher_is_better, scaled, 1 - scaled)
+        return np.where(np.isnan(values), np.nan, scaled)
+
+    def percentiles(self, values):
+        """Share of the catalogue (0-100) each value beats or ties, per metric"""
+        result = np.full(values.shape, np.nan)
+        for j, column in enumerate(self.sorted):
+            n = len(column)
+            if not n:
+                continue
+            present = ~np.isnan(values[:, j])
+            if self.higher_is_better[j]:
+                beaten = np.searchsorted(column, values[present, j], side='right')
+            else:
+                beaten = n - np.searchsorted(column, values[present, j], side='left')
+            result[present, j] = beaten * 100.0 / n
+        return result
+
+    def compare(self, positions):
+        """(values, normalized, percentiles, best) for snapshot row positions
+
+        best[i, j] is True when row i has the best value of metric j among the
+        compared colleges.
+        """
+        values = self.values[positions]
+        normalized = self.normalized(values)
+        best = np.zeros(values.shape, dtype=bool)
+        if len(positions) > 1:
+            filled = np.where(np.isnan(normalized), -1.0, normalized)
+            top = filled.max(axis=0)
+            best = (filled == top) & (top >= 0) & ~np.isnan(values)
+        return values, normalized, self.percentiles(values), best
+
+    def summary(self):
+        """Catalogue-wide min/median/max per metric"""
+        return [
+            {
+                'key': m.key,
+                'label': m.label,
+                'higher_is_better': m.higher_is_better,
+                'min': as_number(self.low[j]),
+                'median': as_number(self.median[j]),
+                'max': as_number(self.high[j]),
+            }
+            for j, m in enumerate(METRICS)
+        ]
+
+
+def as_number(value, digits=None):
+    """JSON-safe float (None for NaN), optionally rounded"""
+    if value is None or np.isnan(value):
+        return None
+    value = float(value)
+    return round(value, digits) if digits is not None else value
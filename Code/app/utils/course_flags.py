@@ -0,0 +1,225 @@
+"""
+Course content-type flags: one bitmask column plus an in-memory bitmap index
+
+Course has eleven BIGINT has_* flags (has_quiz, has_video, ...), so a
+"quizzes and programming, no peer review" filter touched eleven unindexed
+columns. They are packed into Course.content_flags (bit i = CONTENT_FLAGS[i]),
+kept in sync on ORM writes, packed for courses loaded outside the ORM by an
+ingest sweep (utils/ingest.py, run by run_ingest.py) and backfilled by
+materialize_course_flags.py.
+
+CourseFlagIndex holds one packed bitset per flag across all courses. A filter
+is resolved with bitwise AND / AND NOT over those bitsets in NumPy; what
+reaches SQL is only the short list of distinct masks the matching courses
+carry, as `content_flags IN (...)` on an indexed column. Flag commits mark
+the index stale; the next query rebuilds it in the background and keeps
+answering from the previous snapshot meanwhile.
+"""
+
+import threading
+import time
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import case, event, false, inspect, or_, update
+from sqlalchemy.orm import Session, object_session
+
+from app.database import db
+from app.models.db_models import Course
+from app.utils.ingest import ingest
+
+
+# Bit order is stored in the database - append only, never reorder
+CONTENT_FLAGS = (
+    'assignment', 'app', 'programming', 'reading', 'plugin', 'ungraded',
+    'quiz', 'teammate', 'peer', 'discussion', 'video',
+)
+FLAG_BITS = {name: 1 << bit for bit, name in enumerate(CONTENT_FLAGS)}
+FLAG_LABELS = {
+    'assignment': 'Assignments', 'app': 'Apps', 'programming': 'Programming',
+    'reading': 'Readings', 'plugin': 'Plugins', 'ungraded': 'Ungraded Labs',
+    'quiz': 'Quizzes', 'teammate': 'Team Projects', 'peer': 'Peer Review',
+    'discussion': 'Discussions', 'video': 'Videos',
+}
+
+IN_CHUNK = 500  # SQL Server caps a statement at 2100 parameters
+
+
+def pack_flags(course):
+    """content_flags value for a course from its has_* columns"""
+    mask = 0
+    for name, bit in FLAG_BITS.items():
+        if getattr(course, f'has_{name}'):
+            mask |= bit
+    return mask
+
+
+def parse_flags(values):
+    """Known flag names from request args (accepts repeated or comma-separated values)"""
+    names = []
+    for value in values:
+        names.extend(v.strip() for v in value.split(','))
+    return [name for name in dict.fromkeys(names) if name in FLAG_BITS]
+
+
+class FlagSnapshot:
+    """Immutable per-flag bitsets over the course rows"""
+
+    def __init__(self, masks):
+        self.masks = np.asarray(masks, dtype=np.uint16)
+        self.size = len(self.masks)
+        self.bitsets = {
+            name: np.packbits((self.masks & bit) != 0)
+            for name, bit in FLAG_BITS.items()
+        }
+        self.everything = np.packbits(np.ones(self.size, dtype=bool))
+
+    def match(self, require=(), exclude=()):
+        """Packed bitset of rows with every required flag and none of the excluded"""
+        result = self.everything.copy()
+        for name in require:
+            result &= self.bitsets[name]
+        for name in exclude:
+            result &= ~self.bitsets[name]
+        return result
+
+    def count(self, bitset):
+        return int(np.unpackbits(bitset, count=self.size).sum())
+
+    def masks_in(self, bitset):
+        """Distinct content_flags values among the rows of a bitset"""
+        rows = np.flatnonzero(np.unpackbits(bitset, count=self.size))
+        return np.unique(self.masks[rows]).tolist()
+
+
+class CourseFlagIndex:
+    """Bitmap index over Course.content_flags, reloaded on flag changes or after ttl"""
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._rebuilding = False
+        self._generation = 0  # bumped by every committed flag change
+        self._built_generation = 0
+
+    def init_app(self, app):
+        """Register the mapper hooks (idempotent across app instances) and the ingest sweep"""
+        for name in ('before_insert', 'before_update'):
+            if not event.contains(Course, name, _pack_on_write):
+                event.listen(Course, name, _pack_on_write)
+        if not event.contains(Session, 'after_commit', _invalidate_after_commit):
+            event.listen(Session, 'after_commit', _invalidate_after_commit)
+            event.listen(Session, 'after_rollback', _discard_flag_changes)
+        ingest.register_sweep('course flags', _pack_new_rows)
+
+    @staticmethod
+    def _load(batch_size=5000):
+        rows = db.session.query(Course.content_flags).filter(Course.content_flags.isnot(None))
+        return FlagSnapshot([mask for mask, in rows.yield_per(batch_size)])
+
+    def invalidate(self):
+        """Rebuild (in the background) on the next query"""
+        # No lock - the first load holds it, and any bump makes the generations differ
+        self._generation += 1
+
+    def snapshot(self):
+        """Current FlagSnapshot; a stale one is served while it rebuilds in the background"""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._built_generation = self._generation
+                    self._snapshot = self._load()
+                    self._loaded_at = time.monotonic()
+        elif (self._built_generation != self._generation
+              or time.monotonic() - self._loaded_at > self.ttl) and not self._rebuilding:
+            self._rebuilding = True
+            app = current_app._get_current_object()
+            threading.Thread(target=self._rebuild, args=(app,), daemon=True).start()
+        return self._snapshot
+
+    def _rebuild(self, app):
+        generation = self._generation
+        with app.app_context():
+            try:
+                snapshot = self._load()
+                with self._lock:
+                    self._snapshot = snapshot
+                    self._loaded_at = time.monotonic()
+                    # A change committed while loading leaves the new snapshot stale
+                    self._built_generation = generation
+            except Exception as e:
+                print(f"Course flag index rebuild failed: {e}")
+            finally:
+                self._rebuilding = False
+
+    def facet_counts(self, require=(), exclude=()):
+        """{flag: number of courses that would match if the flag were also required}"""
+        snapshot = self.snapshot()
+        selected = snapshot.match(require, exclude)
+        return {name: snapshot.count(selected & bitset) for name, bitset in snapshot.bitsets.items()}
+
+    def condition(self, require=(), exclude=()):
+        """SQL filter for the flag selection, or None when nothing is selected
+
+        Courses not backfilled yet (content_flags NULL) never match a flag filter.
+        """
+        if not require and not exclude:
+            return None
+        snapshot = self.snapshot()
+        masks = snapshot.masks_in(snapshot.match(require, exclude))
+        if not masks:
+            return false()
+        return or_(*[
+            Course.content_flags.in_(masks[i:i + IN_CHUNK])
+            for i in range(0, len(masks), IN_CHUNK)
+        ])
+
+
+def _pack_on_write(mapper, connection, course):
+    """Keep content_flags in step with the has_* columns on ORM inserts/updates"""
+    state = inspect(course)
+    if course.content_flags is not None and not any(
+        state.attrs[f'has_{name}'].history.has_changes() for name in CONTENT_FLAGS
+    ):
+        return  # Flags untouched (and possibly not even loaded - they are deferred)
+    mask = pack_flags(course)
+    if course.content_flags != mask:
+        course.content_flags = mask
+        object_session(course).info['course_flags_changed'] = True
+
+
+def _invalidate_after_commit(session):
+    """Reload the bitmap once changed flags are committed (not while the flush may still roll back)"""
+    if session.info.pop('course_flags_changed', False):
+        course_flags.invalidate()
+
+
+def _discard_flag_changes(session):
+    session.info.pop('course_flags_changed', None)
+
+
+def backfill(only_missing=False):
+    """Pack the has_* columns into content_flags (every course, or only where NULL); returns rows written"""
+    packed = sum(
+        case((getattr(Course, f'has_{name}') != 0, bit), else_=0)
+        for name, bit in FLAG_BITS.items()
+    )
+    statement = update(Course).values(content_flags=packed)
+    if only_missing:
+        statement = statement.where(Course.content_flags.is_(None))
+    result = db.session.execute(statement.execution_options(synchronize_session=False))
+    db.session.commit()
+    written = max(result.rowcount, 0)
+    if written:
+        course_flags.invalidate()
+    return written
+
+
+def _pack_new_rows():
+    """Ingest sweep: content_flags for courses loaded outside the ORM"""
+    return backfill(only_missing=True)
+
+
+course_flags = CourseFlagIndex()
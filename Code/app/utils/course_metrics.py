@@ -0,0 +1,166 @@
+"""
+Typed numeric shadows of Course.rating, nu_reviews and enrollments
+
+rating and nu_reviews are VARCHAR in the scraped courses table ("4.7",
+"1,234", "12k", "N/A"), so sorting or filtering on them meant a CAST over
+every row. They are parsed once into indexed numeric columns next to the
+originals:
+
+- ORM writes fill the shadows in the same flush (mapper events)
+- rows loaded outside the ORM are filled by an only_missing backfill that
+  run_ingest.py runs after each load (an ingest sweep - utils/ingest.py);
+  materialize_course_metrics.py adds the columns and can re-parse everything
+- a raw value that does not parse is stored as UNPARSEABLE (-1) rather than
+  NULL, so the only_missing backfill tries each row once
+- the backfill parses each distinct raw value once and joins the (raw,
+  parsed) pairs back onto courses in set-based UPDATE ... FROM statements
+  (courses has no real primary key to address single rows by)
+
+courses.browse sorts (sort=rating|popular|duration) and filters (min_rating=)
+on the shadows, which are plain index seeks.
+"""
+
+import math
+import re
+
+from sqlalchemy import BigInteger, Float, String, cast, column, event, inspect, literal, select, union_all, update, values
+
+from app.database import db
+from app.models.db_models import Course
+from app.utils.ingest import ingest
+
+
+NUMBER_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([km])?', re.IGNORECASE)
+MULTIPLIERS = {'k': 1000, 'm': 1000000}
+MAX_RATING = 5.0
+UNPARSEABLE = -1  # Shadow value for a raw value that is present but does not parse (sorts below every real value)
+
+
+def parse_rating(raw):
+    """Rating text -> float in 0-5, or None when missing/garbled"""
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        value = float(raw)
+    else:
+        match = NUMBER_RE.search(str(raw))
+        if not match:
+            return None
+        value = float(match.group(1).replace(',', ''))
+    if math.isnan(value) or not 0 <= value <= MAX_RATING:
+        return None
+    return value
+
+
+def parse_count(raw):
+    """Count text ("1,234", "12k", "1.2M reviews") -> int, or None"""
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        return None if math.isnan(raw) else int(raw)
+    match = NUMBER_RE.search(str(raw))
+    if not match:
+        return None
+    value = float(match.group(1).replace(',', ''))
+    return int(round(value * MULTIPLIERS.get((match.group(2) or '').lower(), 1)))
+
+
+SHADOWS = (
+    # (raw column, shadow column, parser)
+    ('rating', 'rating_value', parse_rating),
+    ('nu_reviews', 'review_count', parse_count),
+    ('enrollments', 'enrollment_count', parse_count),
+)
+
+PAIRS_PER_STATEMENT = 500  # SQL Server caps a statement at 2100 parameters, SQLite a UNION at 500 SELECTs
+
+
+def _shadow_value(parser, raw):
+    """Parsed value for a shadow column - None only when there is no raw value"""
+    if raw is None:
+        return None
+    parsed = parser(raw)
+    return UNPARSEABLE if parsed is None else parsed
+
+
+def _pairs(rows, parsed_type):
+    """(raw, parsed) rows as a derived table named parsed
+
+    A VALUES list where the dialect takes column aliases for it (SQL Server,
+    PostgreSQL); SQLite gets the same rows as a UNION ALL of SELECTs.
+    """
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return union_all(*[
+            select(literal(raw, String).label('raw'), literal(parsed, parsed_type).label('parsed'))
+            for raw, parsed in rows
+        ]).subquery('parsed')
+    return values(column('raw', String), column('parsed', parsed_type), name='parsed').data(rows)
+
+
+def backfill(only_missing=True, verbose=True):
+    """Fill the shadow columns for the courses table; returns rows written
+
+    enrollments is already numeric and is converted with one set-based
+    UPDATE. rating and nu_reviews are parsed once per distinct raw value and
+    joined back in chunks of PAIRS_PER_STATEMENT pairs, one UPDATE ... FROM
+    (one scan of courses) per chunk; values that do not parse are written as
+    UNPARSEABLE so only_missing does not pick them up again.
+    """
+    written = 0
+    for raw_name, shadow_name, parser in SHADOWS:
+        raw, shadow = getattr(Course, raw_name), getattr(Course, shadow_name)
+        pending = raw.isnot(None) if not only_missing else (raw.isnot(None) & shadow.is_(None))
+
+        if raw_name == 'enrollments':
+            result = db.session.execute(
+                update(Course).where(pending).values({shadow: cast(raw, BigInteger)})
+                .execution_options(synchronize_session=False)
+            )
+            written += max(result.rowcount, 0)
+            db.session.commit()
+            if verbose:
+                print(f"  ✓ {shadow_name}: {result.rowcount} rows")
+            continue
+
+        raw_values = [value for value, in db.session.execute(select(raw).where(pending).distinct())]
+        parsed = [(value, _shadow_value(parser, value)) for value in raw_values]
+        parsed_type = Float if shadow_name == 'rating_value' else BigInteger
+        table = Course.__table__
+        for start in range(0, len(parsed), PAIRS_PER_STATEMENT):
+            pairs = _pairs(parsed[start:start + PAIRS_PER_STATEMENT], parsed_type)
+            where = [table.c[raw_name] == pairs.c.raw]
+            if only_missing:
+                where.append(table.c[shadow_name].is_(None))
+            result = db.session.execute(
+                update(table).where(*where).values({shadow_name: pairs.c.parsed})
+            )
+            written += max(result.rowcount, 0)
+        db.session.commit()
+        if verbose:
+            unparseable = sum(1 for _, value in parsed if value == UNPARSEABLE)
+            print(f"  ✓ {shadow_name}: {len(parsed) - unparseable} distinct values parsed "
+                  f"({unparseable} unparseable)")
+    return written
+
+
+def _backfill_new_rows():
+    """Ingest sweep: shadows for courses loaded outside the ORM"""
+    return backfill(only_missing=True, verbose=False)
+
+
+def _materialize_on_write(mapper, connection, course):
+    """Keep the shadow columns in step with their raw columns on ORM inserts/updates"""
+    state = inspect(course)
+    for raw_name, shadow_name, parser in SHADOWS:
+        if raw_name in state.unloaded:
+            continue  # Deferred and untouched - nothing new to parse
+        if getattr(course, shadow_name) is None or state.attrs[raw_name].history.has_changes():
+            setattr(course, shadow_name, _shadow_value(parser, getattr(course, raw_name)))
+
+
+def init_app(app):
+    """Register the mapper hooks (idempotent across app instances) and the ingest sweep"""
+    for name in ('before_insert', 'before_update'):
+        if not event.contains(Course, name, _materialize_on_write):
+            event.listen(Course, name, _materialize_on_write)
+    ingest.register_sweep('course metrics', _backfill_new_rows)
@@ -0,0 +1,274 @@
+"""
+In-process course recommendations from skill overlap
+
+Replaces the remote /recommend round trip. Course.skills are mapped through
+the skill taxonomy and indexed as a sparse TF-IDF matrix stored term-major
+(one posting array per term, like the job skill matrix), with two kinds of
+terms per skill:
+
+- the canonical skill itself ("machine learning")
+- its words at half weight ("w:machine", "w:learning"), so "Statistics"
+  still reaches "Bayesian Statistics" the way the old fuzzy match did
+
+Scoring a skill list is a weighted np.bincount over the postings of its
+terms (cosine similarity), nudged by Course.rating, then argpartition for the
+top k. The matrix is rebuilt from the courses table after ttl seconds.
+"""
+
+import ast
+import json
+import math
+import re
+import threading
+import time
+
+import numpy as np
+from flask import current_app
+from markupsafe import escape
+
+from app.database import db
+from app.models.db_models import Course
+from app.utils.course_metrics import parse_rating
+from app.utils.read_models import CardQuery
+from app.utils.skill_taxonomy import RELATED_WEIGHT, canonicalize, get_taxonomy, phrase_tokens
+
+
+WORD_WEIGHT = 0.5
+RATING_WEIGHT = 0.2  # share of the final score that comes from the course rating
+STOP_WORDS = frozenset(('a', 'an', 'and', 'for', 'in', 'of', 'on', 'the', 'to', 'with'))
+
+RESULT_COLUMNS = ('url', 'course_name', 'organization', 'provider', 'rating', 'level', 'Duration', 'card_image_url')
+
+
+def parse_course_skills(raw):
+    """Course.skills as a list (JSON or Python list literal, else comma-separated)"""
+    if not raw:
+        return []
+    text = raw.strip()
+    if text.startswith('['):
+        try:
+            value = json.loads(text)
+        except ValueError:
+            try:
+                value = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                value = None
+        if isinstance(value, (list, tuple)):
+            return [str(s).strip() for s in value if str(s).strip()]
+        text = text.strip('[]')
+    return [s.strip(' \'"') for s in re.split(r'[,;|]', text) if s.strip(' \'"')]
+
+
+def skill_terms(skill):
+    """{term: weight} for one skill - canonical phrase, its taxonomy parents and its words
+
+    Parents carry RELATED_WEIGHT, so two skills under one parent (MySQL,
+    PostgreSQL) overlap only through that weaker shared term.
+    """
+    canonical = canonicalize(skill)
+    if not canonical:
+        return {}
+    terms = {canonical: 1.0}
+    for parent in get_taxonomy().parents(canonical):
+        terms.setdefault(parent, RELATED_WEIGHT)
+    for token in phrase_tokens(canonical):
+        if token not in STOP_WORDS:
+            terms.setdefault('w:' + token, WORD_WEIGHT)
+    return terms
+
+
+class CourseMatrix:
+    """Immutable course x term TF-IDF snapshot"""
+
+    def __init__(self, urls, course_skills, ratings):
+        self.urls = list(urls)
+        n = len(self.urls)
+
+        self.vocabulary = {}
+        postings, weights = [], []
+        for row, skills in enumerate(course_skills):
+            terms = {}
+            for skill in skills:
+                for term, weight in skill_terms(skill).items():
+                    terms[term] = max(terms.get(term, 0.0), weight)
+            for term, weight in terms.items():
+                term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                if term_id == len(postings):
+                    postings.append([])
+                    weights.append([])
+                postings[term_id].append(row)
+                weights[term_id].append(weight)
+
+        df = np.fromiter((len(p) for p in postings), dtype=np.float64, count=len(postings))
+        self.idf = np.log1p(n / np.maximum(df, 1))
+        self.indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum(df.astype(np.int64), out=self.indptr[1:])
+        self.indices = np.fromiter((row for p in postings for row in p), dtype=np.int32, count=int(self.indptr[-1]))
+        self.values = np.fromiter((w for ws in weights for w in ws), dtype=np.float64, count=int(self.indptr[-1]))
+        # tf (term weight) x idf, then the row norms for cosine similarity
+        self.values *= np.repeat(self.idf, np.diff(self.indptr))
+        self.norms = np.sqrt(np.bincount(self.indices, weights=self.values ** 2, minlength=n))
+
+        ratings = np.asarray(ratings, dtype=np.float64)
+        self.rating_factor = (1 - RATING_WEIGHT) + RATING_WEIGHT * np.nan_to_num(np.clip(ratings, 0, 5) / 5)
+
+    def query(self, skills):
+        """{term_id: weight} for a skill list (terms outside the vocabulary are dropped)"""
+        terms = {}
+        for skill in skills:
+            for term, weight in skill_terms(skill).items():
+                term_id = self.vocabulary.get(term)
+                if term_id is not None:
+                    terms[term_id] = max(terms.get(term_id, 0.0), weight * self.idf[term_id])
+        return terms
+
+    def _rows(self, term_id):
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.indices[start:end], self.values[start:end]
+
+    def similarity(self, skills):
+        """Cosine similarity between the skill list and every course"""
+        terms = self.query(skills)
+        if not terms:
+            return np.zeros(len(self.urls))
+        rows, values = zip(*(self._rows(t) for t in terms))
+        query_weights = np.repeat(list(terms.values()), [len(r) for r in rows])
+        dot = np.bincount(np.concatenate(rows), weights=np.concatenate(values) * query_weights,
+                          minlength=len(self.urls))
+        query_norm = math.sqrt(sum(w * w for w in terms.values()))
+        return dot / (np.maximum(self.norms, 1e-12) * query_norm)
+
+    def matched(self, skill, rows):
+        """Bool mask over rows - which of those courses share a term with the skill"""
+        hit = np.zeros(len(rows), dtype=bool)
+        for term_id in self.query([skill]):
+            hit |= np.isin(rows, self._rows(term_id)[0])
+        return hit
+
+    def top(self, skills, limit=10):
+        """[(row, similarity)] best first - courses with no shared term are left out"""
+        similarity = self.similarity(skills)
+        score = similarity * self.rating_factor
+        candidates = np.flatnonzero(similarity)
+        if limit < len(candidates):
+            candidates = candidates[np.argpartition(-score[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-score[candidates], kind='stable')]
+        return [(int(row), float(similarity[row])) for row in candidates]
+
+
+class CourseRecommender:
+    """Process-wide course matrix, rebuilt from the courses table after ttl seconds"""
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._built_at = 0.0
+        self._rebuilding = False
+
+    def matrix(self):
+        """Current matrix snapshot; a stale one is served while it rebuilds in the background"""
+        if self._matrix is None:
+            with self._lock:
+                if self._matrix is None:
+                    self._matrix = self._build()
+                    self._built_at = time.monotonic()
+        elif time.monotonic() - self._built_at > self.ttl and not self._rebuilding:
+            self._rebuilding = True
+            app = current_app._get_current_object()
+            threading.Thread(target=self._rebuild, args=(app,), daemon=True).start()
+        return self._matrix
+
+    def _rebuild(self, app):
+        with app.app_context():
+            try:
+                matrix = self._build()
+                with self._lock:
+                    self._matrix = matrix
+                    self._built_at = time.monotonic()
+            except Exception as e:
+                print(f"Course matrix rebuild failed: {e}")
+            finally:
+                self._rebuilding = False
+
+    @staticmethod
+    def _build(batch_size=5000):
+        urls, course_skills, ratings = [], [], []
+        rows = db.session.query(Course.url, Course.skills, Course.rating_value, Course.rating).filter(
+            Course.skills.isnot(None)
+        ).yield_per(batch_size)
+        for url, raw, rating_value, rating in rows:
+            skills = parse_course_skills(raw)
+            if skills:
+                if rating_value is None:
+                    rating_value = parse_rating(rating)  # Row not backfilled yet
+                elif rating_value < 0:
+                    rating_value = None  # Unparseable
+                urls.append(url)
+                course_skills.append(skills)
+                ratings.append(math.nan if rating_value is None else rating_value)
+        return CourseMatrix(urls, course_skills, ratings)
+
+    def invalidate(self):
+        """Force a rebuild on the next request"""
+        with self._lock:
+            self._matrix = None
+
+    def recommend(self, skills, limit=10):
+        """Top courses for a skill list as (courses, matched_skills)
+
+        Each course is a dict of its card columns plus match_score (integer
+        cosine similarity percentage) and the input skills it covers;
+        matched_skills are the input skills covered by any returned course.
+        """
+        matrix = self.matrix()
+        ranked = matrix.top(skills, limit)
+        if not ranked:
+            return [], []
+
+        rows = np.array([row for row, _ in ranked])
+        covers = {skill: matrix.matched(skill, rows) for skill in skills}
+
+        urls = [matrix.urls[row] for row in rows]
+        cards = {
+            card.url: card for card in
+            CardQuery(Course, RESULT_COLUMNS, 'RecommendedCourse').filter(Course.url.in_(urls)).all()
+        }
+
+        courses = []
+        for position, (url, (_, similarity)) in enumerate(zip(urls, ranked)):
+            card = cards.get(url)
+            if card is None:
+                continue  # Deleted since the last rebuild
+            course = card._asdict()
+            course['match_score'] = int(round(similarity * 100))
+            course['matched_skills'] = [skill for skill, hit in covers.items() if hit[position]]
+            courses.append(course)
+        matched_skills = [skill for skill, hit in covers.items() if hit.any()]
+        return courses, matched_skills
+
+
+def roadmap_text(courses, target):
+    """Learning path text for the recommendation modal (HTML-escaped - it is inserted as markup)"""
+    if not courses:
+        return f"No courses in the catalogue match the skills for {escape(target)} yet."
+    lines = [f"Recommended learning path for {escape(target)}:", ""]
+    for number, course in enumerate(courses, 1):
+        course = {key: escape(value) if isinstance(value, str) else value for key, value in course.items()}
+        course['matched_skills'] = [escape(skill) for skill in course['matched_skills']]
+        by = ' - '.join(p for p in (course['organization'], course['provider']) if p)
+        lines.append(f"{number}. {course['course_name']}" + (f" ({by})" if by else ''))
+        details = [f"Match: {course['match_score']}%"]
+        if course['level']:
+            details.insert(0, f"Level: {course['level']}")
+        if parse_rating(course['rating']) is not None:
+            details.append(f"Rating: {course['rating']}")
+        lines.append('   ' + ' · '.join(details))
+        if course['matched_skills']:
+            lines.append('   Covers: ' + ', '.join(course['matched_skills']))
+        lines.append(f"   {course['url']}")
+        lines.append('')
+    return '\n'.join(lines).rstrip()
+
+
+course_recommender = CourseRecommender()
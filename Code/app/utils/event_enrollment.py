@@ -0,0 +1,223 @@
+"""
+Event enrollment engine - seat reservation with a conditional UPDATE
+
+events.enroll used to read the enrollment, COUNT the enrolled rows and then
+INSERT, in three statements with nothing held in between. A burst of
+requests for a popular workshop all saw the same count, so max_participants
+was oversold and duplicate requests from one user surfaced as
+unique_user_event_enrollment errors.
+
+A seat is now taken with one statement against the event row:
+
+    UPDATE events SET enrolled_count = enrolled_count + 1
+    WHERE id = :event_id AND (max_participants IS NULL OR enrolled_count < max_participants)
+
+One affected row means the seat is ours; the row stays locked until the
+enrollment row is written and the transaction commits, so concurrent enrolls
+for one event queue on that row instead of racing past the capacity check. A
+duplicate insert rolls the reservation back with it.
+
+Both enroll and cancel lock the event row before touching event_enrollments,
+so the two never deadlock on each other. With EVENT_WAITLIST on, a full event
+puts the user on a FIFO waitlist (status 'waitlisted', ordered by
+enrolled_at, id) and every freed seat promotes the head of the queue in the
+same transaction as the cancel.
+
+These are Core statements - they skip the EventEnrollment mapper hooks in
+event_seats.py, which count ORM writes.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.models.db_models import Event, EventEnrollment
+
+
+ENROLLED = 'enrolled'
+WAITLISTED = 'waitlisted'
+CANCELLED = 'cancelled'
+
+# outcome: enrolled, waitlisted, already_enrolled, already_waitlisted, full, not_found,
+#          cancelled, not_enrolled; position: 1-based waitlist position (waitlist outcomes only)
+EnrollResult = namedtuple('EnrollResult', 'outcome position promoted', defaults=(None, 0))
+
+BULK = {'synchronize_session': False}
+
+
+def _execute(stmt):
+    return db.session.execute(stmt.execution_options(**BULK))
+
+
+class EnrollmentEngine:
+    """Enroll / cancel with atomic seat reservation and an optional FIFO waitlist"""
+
+    def __init__(self, waitlist=True):
+        self.waitlist = waitlist
+
+    def init_app(self, app):
+        self.waitlist = app.config.get('EVENT_WAITLIST', self.waitlist)
+
+    @staticmethod
+    def _reserve(event_id):
+        """Take one seat if the event has room; True when reserved"""
+        result = _execute(
+            update(Event)
+            .where(Event.id == event_id, or_(
+                Event.max_participants.is_(None),
+                Event.max_participants <= 0,
+                Event.enrolled_count < Event.max_participants,
+            ))
+            .values(enrolled_count=Event.enrolled_count + 1)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _release(event_id):
+        _execute(
+            update(Event)
+            .where(Event.id == event_id, Event.enrolled_count > 0)
+            .values(enrolled_count=Event.enrolled_count - 1)
+        )
+
+    @staticmethod
+    def _existing(user_id, event_id):
+        """(id, status) of the user's enrollment row, or None"""
+        return db.session.execute(
+            select(EventEnrollment.id, EventEnrollment.status)
+            .where(EventEnrollment.user_id == user_id, EventEnrollment.event_id == event_id)
+        ).first()
+
+    @staticmethod
+    def waitlist_position(user_id, event_id):
+        """1-based place in the event's waitlist, or None when not waitlisted"""
+        own = db.session.execute(
+            select(EventEnrollment.id, EventEnrollment.enrolled_at).where(
+                EventEnrollment.user_id == user_id,
+                EventEnrollment.event_id == event_id,
+                EventEnrollment.status == WAITLISTED,
+            )
+        ).first()
+        if own is None:
+            return None
+        ahead = db.session.execute(
+            select(func.count(EventEnrollment.id)).where(
+                EventEnrollment.event_id == event_id,
+                EventEnrollment.status == WAITLISTED,
+                or_(EventEnrollment.enrolled_at < own.enrolled_at,
+                    and_(EventEnrollment.enrolled_at == own.enrolled_at, EventEnrollment.id < own.id)),
+            )
+        ).scalar()
+        return ahead + 1
+
+    def _write(self, existing, user_id, event_id, status):
+        """Insert or reactivate the user's row with status; False when another request got there first"""
+        now = datetime.utcnow()
+        if existing is None:
+            _execute(insert(EventEnrollment).values(
+                user_id=user_id, event_id=event_id, status=status, enrolled_at=now
+            ))
+            return True
+        result = _execute(
+            update(EventEnrollment)
+            .where(EventEnrollment.id == existing.id, EventEnrollment.status.notin_((ENROLLED, WAITLISTED)))
+            .values(status=status, enrolled_at=now, completed_at=None)
+        )
+        return result.rowcount == 1
+
+    def _promote(self, event_id):
+        """Move waitlisted users into free seats, oldest first; returns how many were promoted"""
+        promoted = 0
+        while self._reserve(event_id):
+            head = db.session.execute(
+                select(EventEnrollment.id)
+                .where(EventEnrollment.event_id == event_id, EventEnrollment.status == WAITLISTED)
+                .order_by(EventEnrollment.enrolled_at, EventEnrollment.id)
+                .limit(1)
+            ).scalar()
+            if head is None:
+                self._release(event_id)
+                break
+            _execute(
+                update(EventEnrollment)
+                .where(EventEnrollment.id == head, EventEnrollment.status == WAITLISTED)
+                .values(status=ENROLLED)
+            )
+            promoted += 1
+        return promoted
+
+    def _already(self, user_id, event_id):
+        """Outcome for a user whose row another request wrote concurrently"""
+        existing = self._existing(user_id, event_id)
+        if existing is not None and existing.status == WAITLISTED:
+            return EnrollResult('already_waitlisted', self.waitlist_position(user_id, event_id))
+        return EnrollResult('already_enrolled')
+
+    def enroll(self, user_id, event_id):
+        """Enroll a user, waitlisting them when the event is full; commits and returns an EnrollResult"""
+        existing = self._existing(user_id, event_id)
+        if existing is not None and existing.status == ENROLLED:
+            return EnrollResult('already_enrolled')
+        if existing is not None and existing.status == WAITLISTED:
+            return EnrollResult('already_waitlisted', self.waitlist_position(user_id, event_id))
+
+        try:
+            if self._reserve(event_id):
+                if not self._write(existing, user_id, event_id, ENROLLED):
+                    db.session.rollback()  # Releases the seat with it
+                    return self._already(user_id, event_id)
+                db.session.commit()
+                return EnrollResult('enrolled')
+
+            if db.session.get(Event, event_id) is None:
+                db.session.rollback()
+                return EnrollResult('not_found')
+            if not self.waitlist:
+                db.session.rollback()
+                return EnrollResult('full')
+
+            if not self._write(existing, user_id, event_id, WAITLISTED):
+                db.session.rollback()
+                return self._already(user_id, event_id)
+            # A seat freed after our reservation failed would have found no one to promote
+            self._promote(event_id)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # Duplicate request from the same user
+            return self._already(user_id, event_id)
+
+        position = self.waitlist_position(user_id, event_id)
+        if position is None:
+            return EnrollResult('enrolled')  # Promoted straight away
+        return EnrollResult('waitlisted', position)
+
+    def cancel(self, user_id, event_id):
+        """Cancel an enrollment or waitlist entry; a freed seat goes to the head of the waitlist"""
+        # Lock the event row first (same order as enroll) - the seat is given back below
+        self._release(event_id)
+        result = _execute(
+            update(EventEnrollment)
+            .where(EventEnrollment.user_id == user_id, EventEnrollment.event_id == event_id,
+                   EventEnrollment.status == ENROLLED)
+            .values(status=CANCELLED)
+        )
+        if result.rowcount == 1:
+            promoted = self._promote(event_id) if self.waitlist else 0
+            db.session.commit()
+            return EnrollResult('cancelled', promoted=promoted)
+
+        db.session.rollback()
+        result = _execute(
+            update(EventEnrollment)
+            .where(EventEnrollment.user_id == user_id, EventEnrollment.event_id == event_id,
+                   EventEnrollment.status == WAITLISTED)
+            .values(status=CANCELLED)
+        )
+        db.session.commit()
+        return EnrollResult('cancelled' if result.rowcount == 1 else 'not_enrolled')
+
+
+enrollment_engine = EnrollmentEngine()
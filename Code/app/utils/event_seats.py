@@ -0,0 +1,131 @@
+"""
+Per-event seat counter
+
+events.detail and events.enroll counted the 'enrolled' rows of
+event_enrollments on every request, and browse could not show availability
+without one COUNT per card. Event.enrolled_count holds that number instead:
+
+- every ORM write that moves an enrollment into or out of 'enrolled' (insert,
+  reactivate, cancel, delete) bumps the counter with an atomic
+  `enrolled_count = enrolled_count +/- 1` UPDATE inside the same flush, so
+  counter and enrollment commit or roll back together (mapper events)
+- a reconciler recomputes every counter from event_enrollments in one
+  set-based UPDATE, correcting drift from raw SQL or manual edits; it runs on
+  a timer in the app (EVENT_SEATS_RECONCILE_INTERVAL) and from
+  reconcile_event_seats.py
+"""
+
+import threading
+
+from sqlalchemy import event, func, inspect, select, update
+
+from app.database import db
+from app.models.db_models import Event, EventEnrollment
+
+
+ENROLLED = 'enrolled'
+
+
+def seats_left(event_row):
+    """Open seats for an Event or event card, or None when the event is uncapped"""
+    if not event_row.max_participants:
+        return None
+    return max(event_row.max_participants - (event_row.enrolled_count or 0), 0)
+
+
+def _previous_status(state):
+    """Status before this flush (None when it was never loaded)"""
+    history = state.attrs.status.history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def _bump(connection, event_id, delta):
+    connection.execute(
+        update(Event.__table__)
+        .where(Event.__table__.c.id == event_id)
+        .values(enrolled_count=Event.__table__.c.enrolled_count + delta)
+    )
+
+
+def _count_on_insert(mapper, connection, enrollment):
+    if (enrollment.status or ENROLLED) == ENROLLED:
+        _bump(connection, enrollment.event_id, 1)
+
+
+def _count_on_update(mapper, connection, enrollment):
+    history = inspect(enrollment).attrs.status.history
+    if not history.has_changes():
+        return
+    was_enrolled = (history.deleted[0] if history.deleted else None) == ENROLLED
+    is_enrolled = enrollment.status == ENROLLED
+    if was_enrolled != is_enrolled:
+        _bump(connection, enrollment.event_id, 1 if is_enrolled else -1)
+
+
+def _count_on_delete(mapper, connection, enrollment):
+    if _previous_status(inspect(enrollment)) == ENROLLED:
+        _bump(connection, enrollment.event_id, -1)
+
+
+def reconcile():
+    """Recompute enrolled_count for every event from event_enrollments; returns events corrected"""
+    actual = (
+        select(func.count(EventEnrollment.id))
+        .where(EventEnrollment.event_id == Event.id, EventEnrollment.status == ENROLLED)
+        .correlate(Event)
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(Event)
+        .where(func.coalesce(Event.enrolled_count, -1) != actual)
+        .values(enrolled_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return max(result.rowcount, 0)
+
+
+class SeatReconciler:
+    """Runs reconcile() every interval seconds in a background thread"""
+
+    def __init__(self, interval=900):
+        self.interval = interval
+        self._timer = None
+        self._app = None
+
+    def init_app(self, app):
+        """Register the counter hooks (idempotent) and start the reconcile timer"""
+        for name, hook in (('after_insert', _count_on_insert), ('after_update', _count_on_update),
+                           ('after_delete', _count_on_delete)):
+            if not event.contains(EventEnrollment, name, hook):
+                event.listen(EventEnrollment, name, hook)
+        self._app = app
+        self.interval = app.config.get('EVENT_SEATS_RECONCILE_INTERVAL', self.interval)
+        self._schedule()
+
+    def _schedule(self):
+        if not self.interval or self.interval <= 0:
+            return
+        self._timer = threading.Timer(self.interval, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _run(self):
+        with self._app.app_context():
+            try:
+                corrected = reconcile()
+                if corrected:
+                    print(f"Event seat reconcile corrected {corrected} events")
+            except Exception as e:
+                db.session.rollback()
+                print(f"Event seat reconcile failed: {e}")
+            finally:
+                db.session.remove()
+        self._schedule()
+
+
+event_seats = SeatReconciler()
@@ -0,0 +1,140 @@
+"""
+Entrance-exam cutoff parsing and a sorted per-exam eligibility index
+
+College.typical_exam_cutoffs is free text per exam - a JSON object such as
+{"JEE Advanced": "Rank under 500", "JEE Main": "99 percentile"} or the older
+"JEE Advanced: Rank under 500" form. Each entry is parsed once, when the
+college catalogue snapshot is built, into a numeric cutoff:
+
+- rank cutoffs ("Rank under 500", "AIR 1-2000"): a student qualifies with a
+  rank at or below the cutoff
+- minimum cutoffs ("99 percentile", "95%", "Score 300+"): a student
+  qualifies with a percentile / percentage / score at or above it; "Top 1%"
+  and "Top 0.5 percentile" are the 99th / 99.5th percentile
+
+Per exam, kind and unit the cutoffs are kept in one sorted list, so "every
+college this rank qualifies for" is a single bisect. A percentile is only
+compared with percentile cutoffs; a score with score and percentage cutoffs.
+"""
+
+import bisect
+import json
+import re
+from collections import namedtuple
+
+from app.utils.skill_taxonomy import TOKEN_RE
+
+
+Cutoff = namedtuple('Cutoff', 'kind unit value')  # kind: 'rank' | 'min'
+
+# Student input -> cutoff units it is compared with
+SCORE_UNITS = ('score', 'percent')
+PERCENTILE_UNITS = ('percentile',)
+
+NUMBER_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+RANK_RE = re.compile(r'\brank|\bair\b')
+TOP_SHARE_RE = re.compile(r'\btop\s*(\d[\d,]*(?:\.\d+)?)\s*(?:%|percent)')  # also matches percentile / %ile
+EXAM_ALIASES = {
+    'jee mains': 'jee main',
+    'jee advance': 'jee advanced',
+    'neet ug': 'neet',
+}
+
+
+def exam_key(name):
+    """Normalized exam name ('JEE-Mains' -> 'jee main')"""
+    key = ' '.join(TOKEN_RE.findall(str(name or '').lower()))
+    return EXAM_ALIASES.get(key, key)
+
+
+def parse_cutoff(text):
+    """Cutoff for one entry's text, or None when it has no usable number"""
+    lowered = str(text or '').lower()
+    numbers = [float(n.replace(',', '')) for n in NUMBER_RE.findall(lowered)]
+    if not numbers:
+        return None
+    top_share = TOP_SHARE_RE.search(lowered)
+    if top_share and 0 < float(top_share.group(1).replace(',', '')) <= 100:
+        return Cutoff('min', 'percentile', 100 - float(top_share.group(1).replace(',', '')))  # "Top 1%" -> 99
+    if RANK_RE.search(lowered):
+        return Cutoff('rank', 'rank', max(numbers))  # "Rank 1-500" -> 500
+    if 'percentile' in lowered or '%ile' in lowered:
+        return Cutoff('min', 'percentile', numbers[0])
+    if '%' in lowered:
+        return Cutoff('min', 'percent', numbers[0])
+    if 'top' in lowered:
+        return Cutoff('rank', 'rank', max(numbers))  # "Top 2000"
+    if 'score' in lowered or 'marks' in lowered or '+' in lowered:
+        return Cutoff('min', 'score', numbers[0])
+    return None
+
+
+def cutoff_texts(raw):
+    """{exam: cutoff text} from the column (JSON object, else 'Exam: text; Exam: text')"""
+    if not isinstance(raw, str) or not raw.strip():
+        return {}
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = None
+    if isinstance(value, dict):
+        return {str(exam): str(text) for exam, text in value.items() if text is not None}
+    if value is not None:
+        return {}
+    texts = {}
+    for part in re.split(r'[;\n]', raw):
+        exam, sep, text = part.partition(':')
+        if sep and exam.strip() and text.strip():
+            texts[exam.strip()] = text.strip()
+    return texts
+
+
+class ExamCutoffIndex:
+    """Sorted cutoffs per (exam, kind, unit) over catalogue row positions"""
+
+    def __init__(self, entries):
+        """entries: iterable of (row position, exam name, cutoff text)"""
+        self.names = {}  # exam key -> display name (first seen)
+        sorted_cutoffs = {}  # (exam key, kind, unit) -> [(value, position, Cutoff, text)]
+        for position, exam, text in entries:
+            cutoff = parse_cutoff(text)
+            key = exam_key(exam)
+            if cutoff is None or not key:
+                continue
+            self.names.setdefault(key, exam)
+            sorted_cutoffs.setdefault((key, cutoff.kind, cutoff.unit), []).append((cutoff.value, position, cutoff, text))
+
+        self._values = {}
+        self._entries = {}
+        for index_key, items in sorted_cutoffs.items():
+            items.sort(key=lambda item: (item[0], item[1]))
+            self._values[index_key] = [item[0] for item in items]
+            self._entries[index_key] = [item[1:] for item in items]
+
+    def exams(self):
+        return sorted(self.names.values())
+
+    def __contains__(self, exam):
+        return exam_key(exam) in self.names
+
+    def eligible(self, exam, rank=None, score=None, percentile=None):
+        """[(row position, Cutoff, cutoff text)] for every cutoff the student clears
+
+        rank is compared with rank cutoffs (rank <= cutoff), score with score
+        and percentage cutoffs and percentile with percentile cutoffs
+        (student >= cutoff).
+        """
+        key = exam_key(exam)
+        matches = []
+        if rank is not None:
+            values = self._values.get((key, 'rank', 'rank'), [])
+            start = bisect.bisect_left(values, rank)
+            matches.extend(self._entries[(key, 'rank', 'rank')][start:] if values else [])
+        for student, units in ((score, SCORE_UNITS), (percentile, PERCENTILE_UNITS)):
+            if student is None:
+                continue
+            for unit in units:
+                values = self._values.get((key, 'min', unit), [])
+                end = bisect.bisect_right(values, student)
+                matches.extend(self._entries[(key, 'min', unit)][:end] if values else [])
+        return matches
@@ -0,0 +1,67 @@
+"""
+Background prefetch of the next scroller feed page
+
+While the user swipes through one page, the next page for the same cursor is
+built on a small worker pool and kept for a short time, so the next
+/jobs/feed request is served from memory instead of waiting on the index and
+the database.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import current_app
+
+
+class FeedPrefetcher:
+    """Short-lived cache of precomputed feed pages, filled in the background"""
+
+    def __init__(self, ttl=60, max_pages=2000, workers=2, wait=2.0):
+        self.ttl = ttl  # seconds a prefetched page stays valid
+        self.max_pages = max_pages
+        self.wait = wait  # max seconds a request waits for an in-flight prefetch
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()  # key -> (future, created_at)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='feed-prefetch')
+
+    def schedule(self, key, build, *args):
+        """Start build(*args) in the background unless the page is already cached"""
+        with self._lock:
+            if key in self._pages:
+                return
+            app = current_app._get_current_object()
+            future = self._pool.submit(self._run, app, build, args)
+            self._pages[key] = (future, time.monotonic())
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    @staticmethod
+    def _run(app, build, args):
+        with app.app_context():
+            return build(*args)
+
+    def take(self, key):
+        """Prefetched result for key (removed from the cache), or None"""
+        with self._lock:
+            entry = self._pages.pop(key, None)
+        if entry is None:
+            return None
+        future, created_at = entry
+        if time.monotonic() - created_at > self.ttl:
+            return None
+        try:
+            return future.result(timeout=self.wait)
+        except TimeoutError:
+            return None
+        except Exception as e:
+            print(f"Feed prefetch failed: {e}")
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+
+feed_prefetcher = FeedPrefetcher()
@@ -0,0 +1,161 @@
+"""
+Seeded per-session job feed sampler
+
+Replaces ORDER BY NEWID() in jobs.feed. Each scroller session gets a seed; the
+seed turns the catalogue of jobIds into a fixed permutation (int64 array), and
+pages are slices of that permutation fetched by primary key. Paging is stable
+for the session and works the same on SQL Server and SQLite.
+
+Job inserts and deletes (job_events) drop the catalogue, so sessions started
+after the commit shuffle the new set of jobIds. Each seed stays pinned to the
+catalogue version it was first shuffled from, and a permutation is a pure
+function of (seed, catalogue): the permutation cache is only bounded by bytes
+(FEED_PERMUTATION_CACHE_MB), and an evicted seed is re-derived with the same
+pages. Deleted jobs simply do not come back from fetch.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.database import db
+from app.models.db_models import Job
+from app.utils import job_events
+
+
+class FeedSampler:
+    """Serves shuffled pages of jobIds from a cached catalogue snapshot"""
+
+    def __init__(self, catalogue_ttl=600, max_bytes=64 * 1024 * 1024, max_catalogues=4, max_seeds=100000):
+        self.catalogue_ttl = catalogue_ttl  # seconds before jobIds are re-read
+        self.max_bytes = max_bytes  # permutation cache budget (LRU)
+        self.max_catalogues = max_catalogues  # catalogue versions kept for pinned seeds
+        self.max_seeds = max_seeds  # seed -> catalogue version pins (a few dozen bytes each)
+        self._lock = threading.Lock()
+        self._job_ids = None
+        self._version = 0
+        self._loaded_at = 0.0
+        self._catalogues = OrderedDict()  # version -> sorted int64 jobIds
+        self._seed_versions = OrderedDict()  # seed -> catalogue version it was shuffled from
+        self._permutations = OrderedDict()  # seed -> int64 array
+        self._cached_bytes = 0
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('FEED_PERMUTATION_CACHE_MB', self.max_bytes // (1024 * 1024)) * 1024 * 1024
+        # Updates never change the set of jobIds - only inserts and deletes matter
+        job_events.subscribe(self.drop_catalogue, ('jobId',))
+
+    @staticmethod
+    def new_seed():
+        """Random 63-bit seed for a fresh scroller session"""
+        return secrets.randbits(63)
+
+    def _catalogue(self):
+        """(version, sorted int64 array of every jobId), reloaded after catalogue_ttl"""
+        with self._lock:
+            job_ids, version = self._job_ids, self._version
+            if job_ids is not None and time.monotonic() - self._loaded_at <= self.catalogue_ttl:
+                return version, job_ids
+
+        rows = db.session.query(Job.jobId).order_by(Job.jobId).all()
+        job_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        with self._lock:
+            self._version += 1
+            self._job_ids, version = job_ids, self._version
+            self._loaded_at = time.monotonic()
+            # Older versions stay for the seeds pinned to them
+            self._catalogues[version] = job_ids
+            while len(self._catalogues) > self.max_catalogues:
+                self._catalogues.popitem(last=False)
+        return version, job_ids
+
+    def job_ids(self):
+        """Sorted int64 array of every jobId (reloaded after catalogue_ttl)"""
+        return self._catalogue()[1]
+
+    def permutation(self, seed):
+        """Shuffled copy of the catalogue this seed is pinned to"""
+        with self._lock:
+            perm = self._permutations.get(seed)
+            if perm is not None:
+                self._permutations.move_to_end(seed)
+                return perm
+            version = self._seed_versions.get(seed)
+            job_ids = self._catalogues.get(version)
+
+        if job_ids is None:
+            # New seed (or its catalogue version aged out) - pin it to the current one
+            version, job_ids = self._catalogue()
+        perm = np.random.default_rng(seed).permutation(job_ids)
+
+        with self._lock:
+            self._seed_versions[seed] = version
+            self._seed_versions.move_to_end(seed)
+            while len(self._seed_versions) > self.max_seeds:
+                self._seed_versions.popitem(last=False)
+            if seed not in self._permutations:
+                self._permutations[seed] = perm
+                self._cached_bytes += perm.nbytes
+            while self._cached_bytes > self.max_bytes and len(self._permutations) > 1:
+                _, evicted = self._permutations.popitem(last=False)
+                self._cached_bytes -= evicted.nbytes
+        return perm
+
+    def page(self, seed, offset, limit, candidates=None, exclude=None):
+        """Return (jobIds, next_offset, has_more) for one slice of the permutation
+
+        candidates (sorted jobId array) restricts the permutation to those jobs
+        without changing their relative order, so filtered paging stays stable.
+        exclude(job_ids) -> bool mask drops jobs (e.g. already seen) while
+        walking; offsets stay positions in the permutation, so jobs excluded
+        after they were served do not shift later pages.
+        """
+        perm = self.permutation(seed)
+        if candidates is not None:
+            perm = perm[np.isin(perm, candidates, assume_unique=True)]
+        offset = max(offset, 0)
+        if exclude is None:
+            end = offset + limit
+            return perm[offset:end].tolist(), end, end < len(perm)
+
+        ids = []
+        chunk = max(limit * 4, 256)
+        while offset < len(perm) and len(ids) < limit:
+            window = perm[offset:offset + chunk]
+            keep = np.flatnonzero(~exclude(window))[:limit - len(ids)]
+            ids.extend(window[keep].tolist())
+            # Resume right after the last job taken (or after the whole window)
+            offset += int(keep[-1]) + 1 if len(ids) == limit else len(window)
+        return ids, offset, offset < len(perm)
+
+    def fetch(self, job_ids, query=None, chunk_size=500):
+        """Fetch rows by primary key, preserving permutation order"""
+        if not job_ids:
+            return []
+        query = query if query is not None else Job.query
+        rows = []
+        # Chunk the IN list - SQL Server caps a statement at 2100 parameters
+        for start in range(0, len(job_ids), chunk_size):
+            rows.extend(query.filter(Job.jobId.in_(job_ids[start:start + chunk_size])).all())
+        rank = {job_id: i for i, job_id in enumerate(job_ids)}
+        return sorted(rows, key=lambda job: rank[job.jobId])
+
+    def drop_catalogue(self, job_ids=None):
+        """Re-read jobIds for the next new seed; open sessions stay on their version"""
+        with self._lock:
+            self._job_ids = None
+
+    def invalidate(self):
+        """Force the catalogue to be re-read on the next request"""
+        with self._lock:
+            self._job_ids = None
+            self._catalogues.clear()
+            self._seed_versions.clear()
+            self._permutations.clear()
+            self._cached_bytes = 0
+
+
+feed_sampler = FeedSampler()
@@ -0,0 +1,241 @@
+"""
+Ingest pass - per-row work for rows loaded outside the ORM
+
+Jobs (and courses) mostly reach the database through bulk loaders that bypass
+the ORM, so mapper hooks and job_events never see them. Each ingest source
+keeps a watermark in ingest_watermarks - the highest id already processed -
+and a pass hands every row above it to the handlers registered for that
+source (job_text materializes descriptions, the percolator sends saved-search
+alerts, ...).
+
+Batches are claimed by moving the watermark with a conditional UPDATE
+
+    UPDATE ingest_watermarks SET last_id = :batch_end
+    WHERE name = :name AND last_id = :seen
+
+so web workers and loader scripts running the same pass never process a batch
+twice; a handler that fails loses that batch rather than repeating it (at
+most once - alerts are not sent twice). A source without a watermark row
+starts at its current max id, so the first run does not alert on the whole
+backlog. Ids are assumed to grow with load order.
+
+Tables without an id to watermark (courses has no real primary key) register
+a sweep instead: an idempotent only-missing fill. Sweeps scan their table, so
+only run_ingest.py runs them (run(sweeps=True)) - never the web workers.
+
+The pass runs on a timer in the app (INGEST_INTERVAL), right after ORM
+inserts into Job (INGEST_ON_INSERT), and from run_ingest.py, which loaders
+call after a load. In-memory indexes in other processes notice a pass by
+polling the watermark row (WatermarkFollower) and re-read the new id range.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.models.db_models import IngestWatermark
+from app.utils import job_events
+
+
+class IngestSource:
+    """One watermarked id column and the handlers run on its new rows"""
+
+    def __init__(self, name, column):
+        self.name = name
+        self.column = column
+        self.handlers = []
+
+    def watermark(self, start=None):
+        """Current watermark, creating the row (at start, else max id) when missing"""
+        last_id = db.session.query(IngestWatermark.last_id).filter(IngestWatermark.name == self.name).scalar()
+        if last_id is not None:
+            return last_id
+        if start is None:
+            start = db.session.query(func.max(self.column)).scalar() or 0
+        try:
+            db.session.add(IngestWatermark(name=self.name, last_id=start))
+            db.session.commit()
+            return start
+        except IntegrityError:
+            db.session.rollback()  # Another worker created it first
+            return db.session.query(IngestWatermark.last_id).filter(IngestWatermark.name == self.name).scalar()
+
+    def claim(self, batch_size, start=None):
+        """Advance the watermark over the next batch; returns its ids ([] when caught up)"""
+        while True:
+            seen = self.watermark(start)
+            ids = [row_id for row_id, in db.session.query(self.column).filter(self.column > seen)
+                   .order_by(self.column).limit(batch_size)]
+            if not ids:
+                db.session.rollback()
+                return []
+            result = db.session.execute(
+                update(IngestWatermark)
+                .where(IngestWatermark.name == self.name, IngestWatermark.last_id == seen)
+                .values(last_id=ids[-1], updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return ids
+            # Another worker claimed this batch - read the new watermark and try the next one
+
+
+class WatermarkFollower:
+    """Id ranges ingested by any process since the last poll (reads the watermark at most every interval s)"""
+
+    def __init__(self, name, interval=10.0):
+        self.name = name
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._seen = None
+        self._checked_at = 0.0
+
+    def _read(self):
+        try:
+            return db.session.query(IngestWatermark.last_id).filter(IngestWatermark.name == self.name).scalar()
+        except Exception:
+            db.session.rollback()  # Table not created yet
+            return None
+
+    def reset(self):
+        """Start following from the current watermark (call before a full reload)"""
+        last_id = self._read()
+        with self._lock:
+            # No row yet: the first pass will start it at an id we may not have read - re-read from 0
+            self._seen = last_id if last_id is not None else 0
+            self._checked_at = time.monotonic()
+
+    def poll(self):
+        """(low, high] range of ids ingested since the last poll or reset, or None"""
+        if time.monotonic() - self._checked_at < self.interval:
+            return None
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.interval:
+                return None
+            self._checked_at = time.monotonic()
+        last_id = self._read()
+        with self._lock:
+            seen, self._seen = self._seen, last_id if last_id is not None else self._seen
+        if seen is None or last_id is None or last_id <= seen:
+            return None
+        return seen, last_id
+
+
+class IngestRunner:
+    """Runs the registered ingest sources on a timer, on demand and after ORM job inserts"""
+
+    def __init__(self, interval=60, batch_size=500):
+        self.interval = interval
+        self.batch_size = batch_size  # Keeps handler IN lists under SQL Server's 2100 parameters
+        self._sources = {}
+        self._sweeps = {}  # name -> fn() returning rows written
+        self._lock = threading.Lock()
+        self._running = False
+        self._again = False
+        self._timer = None
+        self._app = None
+
+    def register(self, name, column, handler):
+        """Run handler(ids) on every new batch of source name (watermarked on column)"""
+        source = self._sources.get(name)
+        if source is None:
+            source = self._sources[name] = IngestSource(name, column)
+        if handler not in source.handlers:
+            source.handlers.append(handler)
+
+    def register_sweep(self, name, fn):
+        """Run fn() (an only-missing fill for tables without ids) with run(sweeps=True) passes"""
+        self._sweeps[name] = fn
+
+    def init_app(self, app):
+        """Start the timer and (INGEST_ON_INSERT) run a pass after every ORM job insert"""
+        self._app = app
+        self.interval = app.config.get('INGEST_INTERVAL', self.interval)
+        if app.config.get('INGEST_ON_INSERT', True):
+            job_events.subscribe(self.trigger, inserts_only=True)
+        self._schedule()
+
+    def run(self, names=None, start=None, verbose=False, sweeps=False):
+        """Process every source (or the given names) up to date, and the sweeps too when asked; returns {name: rows}"""
+        processed = {}
+        for name, source in list(self._sources.items()):
+            if names is not None and name not in names:
+                continue
+            processed[name] = 0
+            while True:
+                ids = source.claim(self.batch_size, start)
+                if not ids:
+                    break
+                for handler in source.handlers:
+                    try:
+                        handler(ids)
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"Ingest handler {getattr(handler, '__qualname__', handler)} failed "
+                              f"on {name} {ids[0]}-{ids[-1]}: {e}")
+                processed[name] += len(ids)
+                if verbose:
+                    print(f"  ✓ Processed {processed[name]} new {name}")
+        for name, fn in list(self._sweeps.items()) if sweeps else ():
+            if names is not None and name not in names:
+                continue
+            try:
+                processed[name] = fn()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Ingest sweep {name} failed: {e}")
+                continue
+            if verbose:
+                print(f"  ✓ {name}: {processed[name]} rows filled")
+        return processed
+
+    def trigger(self, job_ids=None):
+        """Run a jobs pass in the background; inserts made before the watermark exists still count"""
+        if self._app is None:
+            return
+        start = min(job_ids) - 1 if job_ids else None
+        with self._lock:
+            if self._running:
+                self._again = True  # The running pass picks up anything it has not claimed yet
+                return
+            self._running = True
+        threading.Thread(target=self._run_in_background, args=(['jobs'], start), daemon=True).start()
+
+    def _run_in_background(self, names=None, start=None):
+        while True:
+            with self._app.app_context():
+                try:
+                    self.run(names, start)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Ingest pass failed: {e}")
+                finally:
+                    db.session.remove()
+            with self._lock:
+                if not self._again:
+                    self._running = False
+                    return
+                self._again = False
+
+    def _schedule(self):
+        if not self.interval or self.interval <= 0:
+            return
+        self._timer = threading.Timer(self.interval, self._tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _tick(self):
+        with self._lock:
+            busy = self._running
+            self._running = True
+        if not busy:
+            self._run_in_background()
+        self._schedule()
+
+
+ingest = IngestRunner()
@@ -0,0 +1,72 @@
+"""
+Commit notifications for Job rows
+
+In-process indexes and caches over the jobs table subscribe here to learn
+which jobIds changed. Changes are collected on flush and only delivered once
+the transaction commits; a rollback discards them.
+"""
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.db_models import Job
+
+
+# Markers for deleted / inserted rows - every column counts as changed
+ALL_COLUMNS = None
+INSERTED = 'inserted'
+
+_subscribers = []
+
+
+def subscribe(callback, columns=None, inserts_only=False):
+    """Call callback(job_ids) after commits that touch any of columns (all when None)
+
+    With inserts_only the callback only hears about newly inserted jobs.
+    """
+    subscription = (callback, INSERTED if inserts_only else frozenset(columns) if columns else None)
+    if subscription not in _subscribers:
+        _subscribers.append(subscription)
+
+
+def init_app(app):
+    """Register the session hooks (idempotent across app instances)"""
+    if not event.contains(Session, 'after_flush', _collect_job_changes):
+        event.listen(Session, 'after_flush', _collect_job_changes)
+        event.listen(Session, 'after_commit', _publish_job_changes)
+        event.listen(Session, 'after_rollback', _discard_job_changes)
+
+
+def _collect_job_changes(session, flush_context):
+    pending = session.info.setdefault('job_changes', {})
+    for obj in session.new:
+        if isinstance(obj, Job) and obj.jobId is not None:
+            pending[obj.jobId] = INSERTED
+    for obj in session.deleted:
+        if isinstance(obj, Job) and obj.jobId is not None:
+            pending[obj.jobId] = ALL_COLUMNS
+    for obj in session.dirty:
+        if isinstance(obj, Job) and obj.jobId is not None:
+            changed = {attr.key for attr in inspect(obj).attrs if attr.history.has_changes()}
+            if changed and isinstance(pending.get(obj.jobId, set()), set):
+                pending.setdefault(obj.jobId, set()).update(changed)
+
+
+def _publish_job_changes(session):
+    pending = session.info.pop('job_changes', None)
+    if not pending:
+        return
+    for callback, columns in _subscribers:
+        if columns is INSERTED:
+            job_ids = [job_id for job_id, changed in pending.items() if changed is INSERTED]
+        else:
+            job_ids = [
+                job_id for job_id, changed in pending.items()
+                if columns is None or not isinstance(changed, set) or changed & columns
+            ]
+        if job_ids:
+            callback(job_ids)
+
+
+def _discard_job_changes(session):
+    session.info.pop('job_changes', None)
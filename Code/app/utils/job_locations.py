@@ -0,0 +1,285 @@
+"""
+Canonical location index for jobs
+
+Job.location is free text listing one or more cities ("Bangalore, Hyderabad,
+Pune", "Hybrid - Bengaluru", "Delhi / NCR"). Each job is mapped to canonical
+city ids when it is written; the ids are stored in job_locations (indexed by
+city) and mirrored here as in-memory posting lists, so a location filter is
+an exact key lookup instead of ilike('%location%') over the jobs table.
+
+job_locations rows are written by ORM hooks and, for bulk-loaded jobs, by
+the ingest pass. The postings follow ORM commits and ingest passes in this
+process, id ranges ingested by other processes (ingest watermark), and are
+reloaded in the background every JOB_LOCATIONS_TTL seconds - which also picks
+up index_job_locations.py runs.
+"""
+
+import re
+import threading
+import time
+
+from flask import current_app
+import numpy as np
+from sqlalchemy import delete, event, exists, inspect, insert
+
+from app.database import db
+from app.models.db_models import Job, JobLocation
+from app.utils import job_events
+from app.utils.ingest import WatermarkFollower, ingest
+
+
+# Canonical city id -> alternate spellings / old names
+CITY_ALIASES = {
+    'bengaluru': ['bangalore', 'bengaluru/bangalore', 'bangalore rural', 'bangalore urban'],
+    'mumbai': ['bombay', 'mumbai suburban', 'mumbai city'],
+    'navi mumbai': ['new mumbai'],
+    'delhi': ['new delhi', 'delhi ncr', 'ncr', 'delhi/ncr'],
+    'gurugram': ['gurgaon'],
+    'noida': ['greater noida'],
+    'hyderabad': ['secunderabad', 'hyderabad/secunderabad'],
+    'chennai': ['madras'],
+    'kolkata': ['calcutta'],
+    'pune': ['poona'],
+    'kochi': ['cochin', 'ernakulam'],
+    'thiruvananthapuram': ['trivandrum'],
+    'mysuru': ['mysore'],
+    'mangaluru': ['mangalore'],
+    'vadodara': ['baroda'],
+    'visakhapatnam': ['vizag', 'vishakhapatnam'],
+    'puducherry': ['pondicherry'],
+    'remote': ['work from home', 'wfh', 'anywhere in india', 'remote india'],
+}
+
+_ALIASES = {alias: city for city, aliases in CITY_ALIASES.items() for alias in [city] + aliases}
+
+# Separators between cities in one location string
+SPLIT_RE = re.compile(r'[,;|/]|\band\b')
+# Work-mode prefixes ("Hybrid - Pune") and parenthesised notes ("Pune (On-site)")
+PREFIX_RE = re.compile(r'^(?:hybrid|on-?site|in-?office)\s*[-:]\s*')
+NOTE_RE = re.compile(r'\([^)]*\)')
+
+
+def canonical_city(name):
+    """Canonical city id for one place name ('' when nothing is left)"""
+    name = ' '.join(NOTE_RE.sub(' ', str(name).lower()).split())
+    name = PREFIX_RE.sub('', name).strip(' .-')
+    return _ALIASES.get(name, name)[:100]
+
+
+def normalize_locations(location):
+    """Distinct canonical city ids for a free-text location, in order"""
+    if not location:
+        return []
+    # Aliases that contain a separator ('delhi/ncr') are matched before splitting
+    whole = canonical_city(location)
+    if whole in CITY_ALIASES:
+        return [whole]
+    cities = {}
+    for part in SPLIT_RE.split(NOTE_RE.sub(' ', location.lower())):
+        city = canonical_city(part)
+        if city:
+            cities.setdefault(city, None)
+    return list(cities)
+
+
+class JobLocationIndex:
+    """City id -> jobId posting lists mirrored from job_locations"""
+
+    def __init__(self, ttl=1800):
+        self.ttl = ttl  # seconds before a background reload
+        self._lock = threading.Lock()
+        self._postings = {}  # city -> set of jobIds
+        self._job_cities = {}  # jobId -> tuple of cities (for removal)
+        self._stale_ids = set()
+        self._loaded_at = 0.0
+        self._reloading = False
+        self._follower = WatermarkFollower('jobs')
+        self.ready = False
+
+    def init_app(self, app):
+        """Register the write hooks (idempotent across app instances) and the ingest handler"""
+        for name, hook in (('after_insert', _store_locations_on_insert),
+                           ('after_update', _store_locations_on_update),
+                           ('after_delete', _drop_locations_on_delete)):
+            if not event.contains(Job, name, hook):
+                event.listen(Job, name, hook)
+        self.ttl = app.config.get('JOB_LOCATIONS_TTL', self.ttl)
+        job_events.subscribe(self.mark_stale, ['location'])
+        ingest.register('jobs', Job.jobId, self.store)
+
+    def _set(self, job_id, cities):
+        for city in self._job_cities.pop(job_id, ()):
+            posting = self._postings.get(city)
+            if posting is not None:
+                posting.discard(job_id)
+                if not posting:
+                    del self._postings[city]
+        if cities:
+            self._job_cities[job_id] = tuple(cities)
+            for city in cities:
+                self._postings.setdefault(city, set()).add(job_id)
+
+    def rebuild(self, batch_size=5000):
+        """Load every posting from job_locations
+
+        Falls back to normalizing Job.location directly when the table has not
+        been backfilled yet (see index_job_locations.py).
+        """
+        self._follower.reset()
+        job_cities = {}
+        if db.session.query(JobLocation.jobId).first() is not None:
+            rows = db.session.query(JobLocation.jobId, JobLocation.city).yield_per(batch_size)
+            for job_id, city in rows:
+                job_cities.setdefault(job_id, []).append(city)
+        else:
+            rows = db.session.query(Job.jobId, Job.location).yield_per(batch_size)
+            for job_id, location in rows:
+                job_cities[job_id] = normalize_locations(location)
+
+        with self._lock:
+            self._postings = {}
+            self._job_cities = {}
+            for job_id, cities in job_cities.items():
+                self._set(job_id, cities)
+            self._stale_ids.clear()
+            self._loaded_at = time.monotonic()
+            self.ready = True
+
+    def _reload_in_background(self, app):
+        with app.app_context():
+            try:
+                self.rebuild()
+            except Exception as e:
+                print(f"Job location index reload failed: {e}")
+            finally:
+                self._reloading = False
+
+    def mark_stale(self, job_ids):
+        """Queue jobs whose location changed to be re-read on the next lookup"""
+        with self._lock:
+            self._stale_ids.update(job_ids)
+
+    def store(self, job_ids):
+        """Ingest handler: write job_locations rows for bulk-loaded jobs and queue them for the postings"""
+        rows = db.session.query(Job.jobId, Job.location).filter(Job.jobId.in_(job_ids)).all()
+        db.session.execute(delete(JobLocation).where(JobLocation.jobId.in_(job_ids)))
+        inserts = [row for job_id, location in rows for row in location_rows(job_id, location)]
+        if inserts:
+            db.session.execute(insert(JobLocation), inserts)
+        db.session.commit()
+        self.mark_stale(job_ids)
+
+    def sync(self, chunk_size=500):
+        """Re-read postings for jobs changed since the last lookup"""
+        if not self.ready:
+            self.rebuild()
+            return
+        moved = self._follower.poll()
+        if moved is not None:
+            # Another process ingested jobs - read every id in the new range
+            low, high = moved
+            self.mark_stale([job_id for job_id, in db.session.query(Job.jobId).filter(
+                Job.jobId > low, Job.jobId <= high)])
+        if time.monotonic() - self._loaded_at > self.ttl and not self._reloading:
+            # Serve the current postings meanwhile
+            self._reloading = True
+            app = current_app._get_current_object()
+            threading.Thread(target=self._reload_in_background, args=(app,), daemon=True).start()
+        with self._lock:
+            if not self._stale_ids:
+                return
+            stale = list(self._stale_ids)
+            self._stale_ids.clear()
+
+        # Normalized from Job.location itself - job_locations rows for an id range
+        # another process ingested may not be written yet.
+        # Chunk the IN list - SQL Server caps a statement at 2100 parameters
+        for start in range(0, len(stale), chunk_size):
+            chunk = stale[start:start + chunk_size]
+            job_cities = {job_id: [] for job_id in chunk}
+            rows = db.session.query(Job.jobId, Job.location).filter(Job.jobId.in_(chunk))
+            for job_id, location in rows:
+                job_cities[job_id] = normalize_locations(location)
+            with self._lock:
+                for job_id, cities in job_cities.items():
+                    self._set(job_id, cities)
+
+    def lookup(self, location):
+        """Sorted jobId array for every job in any city named by location"""
+        self.sync()
+        job_ids = set()
+        with self._lock:
+            for city in normalize_locations(location):
+                job_ids.update(self._postings.get(city, ()))
+        return np.array(sorted(job_ids), dtype=np.int64)
+
+    def cities(self, job_id):
+        """Canonical cities for one job"""
+        self.sync()
+        return self._job_cities.get(job_id, ())
+
+
+def location_rows(job_id, location):
+    """job_locations rows for one job"""
+    return [{'jobId': job_id, 'city': city} for city in normalize_locations(location)]
+
+
+def _store_locations(connection, job):
+    connection.execute(delete(JobLocation).where(JobLocation.jobId == job.jobId))
+    rows = location_rows(job.jobId, job.location)
+    if rows:
+        connection.execute(insert(JobLocation), rows)
+
+
+def _store_locations_on_insert(mapper, connection, job):
+    """Write job_locations for a new job in the same transaction"""
+    _store_locations(connection, job)
+
+
+def _store_locations_on_update(mapper, connection, job):
+    """Rewrite job_locations when Job.location changes"""
+    if inspect(job).attrs.location.history.has_changes():
+        _store_locations(connection, job)
+
+
+def _drop_locations_on_delete(mapper, connection, job):
+    """Remove a deleted job's job_locations rows (there is no FK to cascade them)"""
+    connection.execute(delete(JobLocation).where(JobLocation.jobId == job.jobId))
+
+
+def prune_orphans():
+    """Delete job_locations rows whose job no longer exists (jobs removed outside the ORM); returns rows deleted"""
+    result = db.session.execute(
+        delete(JobLocation)
+        .where(~exists().where(Job.jobId == JobLocation.jobId))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return max(result.rowcount, 0)
+
+
+def index_all(batch_size=1000):
+    """Rebuild job_locations from Job.location in keyset batches; returns jobs indexed"""
+    indexed = 0
+    last_id = None
+    while True:
+        query = db.session.query(Job.jobId, Job.location)
+        if last_id is not None:
+            query = query.filter(Job.jobId > last_id)
+        rows = query.order_by(Job.jobId).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        job_ids = [job_id for job_id, _ in rows]
+        db.session.execute(delete(JobLocation).where(JobLocation.jobId.in_(job_ids)))
+        inserts = [row for job_id, location in rows for row in location_rows(job_id, location)]
+        if inserts:
+            db.session.execute(insert(JobLocation), inserts)
+        db.session.commit()
+        indexed += len(rows)
+        print(f"  ✓ Indexed locations for {indexed} jobs")
+    return indexed
+
+
+job_locations = JobLocationIndex()
@@ -0,0 +1,173 @@
+"""
+Salary and experience range index for jobs
+
+minimumSalary/maximumSalary and minimumExperience/maximumExperience are
+unindexed FLOAT columns, so range filters in SQL scan the jobs table. This
+index keeps them as NumPy arrays with one sorted order per bound, and answers
+"salary overlaps X-Y and experience requirement <= N" with searchsorted on
+those orders. The result is a sorted jobId array that can be intersected with
+search results, the feed permutation or the skill matrix.
+
+Commits that change a bound (or insert/delete jobs) mark the index stale
+through job_events; the next query rebuilds it in the background and keeps
+answering from the previous snapshot meanwhile.
+"""
+
+import threading
+import time
+
+import numpy as np
+from flask import current_app
+
+from app.database import db
+from app.models.db_models import Job
+from app.utils import job_events
+
+
+LAKH = 100000
+
+INDEXED_COLUMNS = ('minimumSalary', 'maximumSalary', 'minimumExperience', 'maximumExperience')
+
+
+def fill_bounds(low, high):
+    """Fill a missing end of an interval from the other end (NaN when both are missing)
+
+    Shared with the percolator so saved-search alerts and browse filters agree.
+    """
+    low = np.where(np.isnan(low), high, low)
+    high = np.where(np.isnan(high), low, high)
+    return low, high
+
+
+class RangeColumn:
+    """One float column with its sort order; NaNs sort last and never match"""
+
+    def __init__(self, values):
+        self.order = np.argsort(values, kind='stable')
+        self.sorted = values[self.order]
+        self.finite = int(np.count_nonzero(~np.isnan(values)))
+
+    def at_most(self, value):
+        """Row positions where the column is <= value"""
+        end = np.searchsorted(self.sorted[:self.finite], value, side='right')
+        return self.order[:end]
+
+    def at_least(self, value):
+        """Row positions where the column is >= value"""
+        start = np.searchsorted(self.sorted[:self.finite], value, side='left')
+        return self.order[start:self.finite]
+
+
+class JobRangeIndex:
+    """Sorted salary/experience bounds for every job, refreshed from Job commits"""
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl  # seconds before a full reload even without commits
+        self._lock = threading.Lock()
+        self._snapshot = None  # (job_ids, columns)
+        self._loaded_at = 0.0
+        self._rebuilding = False
+        self._generation = 0  # bumped by every bound change
+        self._built_generation = 0
+
+    def init_app(self, app):
+        job_events.subscribe(self.invalidate, INDEXED_COLUMNS)
+
+    @staticmethod
+    def _load(batch_size=5000):
+        rows = db.session.query(Job.jobId, *[getattr(Job, c) for c in INDEXED_COLUMNS]).order_by(Job.jobId)
+        job_ids = []
+        values = []
+        for job_id, *bounds in rows.yield_per(batch_size):
+            job_ids.append(job_id)
+            values.append(tuple(np.nan if v is None else v for v in bounds))
+        # jobIds stay int64 - a float64 column would round ids above 2**53
+        job_ids = np.array(job_ids, dtype=np.int64)
+        data = np.array(values, dtype=np.float64).reshape(-1, len(INDEXED_COLUMNS))
+
+        min_salary, max_salary = fill_bounds(data[:, 0], data[:, 1])
+        min_exp, max_exp = fill_bounds(data[:, 2], data[:, 3])
+        columns = {
+            'min_salary': RangeColumn(min_salary),
+            'max_salary': RangeColumn(max_salary),
+            'min_exp': RangeColumn(min_exp),
+            'max_exp': RangeColumn(max_exp),
+        }
+        return job_ids, columns
+
+    def invalidate(self, job_ids=None):
+        """Rebuild (in the background) on the next query"""
+        # No lock - the first load holds it, and any bump makes the generations differ
+        self._generation += 1
+
+    def snapshot(self):
+        """(job_ids, columns); a stale snapshot is served while it rebuilds in the background"""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._built_generation = self._generation
+                    self._snapshot = self._load()
+                    self._loaded_at = time.monotonic()
+        elif (self._built_generation != self._generation
+              or time.monotonic() - self._loaded_at > self.ttl) and not self._rebuilding:
+            self._rebuilding = True
+            app = current_app._get_current_object()
+            threading.Thread(target=self._rebuild, args=(app,), daemon=True).start()
+        return self._snapshot
+
+    def _rebuild(self, app):
+        generation = self._generation
+        with app.app_context():
+            try:
+                snapshot = self._load()
+                with self._lock:
+                    self._snapshot = snapshot
+                    self._loaded_at = time.monotonic()
+                    # A change committed while loading leaves the new snapshot stale
+                    self._built_generation = generation
+            except Exception as e:
+                print(f"Job range index rebuild failed: {e}")
+            finally:
+                self._rebuilding = False
+
+    def candidates(self, min_salary=None, max_salary=None, max_exp=None):
+        """Sorted jobId array matching the filters (salary in rupees, experience in years)
+
+        A job matches the salary filter when its [minimumSalary, maximumSalary]
+        interval overlaps [min_salary, max_salary], and the experience filter
+        when its minimumExperience is at most max_exp. Jobs without the data a
+        filter needs are excluded. Returns None when no filter is given.
+        """
+        if min_salary is None and max_salary is None and max_exp is None:
+            return None
+        job_ids, columns = self.snapshot()
+        if job_ids is None or not len(job_ids):
+            return np.empty(0, dtype=np.int64)
+
+        hits = np.zeros(len(job_ids), dtype=np.int8)
+        needed = 0
+        if min_salary is not None:
+            hits[columns['max_salary'].at_least(min_salary)] += 1
+            needed += 1
+        if max_salary is not None:
+            hits[columns['min_salary'].at_most(max_salary)] += 1
+            needed += 1
+        if max_exp is not None:
+            hits[columns['min_exp'].at_most(max_exp)] += 1
+            needed += 1
+        return job_ids[hits == needed]
+
+
+def range_filters(args):
+    """Parse min_salary/max_salary (lakhs) and max_exp (years) from request args"""
+    min_salary = args.get('min_salary', type=float)
+    max_salary = args.get('max_salary', type=float)
+    max_exp = args.get('max_exp', type=float)
+    return {
+        'min_salary': min_salary * LAKH if min_salary is not None else None,
+        'max_salary': max_salary * LAKH if max_salary is not None else None,
+        'max_exp': max_exp,
+    }
+
+
+job_ranges = JobRangeIndex()
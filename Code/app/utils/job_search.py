@@ -0,0 +1,278 @@
+"""
+In-process inverted index for job search (BM25 ranking)
+
+Replaces the leading-wildcard ilike('%term%') scans in jobs.browse. The index
+covers title, tagsAndSkills and the HTML-stripped jobDescription and is built
+in the background at startup (or on the first search); until it is ready,
+searches fall back to the old ilike query. It is kept fresh from:
+
+- ORM commits touching the Job model (job_events)
+- ingest passes - in this process as an ingest handler, in other processes
+  by following the ingest watermark (bulk loads and Core inserts)
+- a full background rebuild every JOB_SEARCH_TTL seconds, which also catches
+  updates and deletes made outside the ORM
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app
+from sqlalchemy import or_
+
+from app import strip_html
+from app.database import db
+from app.models.db_models import Job
+from app.utils import job_events
+from app.utils.ingest import WatermarkFollower, ingest
+from app.utils.skill_taxonomy import RELATED_WEIGHT, TOKEN_RE, get_taxonomy, phrase_tokens
+from app.utils.skills_cache import skills_cache
+
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'our', 'the', 'to', 'we', 'will', 'with', 'you', 'your',
+])
+
+# Per-field weights folded into a single term frequency (BM25F-style)
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'skills': 2.0,
+    'description': 1.0,
+}
+
+# Canonical skills from the taxonomy are indexed as one extra term each, so
+# "ML", "machine-learning" and "Machine Learning" all hit the same posting list.
+# Their parents are indexed at RELATED_WEIGHT, so "sql" also finds MySQL jobs
+# (ranked below exact hits) while "mysql" never finds PostgreSQL ones.
+SKILL_TERM_PREFIX = 'skill:'
+
+# Columns the index needs - never load the whole row
+INDEXED_COLUMNS = ('title', 'tagsAndSkills', 'jobDescription')
+
+# More changed jobs than this are picked up by a background rebuild instead of inline
+REINDEX_INLINE_LIMIT = 5000
+
+
+def tokenize(text):
+    """Split text into lowercase search tokens"""
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class JobSearchIndex:
+    """Tokenized inverted index over the jobs table with BM25 ranking"""
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, ttl=1800):
+        self.ttl = ttl  # seconds before a full background rebuild
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)  # term -> {jobId: weighted tf}
+        self._doc_terms = {}  # jobId -> tuple of distinct terms (for removal)
+        self._doc_lengths = {}  # jobId -> weighted document length
+        self._total_length = 0.0
+        self._stale_ids = set()
+        self._built_at = 0.0
+        self._building = False
+        self._follower = WatermarkFollower('jobs')
+        self.ready = False
+
+    def init_app(self, app):
+        """Register commit and ingest hooks and warm the index in the background"""
+        app.extensions['job_search'] = self
+        self.ttl = app.config.get('JOB_SEARCH_TTL', self.ttl)
+        job_events.subscribe(self.mark_stale, INDEXED_COLUMNS)
+        ingest.register('jobs', Job.jobId, self.mark_stale)
+
+        if app.config.get('JOB_SEARCH_WARMUP', True):
+            self._start_build(app)
+
+    def _start_build(self, app):
+        """Rebuild in a background thread (no-op while one is running)"""
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(target=self._build_in_background, args=(app,), daemon=True).start()
+
+    def _build_in_background(self, app):
+        with app.app_context():
+            try:
+                self.rebuild()
+            except Exception as e:
+                print(f"Job search index build failed: {e}")
+            finally:
+                self._building = False
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def document_terms(title, skills, description):
+        """Return ({term: weighted tf}, weighted length) for one job"""
+        weighted = defaultdict(float)
+        fields = (
+            ('title', title),
+            ('skills', ' '.join(skills)),
+            ('description', strip_html(description)),
+        )
+        length = 0.0
+        for field, text in fields:
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                weighted[token] += weight
+                length += weight
+
+        # Taxonomy expansion happens here, once per job (title and skills only -
+        # free-text descriptions produce too many false alias hits)
+        taxonomy = get_taxonomy()
+        for field, phrases in (('title', [title]), ('skills', skills)):
+            weight = FIELD_WEIGHTS[field]
+            for phrase in phrases:
+                for canonical in taxonomy.find(phrase_tokens(phrase)):
+                    weighted[SKILL_TERM_PREFIX + canonical] += weight
+                    for parent in taxonomy.parents(canonical):
+                        weighted[SKILL_TERM_PREFIX + parent] += weight * RELATED_WEIGHT
+        return weighted, length
+
+    def _add(self, job_id, title, tags_and_skills, description):
+        # Parsing through the shared cache warms it as a side effect of indexing
+        skills = skills_cache.put(job_id, tags_and_skills)
+        terms, length = self.document_terms(title, skills, description)
+        for term, tf in terms.items():
+            self._postings[term][job_id] = tf
+        self._doc_terms[job_id] = tuple(terms)
+        self._doc_lengths[job_id] = length
+        self._total_length += length
+
+    def _remove(self, job_id):
+        for term in self._doc_terms.pop(job_id, ()):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(job_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(job_id, 0.0)
+
+    def rebuild(self, batch_size=2000):
+        """Rebuild the whole index from the jobs table"""
+        with self._lock:
+            covered = set(self._stale_ids)  # Changes committed before the read below
+        self._follower.reset()
+        fresh = JobSearchIndex()
+        rows = db.session.query(
+            Job.jobId, *[getattr(Job, c) for c in INDEXED_COLUMNS]
+        ).yield_per(batch_size)
+        for row in rows:
+            fresh._add(*row)
+
+        with self._lock:
+            self._postings = fresh._postings
+            self._doc_terms = fresh._doc_terms
+            self._doc_lengths = fresh._doc_lengths
+            self._total_length = fresh._total_length
+            self._stale_ids -= covered
+            self._built_at = time.monotonic()
+            self.ready = True
+
+    def mark_stale(self, job_ids):
+        """Queue jobs to be re-read from the database on the next search"""
+        with self._lock:
+            self._stale_ids.update(job_ids)
+
+    def sync(self, chunk_size=500):
+        """Re-index jobs changed since the last search (runs in request session)"""
+        moved = self._follower.poll()
+        if moved is not None:
+            # Another process ingested jobs - index every id in the new range
+            low, high = moved
+            self.mark_stale([job_id for job_id, in db.session.query(Job.jobId).filter(
+                Job.jobId > low, Job.jobId <= high)])
+        with self._lock:
+            rebuild = (time.monotonic() - self._built_at > self.ttl
+                       or len(self._stale_ids) > REINDEX_INLINE_LIMIT)
+        if rebuild:
+            # Serve the current index meanwhile; the rebuild also covers the queued jobs
+            self._start_build(current_app._get_current_object())
+            return
+        with self._lock:
+            if not self._stale_ids:
+                return
+            stale = list(self._stale_ids)
+            self._stale_ids.clear()
+
+        # Chunk the IN list - SQL Server caps a statement at 2100 parameters
+        for start in range(0, len(stale), chunk_size):
+            chunk = stale[start:start + chunk_size]
+            rows = db.session.query(
+                Job.jobId, *[getattr(Job, c) for c in INDEXED_COLUMNS]
+            ).filter(Job.jobId.in_(chunk)).all()
+            with self._lock:
+                for job_id in chunk:
+                    self._remove(job_id)
+                for row in rows:
+                    self._add(*row)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def query_terms(search):
+        """Tokenize a search string plus the canonical skills it mentions"""
+        terms = list(dict.fromkeys(tokenize(search)))
+        for canonical in get_taxonomy().find(phrase_tokens(search)):
+            term = SKILL_TERM_PREFIX + canonical
+            if term not in terms:
+                terms.append(term)
+        return terms
+
+    @staticmethod
+    def search_sql(search):
+        """jobIds whose title or skills contain the search text, newest first (used until the index is ready)"""
+        pattern = f'%{search}%'
+        rows = db.session.query(Job.jobId).filter(
+            or_(Job.title.ilike(pattern), Job.tagsAndSkills.ilike(pattern))
+        ).order_by(Job.jobId.desc())
+        return [job_id for job_id, in rows]
+
+    def search(self, search):
+        """Return jobIds matching the search, best match first"""
+        if not self.ready:
+            # Never build on the request path - start (or keep) building and answer from SQL
+            self._start_build(current_app._get_current_object())
+            return self.search_sql(search)
+        self.sync()
+        terms = self.query_terms(search)
+
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if not n_docs or not terms:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+
+            scores = defaultdict(float)
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                df = len(posting)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for job_id, tf in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[job_id] / avg_length)
+                    scores[job_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        # Ties fall back to the browse default ordering (newest jobId first)
+        return sorted(scores, key=lambda job_id: (-scores[job_id], -job_id))
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+
+job_index = JobSearchIndex()
+
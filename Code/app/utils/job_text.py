@@ -0,0 +1,162 @@
+"""
+Materialized plain-text job descriptions and summary snippets
+
+jobDescription is VARCHAR(MAX) HTML. Stripping it on every feed request (and
+again in the browse template) dominated scroller CPU and payload, so the
+plain text and a bounded snippet are stored next to it:
+
+- ORM writes fill both columns in the same flush (mapper events)
+- bulk-loaded rows are rendered by the ingest pass (utils/ingest.py) as they
+  arrive; rows loaded before the first pass are rendered once by
+  materialize_job_descriptions.py (which can also re-render everything),
+  fanning HTML stripping out to a process pool
+
+List endpoints ship description_snippet. For rows not materialized yet the
+card query also selects a bounded SUBSTRING of the HTML (snippet_fallback),
+so cards never render empty; only jobs.detail reads the full text.
+"""
+
+import html
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import case, event, func, inspect, update
+
+from app import strip_html
+from app.database import db
+from app.models.db_models import Job
+from app.utils.ingest import ingest
+
+
+SNIPPET_LENGTH = 280
+FALLBACK_HTML_CHARS = 2000  # HTML read for a card whose snippet is not materialized yet
+FALLBACK_COLUMN = 'description_html'
+
+
+def html_to_text(markup):
+    """Plain text for an HTML description (tags stripped, entities decoded)"""
+    return html.unescape(strip_html(markup)) if markup else ''
+
+
+def make_snippet(text, max_length=SNIPPET_LENGTH):
+    """Cut text to max_length characters on a word boundary"""
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length - 1]
+    space = cut.rfind(' ')
+    if space > max_length // 2:
+        cut = cut[:space]
+    return cut.rstrip(' ,.;:-') + '…'
+
+
+def render_description(markup):
+    """Return (description_text, description_snippet) for one jobDescription"""
+    text = html_to_text(markup)
+    return text, make_snippet(text)
+
+
+def _render_batch(rows):
+    """Process-pool worker: [(jobId, html)] -> [{jobId, text, snippet}]"""
+    rendered = []
+    for job_id, markup in rows:
+        text, snippet = render_description(markup)
+        rendered.append({'jobId': job_id, 'description_text': text, 'description_snippet': snippet})
+    return rendered
+
+
+def snippet_fallback():
+    """Card expression: leading HTML of jobDescription, only where description_snippet is NULL"""
+    return case(
+        (Job.description_snippet.is_(None), func.substring(Job.jobDescription, 1, FALLBACK_HTML_CHARS)),
+        else_=None,
+    )
+
+
+def job_summary(job):
+    """Snippet for a list card, falling back to stripping HTML for rows not yet materialized"""
+    if job.description_snippet is not None:
+        return job.description_snippet
+    # Card rows carry the bounded fallback HTML; ORM instances load jobDescription
+    markup = getattr(job, FALLBACK_COLUMN, None)
+    if markup is None:
+        markup = getattr(job, 'jobDescription', None)
+    return make_snippet(html_to_text(markup))
+
+
+def job_full_text(job):
+    """Full plain-text description for the detail view"""
+    if job.description_text is not None:
+        return job.description_text
+    return html_to_text(job.jobDescription)
+
+
+def materialize(job_ids):
+    """Render text columns for the given jobs where still missing (ingest handler); returns rows written"""
+    rows = db.session.query(Job.jobId, Job.jobDescription).filter(
+        Job.jobId.in_(job_ids), Job.description_snippet.is_(None)
+    ).all()
+    if not rows:
+        return 0
+    rendered = _render_batch([tuple(row) for row in rows])
+    db.session.execute(update(Job), rendered)
+    db.session.commit()
+    return len(rendered)
+
+
+class _InlinePool:
+    """ProcessPoolExecutor stand-in that renders in the calling thread"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @staticmethod
+    def map(fn, chunks):
+        return map(fn, chunks)
+
+
+def backfill(batch_size=500, workers=None, only_missing=True, verbose=True):
+    """Materialize text columns for the jobs table; returns rows written
+
+    Batches are read with keyset pagination on jobId, stripped in a process
+    pool (workers=0 renders inline, e.g. in a web worker's background thread)
+    and written back with ORM bulk UPDATEs by primary key.
+    """
+    written = 0
+    last_id = None
+    with (_InlinePool() if workers == 0 else ProcessPoolExecutor(max_workers=workers)) as pool:
+        while True:
+            query = db.session.query(Job.jobId, Job.jobDescription)
+            if only_missing:
+                query = query.filter(Job.description_snippet.is_(None))
+            if last_id is not None:
+                query = query.filter(Job.jobId > last_id)
+            rows = query.order_by(Job.jobId).limit(batch_size * 8).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            chunks = [[tuple(r) for r in rows[i:i + batch_size]] for i in range(0, len(rows), batch_size)]
+            for rendered in pool.map(_render_batch, chunks):
+                db.session.execute(update(Job), rendered)
+                written += len(rendered)
+            db.session.commit()
+            if verbose:
+                print(f"  ✓ Materialized {written} job descriptions")
+    return written
+
+
+def _materialize_on_write(mapper, connection, job):
+    """Keep the text columns in step with jobDescription on ORM inserts/updates"""
+    history = inspect(job).attrs.jobDescription.history
+    if job.description_snippet is None or history.has_changes():
+        job.description_text, job.description_snippet = render_description(job.jobDescription)
+
+
+def init_app(app):
+    """Register the mapper hooks (idempotent across app instances) and the ingest handler"""
+    for name in ('before_insert', 'before_update'):
+        if not event.contains(Job, name, _materialize_on_write):
+            event.listen(Job, name, _materialize_on_write)
+    ingest.register('jobs', Job.jobId, materialize)
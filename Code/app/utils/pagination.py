@@ -0,0 +1,96 @@
+"""
+Keyset (cursor) pagination
+
+Flask-SQLAlchemy's .paginate() issues OFFSET/FETCH plus a COUNT(*) over the
+filtered set on every page, so deep pages get linearly slower. Keyset
+pagination seeks past the last row seen using the ordering key instead, and
+an opaque after= token carries that key between requests.
+
+NULL handling follows SQL Server / SQLite: NULLs sort first ascending and
+last descending.
+"""
+
+import base64
+import json
+
+from sqlalchemy import and_, false, or_
+
+
+def encode_cursor(values):
+    """Encode ordering key values as an opaque URL-safe token"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode an after= token; returns None for missing or malformed tokens"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class KeysetPage:
+    """One page of keyset-paginated results"""
+
+    def __init__(self, items, next_cursor, has_more):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.has_more = has_more
+
+
+def _comes_after(column, value, descending):
+    """Rows strictly after value in the column's sort order"""
+    if descending:
+        if value is None:
+            return false()
+        return or_(column < value, column.is_(None))
+    if value is None:
+        return column.isnot(None)
+    return column > value
+
+
+def _equals(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _seek_filter(keys, values):
+    """Build (k1, k2, ...) > (v1, v2, ...) as nested OR/AND (no row-value syntax on SQL Server)"""
+    (column, descending), value = keys[0], values[0]
+    condition = _comes_after(column, value, descending)
+    if len(keys) == 1:
+        return condition
+    return or_(condition, and_(_equals(column, value), _seek_filter(keys[1:], values[1:])))
+
+
+def keyset_paginate(query, keys, after=None, per_page=20, probe=True):
+    """Paginate query by seeking past the after= cursor
+
+    keys is a list of (column, descending) pairs that together form a unique
+    ordering. With probe=True one extra row is fetched so has_more is exact;
+    without it has_more just reports whether the page came back full.
+    """
+    values = decode_cursor(after)
+    if values is not None and len(values) == len(keys):
+        query = query.filter(_seek_filter(keys, values))
+
+    query = query.order_by(*[column.desc() if descending else column.asc()
+                             for column, descending in keys])
+    rows = query.limit(per_page + 1 if probe else per_page).all()
+
+    if probe:
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+    else:
+        has_more = len(rows) == per_page
+
+    next_cursor = None
+    if rows and has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, column.key) for column, _ in keys)
+
+    return KeysetPage(rows, next_cursor, has_more)
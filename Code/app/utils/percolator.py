@@ -0,0 +1,219 @@
+"""
+Saved-search percolator
+
+Users save a jobs.browse query (search, location, salary/experience range).
+Instead of every client re-polling the feed, each new job is run once
+against an inverted index over the saved queries: query terms and canonical
+cities map to the queries that use them, so the job's own terms pick out
+every candidate subscription in one pass. Candidates are then checked against
+their location and range filters, and matches are pushed to the user's
+Socket.IO room.
+
+New jobs arrive through the ingest pass (utils/ingest.py), which covers bulk
+loads as well as ORM inserts and may run in any worker or in a loader script;
+with SOCKETIO_MESSAGE_QUEUE set the alert reaches the user's room whichever
+process emits it. The saved-search index is re-read when older than
+REFRESH_AFTER seconds, so searches saved through another worker match too.
+
+A search whose text yields no query terms (only stop words) is never indexed -
+it would otherwise fall into the match-all set; jobs.save_search refuses
+them. Missing salary/experience bounds are filled exactly as job_ranges does.
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from app import socketio
+from app.database import db
+from app.models.db_models import Job, SavedSearch
+from app.utils.ingest import ingest
+from app.utils.job_locations import normalize_locations
+from app.utils.job_ranges import fill_bounds
+from app.utils.job_search import JobSearchIndex
+from app.utils.skills_cache import intern_skills
+
+
+def user_room(user_id):
+    """Socket.IO room a user's sessions join on connect"""
+    return f'user_{user_id}'
+
+
+class CompiledSearch:
+    """Saved search reduced to the keys and bounds the percolator checks"""
+
+    __slots__ = ('id', 'user_id', 'search', 'terms', 'cities', 'min_salary', 'max_salary', 'max_exp')
+
+    def __init__(self, saved_search):
+        self.id = saved_search.id
+        self.user_id = saved_search.user_id
+        self.search = saved_search.search or ''
+        self.terms = frozenset(JobSearchIndex.query_terms(self.search)) if self.search else frozenset()
+        self.cities = frozenset(normalize_locations(saved_search.location))
+        self.min_salary = saved_search.min_salary
+        self.max_salary = saved_search.max_salary
+        self.max_exp = saved_search.max_exp
+
+    @property
+    def matchable(self):
+        """False when the search has text but none of it is a query term (e.g. only stop words)"""
+        return bool(self.terms) or not self.search.strip()
+
+    def accepts(self, cities, salary, min_exp):
+        """Check the non-text filters (same semantics as browse)"""
+        if self.cities and not self.cities & cities:
+            return False
+        low, high = salary
+        if self.min_salary is not None and (high is None or high < self.min_salary):
+            return False
+        if self.max_salary is not None and (low is None or low > self.max_salary):
+            return False
+        if self.max_exp is not None and (min_exp is None or min_exp > self.max_exp):
+            return False
+        return True
+
+
+class SearchPercolator:
+    """Inverted index over saved searches, matched against new jobs"""
+
+    CITY_PREFIX = 'city:'
+    REFRESH_AFTER = 30  # seconds
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._searches = {}  # saved search id -> CompiledSearch
+        self._by_key = defaultdict(set)  # term or 'city:<id>' -> saved search ids
+        self._match_all = set()  # searches with only range filters
+        self._loaded_at = 0.0
+        self.ready = False
+
+    def init_app(self, app):
+        ingest.register('jobs', Job.jobId, self.percolate)
+
+    # ------------------------------------------------------------------
+    # Saved search index
+    # ------------------------------------------------------------------
+
+    def _keys(self, compiled):
+        # Text searches are keyed by their terms (browse ORs them); searches
+        # without text fall back to their cities, then to the match-all set
+        if compiled.terms:
+            return compiled.terms
+        return frozenset(self.CITY_PREFIX + city for city in compiled.cities)
+
+    def add(self, saved_search):
+        """Index (or re-index) one saved search"""
+        compiled = CompiledSearch(saved_search)
+        with self._lock:
+            self._remove(compiled.id)
+            if not compiled.matchable:
+                return  # Would match every job
+            self._searches[compiled.id] = compiled
+            keys = self._keys(compiled)
+            if keys:
+                for key in keys:
+                    self._by_key[key].add(compiled.id)
+            else:
+                self._match_all.add(compiled.id)
+
+    def remove(self, search_id):
+        with self._lock:
+            self._remove(search_id)
+
+    def _remove(self, search_id):
+        compiled = self._searches.pop(search_id, None)
+        if compiled is None:
+            return
+        for key in self._keys(compiled):
+            ids = self._by_key.get(key)
+            if ids is not None:
+                ids.discard(search_id)
+                if not ids:
+                    del self._by_key[key]
+        self._match_all.discard(search_id)
+
+    def rebuild(self):
+        """Load every saved search from the database"""
+        searches = SavedSearch.query.all()
+        with self._lock:
+            self._searches = {}
+            self._by_key = defaultdict(set)
+            self._match_all = set()
+        for saved_search in searches:
+            self.add(saved_search)
+        self._loaded_at = time.monotonic()
+        self.ready = True
+
+    def __len__(self):
+        return len(self._searches)
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def match(self, title, skills, description, location, salary=(None, None), min_exp=None):
+        """Saved searches matching one job, as CompiledSearch objects"""
+        terms, _ = JobSearchIndex.document_terms(title, skills, description)
+        cities = frozenset(normalize_locations(location))
+        keys = set(terms) | {self.CITY_PREFIX + city for city in cities}
+
+        with self._lock:
+            candidate_ids = set(self._match_all)
+            for key in keys:
+                candidate_ids.update(self._by_key.get(key, ()))
+            candidates = [self._searches[search_id] for search_id in candidate_ids]
+        return [compiled for compiled in candidates if compiled.accepts(cities, salary, min_exp)]
+
+    def percolate(self, job_ids, chunk_size=500):
+        """Match new jobs against saved searches and push alerts (ingest handler); returns alerts sent"""
+        if not self.ready or time.monotonic() - self._loaded_at > self.REFRESH_AFTER:
+            self.rebuild()
+        if not self._searches:
+            return 0
+
+        sent = 0
+        # Chunk the IN list - SQL Server caps a statement at 2100 parameters
+        for start in range(0, len(job_ids), chunk_size):
+            rows = db.session.query(
+                Job.jobId, Job.title, Job.companyName, Job.tagsAndSkills, Job.jobDescription, Job.location,
+                Job.minimumSalary, Job.maximumSalary, Job.minimumExperience, Job.maximumExperience,
+            ).filter(Job.jobId.in_(job_ids[start:start + chunk_size])).all()
+            if not rows:
+                continue
+
+            data = np.array([(row.minimumSalary, row.maximumSalary, row.minimumExperience, row.maximumExperience)
+                             for row in rows], dtype=np.float64)
+            min_salary, max_salary = fill_bounds(data[:, 0], data[:, 1])
+            min_exp, _ = fill_bounds(data[:, 2], data[:, 3])
+
+            for i, row in enumerate(rows):
+                salary = (_value(min_salary[i]), _value(max_salary[i]))
+                matches = self.match(row.title, intern_skills(row.tagsAndSkills), row.jobDescription,
+                                     row.location, salary, _value(min_exp[i]))
+                # One alert per user per job, even if several of their searches match
+                notified = set()
+                for compiled in matches:
+                    if compiled.user_id in notified:
+                        continue
+                    notified.add(compiled.user_id)
+                    socketio.emit('job_match', {
+                        'search_id': compiled.id,
+                        'search': compiled.search,
+                        'jobId': row.jobId,
+                        'title': row.title,
+                        'company': row.companyName,
+                        'location': row.location,
+                        'url': f'/jobs/{row.jobId}',
+                    }, to=user_room(compiled.user_id))
+                    sent += 1
+        return sent
+
+
+def _value(bound):
+    """float, or None for a missing (NaN) bound"""
+    return None if np.isnan(bound) else float(bound)
+
+
+percolator = SearchPercolator()
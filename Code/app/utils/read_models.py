@@ -0,0 +1,111 @@
+"""
+Read-only card queries that bypass the ORM
+
+List pages only render a handful of columns per row, but Model.query builds a
+full mapped instance for each one: identity-map registration, instrumented
+attributes and change-tracking state. CardQuery runs a Core select() of just
+the card columns and wraps each row in a namedtuple (slots-only, immutable),
+so templates and serializers read `card.title` as before with none of that
+bookkeeping.
+
+CardQuery mirrors the part of the Query API the list routes use (filter,
+filter_by, order_by, limit, all, paginate, yield_per), so keyset_paginate and
+the existing filter builders work on it unchanged. A column can be swapped
+for a SQL expression (e.g. a SUBSTRING of a VARCHAR(MAX) body) so the card
+reads a bounded value under the same name.
+"""
+
+import math
+from collections import namedtuple
+
+from sqlalchemy import func, select
+
+from app.database import db
+
+
+_card_types = {}
+
+
+def card_type(model, columns, name=None):
+    """Namedtuple type for a model's card columns (cached per column list)"""
+    columns = tuple(columns)
+    key = (model, columns)
+    if key not in _card_types:
+        _card_types[key] = namedtuple(name or f'{model.__name__}Card', columns, rename=True)
+    return _card_types[key]
+
+
+class CardPage:
+    """Minimal stand-in for a Flask-SQLAlchemy Pagination"""
+
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = math.ceil(total / per_page) if per_page else 0
+        self.has_next = page < self.pages
+        self.has_prev = page > 1
+
+
+class CardQuery:
+    """Core select over card columns returning namedtuple rows"""
+
+    def __init__(self, model, columns, name=None, stmt=None, expressions=None):
+        self.model = model
+        self.columns = tuple(dict.fromkeys(columns))
+        self.row_type = card_type(model, self.columns, name)
+        if stmt is None:
+            expressions = expressions or {}
+            stmt = select(*[
+                expressions[c].label(c) if c in expressions else getattr(model, c)
+                for c in self.columns
+            ])
+        self.stmt = stmt
+
+    def _with(self, stmt):
+        query = CardQuery.__new__(CardQuery)
+        query.model, query.columns, query.row_type, query.stmt = self.model, self.columns, self.row_type, stmt
+        return query
+
+    # Query-compatible builders
+    def filter(self, *criteria):
+        return self._with(self.stmt.where(*criteria))
+
+    def filter_by(self, **kwargs):
+        return self._with(self.stmt.where(*[getattr(self.model, k) == v for k, v in kwargs.items()]))
+
+    def order_by(self, *clauses):
+        return self._with(self.stmt.order_by(*clauses))
+
+    def limit(self, limit):
+        return self._with(self.stmt.limit(limit))
+
+    def offset(self, offset):
+        return self._with(self.stmt.offset(offset))
+
+    # Execution
+    def all(self):
+        make = self.row_type._make
+        return [make(row) for row in db.session.execute(self.stmt)]
+
+    def first(self):
+        rows = self.limit(1).all()
+        return rows[0] if rows else None
+
+    def count(self):
+        counted = select(func.count()).select_from(self.stmt.order_by(None).subquery())
+        return db.session.execute(counted).scalar()
+
+    def yield_per(self, batch_size):
+        """Stream rows off a server-side cursor in batches"""
+        make = self.row_type._make
+        result = db.session.execute(self.stmt.execution_options(yield_per=batch_size))
+        for row in result:
+            yield make(row)
+
+    def paginate(self, page=1, per_page=20, error_out=False):
+        page = max(page or 1, 1)
+        total = self.count()
+        items = self.offset((page - 1) * per_page).limit(per_page).all()
+        return CardPage(items, page, per_page, total)
@@ -0,0 +1,212 @@
+"""
+Saved jobs store
+
+Each user's saved jobIds are loaded from saved_jobs once and kept in memory,
+so feed and browse can mark saved cards with a set lookup. Toggles update the
+in-memory set immediately and queue the write; queued writes are flushed in
+one batch after a short delay, and a save followed by an unsave before the
+flush cancels out without touching the database.
+
+Cached sets expire after SAVED_JOBS_TTL seconds, so saves made through
+another worker show up without a restart. Flushes run one at a time; a
+flush that fails rolls back and puts its writes back on the queue.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.models.db_models import SavedJob
+
+
+class SavedJobsStore:
+    """Per-user saved-set cache with batched, coalesced writes"""
+
+    def __init__(self, flush_delay=0.5, max_users=10000, ttl=30):
+        self.flush_delay = flush_delay
+        self.max_users = max_users
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._saved = OrderedDict()  # user_id -> {jobId: saved_at}, oldest save first
+        self._loaded_at = {}  # user_id -> monotonic time the saved set was read
+        self._pending = {}  # (user_id, jobId) -> saved_at (save) or None (unsave)
+        self._flushing = {}  # Writes taken by the flush in progress, not yet committed
+        self._timer = None
+        self._app = None
+
+    def init_app(self, app):
+        self._app = app
+        self.flush_delay = app.config.get('SAVED_JOBS_FLUSH_DELAY', self.flush_delay)
+        self.ttl = app.config.get('SAVED_JOBS_TTL', self.ttl)
+
+    def _user_saves(self, user_id):
+        """Saved {jobId: saved_at} for a user, (re)loaded from the database when missing or expired"""
+        with self._lock:
+            saves = self._saved.get(user_id)
+            if saves is not None and time.monotonic() - self._loaded_at.get(user_id, 0) < self.ttl:
+                self._saved.move_to_end(user_id)
+                return saves
+
+        rows = db.session.query(SavedJob.jobId, SavedJob.saved_at).filter(
+            SavedJob.user_id == user_id
+        ).order_by(SavedJob.saved_at, SavedJob.id).all()
+
+        with self._lock:
+            saves = {job_id: saved_at for job_id, saved_at in rows}
+            # Writes queued or mid-flush when this was read are newer than the database
+            for writes in (self._flushing, self._pending):
+                for (pending_user, job_id), saved_at in writes.items():
+                    if pending_user != user_id:
+                        continue
+                    if saved_at is None:
+                        saves.pop(job_id, None)
+                    else:
+                        saves[job_id] = saved_at
+            self._saved[user_id] = saves
+            self._saved.move_to_end(user_id)
+            self._loaded_at[user_id] = time.monotonic()
+            while len(self._saved) > self.max_users:
+                stale_user, _ = self._saved.popitem(last=False)
+                self._loaded_at.pop(stale_user, None)
+            return saves
+
+    def saved_ids(self, user_id):
+        """Set of jobIds the user has saved"""
+        saves = self._user_saves(user_id)
+        with self._lock:
+            return set(saves)
+
+    def recent(self, user_id):
+        """Saved jobIds, most recently saved first"""
+        saves = self._user_saves(user_id)
+        with self._lock:
+            return list(reversed(saves))
+
+    def is_saved(self, user_id, job_id):
+        return job_id in self._user_saves(user_id)
+
+    def toggle(self, user_id, job_id):
+        """Flip the saved state of a job; returns True when it is now saved"""
+        self._user_saves(user_id)
+        key = (user_id, job_id)
+        with self._lock:
+            saves = self._saved.get(user_id)
+            if saves is None:  # Evicted since the load above
+                saves = self._saved[user_id] = {}
+                self._loaded_at[user_id] = 0
+            if job_id in saves:
+                del saves[job_id]
+                now_saved = False
+            else:
+                saves[job_id] = datetime.utcnow()
+                now_saved = True
+
+            if key in self._pending:
+                # Reverts the queued write - the database already has this state
+                del self._pending[key]
+            else:
+                self._pending[key] = saves[job_id] if now_saved else None
+        self._schedule_flush()
+        return now_saved
+
+    def _schedule_flush(self):
+        with self._lock:
+            if not self._pending or self._timer is not None:
+                return
+            if self._app is not None and self.flush_delay > 0:
+                self._timer = threading.Timer(self.flush_delay, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def _flush_in_background(self):
+        with self._app.app_context():
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Saved jobs flush failed, will retry: {e}")
+            finally:
+                db.session.remove()
+
+    def flush(self):
+        """Write all queued saves/unsaves in one transaction; returns rows written"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._flushing = pending
+                self._timer = None
+            if not pending:
+                return 0
+
+            try:
+                return self._write(pending)
+            except Exception:
+                db.session.rollback()
+                with self._lock:
+                    # Toggles queued during the failed flush are newer - keep them
+                    for key, saved_at in pending.items():
+                        self._pending.setdefault(key, saved_at)
+                    if self._app is not None and self.flush_delay > 0 and self._timer is None:
+                        self._timer = threading.Timer(self.flush_delay, self._flush_in_background)
+                        self._timer.daemon = True
+                        self._timer.start()
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+    @staticmethod
+    def _write(pending):
+        """Apply one batch of (user_id, jobId) -> saved_at/None writes and commit"""
+        saves = [
+            {'user_id': user_id, 'jobId': job_id, 'saved_at': saved_at}
+            for (user_id, job_id), saved_at in pending.items() if saved_at is not None
+        ]
+        unsaves = {}
+        for (user_id, job_id), saved_at in pending.items():
+            if saved_at is None:
+                unsaves.setdefault(user_id, []).append(job_id)
+
+        try:
+            for user_id, job_ids in unsaves.items():
+                db.session.execute(delete(SavedJob).where(
+                    SavedJob.user_id == user_id, SavedJob.jobId.in_(job_ids)
+                ))
+            if saves:
+                db.session.execute(insert(SavedJob), saves)
+            db.session.commit()
+        except IntegrityError:
+            # Another worker saved some of these already - insert the rest one by one
+            db.session.rollback()
+            for user_id, job_ids in unsaves.items():
+                db.session.execute(delete(SavedJob).where(
+                    SavedJob.user_id == user_id, SavedJob.jobId.in_(job_ids)
+                ))
+            db.session.commit()
+            for row in saves:
+                try:
+                    db.session.execute(insert(SavedJob), [row])
+                    db.session.commit()
+                except IntegrityError:
+                    db.session.rollback()
+        return len(saves) + sum(len(job_ids) for job_ids in unsaves.values())
+
+    def invalidate(self, user_id=None):
+        """Drop cached saved sets (all users when user_id is None)"""
+        with self._lock:
+            if user_id is None:
+                self._saved.clear()
+                self._loaded_at.clear()
+            else:
+                self._saved.pop(user_id, None)
+                self._loaded_at.pop(user_id, None)
+
+
+saved_jobs = SavedJobsStore()
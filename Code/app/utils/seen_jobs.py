@@ -0,0 +1,267 @@
+"""
+Per-user Bloom filter of jobs seen in the scroller
+
+The scroller reports the cards a user swiped past; they are added to a Bloom
+filter per user (a fixed 4 KB bit array) that the feed uses to skip seen jobs
+with one vectorized membership test over the permutation - no NOT IN list.
+When a filter reaches its capacity it becomes the "previous" generation and a
+fresh one starts, so a user's state never exceeds two filters (8 KB) and very
+old swipes eventually age out. Filters are cached in memory and written back
+to seen_job_filters in batches.
+
+Bloom filters merge with a bitwise OR, so workers never overwrite each
+other's swipes: a flush ORs the stored row into the cached filter before
+writing it, and cached filters re-merge the stored row every SEEN_JOBS_TTL
+seconds. A flush that fails rolls back and keeps its users queued.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from app.database import db
+from app.models.db_models import SeenJobFilter
+
+
+FILTER_BYTES = 4096  # 32768 bits per generation
+HASH_COUNT = 5
+CAPACITY = 3000  # items per generation - about 0.7% false positives when full
+
+
+def _mix64(values):
+    """splitmix64 finalizer over a uint64 array"""
+    z = values.astype(np.uint64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over integer ids (double hashing)"""
+
+    def __init__(self, bits=None, count=0, size=FILTER_BYTES, hashes=HASH_COUNT):
+        self.bits = np.zeros(size, dtype=np.uint8) if bits is None else np.frombuffer(bits, dtype=np.uint8).copy()
+        self.hashes = hashes
+        self.count = count
+
+    @property
+    def nbits(self):
+        return self.bits.size * 8
+
+    def _positions(self, ids):
+        """(len(ids), hashes) array of bit positions"""
+        ids = np.asarray(ids, dtype=np.int64).astype(np.uint64)
+        h1 = _mix64(ids)
+        h2 = _mix64(ids ^ np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.nbits)
+
+    def add_many(self, ids):
+        if not len(ids):
+            return
+        pos = self._positions(ids).ravel()
+        np.bitwise_or.at(self.bits, (pos >> np.uint64(3)).astype(np.intp),
+                         (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)))
+        self.count += len(ids)
+
+    def contains_many(self, ids):
+        """Boolean array - True where the id is (probably) in the filter"""
+        if not len(ids):
+            return np.zeros(0, dtype=bool)
+        pos = self._positions(ids)
+        hit = (self.bits[(pos >> np.uint64(3)).astype(np.intp)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return hit.all(axis=1)
+
+    def to_bytes(self):
+        return self.bits.tobytes()
+
+
+class SeenJobs:
+    """Two-generation Bloom filter for one user"""
+
+    def __init__(self, current=None, previous=None):
+        self.current = current or BloomFilter()
+        self.previous = previous
+
+    def add_many(self, job_ids):
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        # Dedupe against the current generation only - the previous one is dropped on rotation
+        job_ids = job_ids[~self.current.contains_many(job_ids)]
+        if not len(job_ids):
+            return False
+        self.current.add_many(job_ids)
+        if self.current.count >= CAPACITY:
+            self.previous, self.current = self.current, BloomFilter()
+        return True
+
+    def merge(self, other):
+        """OR another copy of this user's filter in (same id -> same bits, so nothing is lost)
+
+        Counts are not additive across copies; the larger one is kept as an
+        estimate and drives rotation as usual.
+        """
+        self.current.bits |= other.current.bits
+        self.current.count = max(self.current.count, other.current.count)
+        if other.previous is not None:
+            if self.previous is None:
+                self.previous = BloomFilter(other.previous.to_bytes())
+            else:
+                self.previous.bits |= other.previous.bits
+        if self.current.count >= CAPACITY:
+            self.previous, self.current = self.current, BloomFilter()
+
+    def contains_many(self, job_ids):
+        seen = self.current.contains_many(job_ids)
+        if self.previous is not None:
+            seen |= self.previous.contains_many(job_ids)
+        return seen
+
+
+class SeenJobsStore:
+    """Per-user seen filters, cached in memory and written back in batches"""
+
+    def __init__(self, flush_delay=5.0, max_users=10000, ttl=60):
+        self.flush_delay = flush_delay
+        self.max_users = max_users
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._filters = OrderedDict()  # user_id -> SeenJobs
+        self._loaded_at = {}  # user_id -> monotonic time the stored filter was last merged in
+        self._dirty = set()
+        self._timer = None
+        self._app = None
+
+    def init_app(self, app):
+        self._app = app
+        self.flush_delay = app.config.get('SEEN_JOBS_FLUSH_DELAY', self.flush_delay)
+        self.ttl = app.config.get('SEEN_JOBS_TTL', self.ttl)
+
+    def get(self, user_id):
+        """SeenJobs for a user, loaded from the database on first use and re-merged when expired"""
+        with self._lock:
+            seen = self._filters.get(user_id)
+            if seen is not None and time.monotonic() - self._loaded_at.get(user_id, 0) < self.ttl:
+                self._filters.move_to_end(user_id)
+                return seen
+
+        stored = _from_row(db.session.get(SeenJobFilter, user_id))
+
+        with self._lock:
+            seen = self._filters.get(user_id)
+            if seen is None:
+                seen = self._filters[user_id] = stored
+            else:
+                # Keep swipes not written yet, add the ones other workers wrote
+                seen.merge(stored)
+                self._filters.move_to_end(user_id)
+            self._loaded_at[user_id] = time.monotonic()
+            self._evict()
+            return seen
+
+    def _evict(self):
+        while len(self._filters) > self.max_users:
+            user_id, _ = next(iter(self._filters.items()))
+            if user_id in self._dirty:
+                break  # Unflushed - keep until written
+            self._filters.popitem(last=False)
+            self._loaded_at.pop(user_id, None)
+
+    def mark_seen(self, user_id, job_ids):
+        """Add jobIds to the user's filter and schedule a write-back"""
+        seen = self.get(user_id)
+        with self._lock:
+            if not seen.add_many(job_ids):
+                return
+            self._dirty.add(user_id)
+        self._schedule_flush()
+
+    def exclude(self, user_id):
+        """Callable(job_ids array) -> bool mask of jobs the user has seen"""
+        return self.get(user_id).contains_many
+
+    def _schedule_flush(self):
+        with self._lock:
+            if not self._dirty or self._timer is not None:
+                return
+            if self._app is not None and self.flush_delay > 0:
+                self._timer = threading.Timer(self.flush_delay, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def _flush_in_background(self):
+        with self._app.app_context():
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Seen jobs flush failed, will retry: {e}")
+            finally:
+                db.session.remove()
+
+    def flush(self):
+        """Merge every changed filter into its stored row and write it back; returns users written"""
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                self._timer = None
+            if not dirty:
+                return 0
+
+            try:
+                return self._write(dirty)
+            except Exception:
+                db.session.rollback()
+                with self._lock:
+                    self._dirty |= dirty
+                    if self._app is not None and self.flush_delay > 0 and self._timer is None:
+                        self._timer = threading.Timer(self.flush_delay, self._flush_in_background)
+                        self._timer.daemon = True
+                        self._timer.start()
+                raise
+
+    def _write(self, dirty):
+        """Write one batch of users' filters, OR-ed with what other workers stored, and commit"""
+        # Row locks hold other workers' flushes for these users until the commit
+        existing = {
+            row.user_id: row for row in
+            SeenJobFilter.query.filter(SeenJobFilter.user_id.in_(list(dirty))).with_for_update().all()
+        }
+        written = 0
+        for user_id in dirty:
+            row = existing.get(user_id)
+            with self._lock:
+                seen = self._filters.get(user_id)
+                if seen is None:
+                    continue
+                if row is not None:
+                    seen.merge(_from_row(row))
+                current_bits, current_count = seen.current.to_bytes(), seen.current.count
+                previous_bits = seen.previous.to_bytes() if seen.previous is not None else None
+            if row is None:
+                row = SeenJobFilter(user_id=user_id)
+                db.session.add(row)
+            row.current_bits = current_bits
+            row.current_count = current_count
+            row.previous_bits = previous_bits
+            row.updated_at = datetime.utcnow()
+            written += 1
+        db.session.commit()
+        return written
+
+
+def _from_row(row):
+    """SeenJobs for a seen_job_filters row (empty when there is none)"""
+    if row is None:
+        return SeenJobs()
+    return SeenJobs(
+        BloomFilter(row.current_bits, row.current_count),
+        BloomFilter(row.previous_bits) if row.previous_bits else None,
+    )
+
+
+seen_jobs = SeenJobsStore()
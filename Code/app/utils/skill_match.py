@@ -0,0 +1,210 @@
+"""
+Vectorized skill-match scoring for the job scroller
+
+Builds a skill vocabulary and a sparse job x skill matrix from
+Job.tagsAndSkills. The matrix is stored skill-major (CSC layout: one sorted
+array of job rows per skill), so scoring one user against every job is a
+single np.bincount over the postings of that user's skills.
+
+Skills on both sides (Job.tagsAndSkills, Profile.skills) are mapped through
+the skill taxonomy, so aliases and case differences still match.
+match_score keeps the feed's definition: share of the job's (canonical)
+skills the user has, as an integer percentage. A job skill the user only has
+a related skill for (taxonomy parent / child / sibling - PostgreSQL for a
+MySQL job) counts RELATED_WEIGHT instead of a full match.
+
+Commits that change Job.tagsAndSkills (or insert/delete jobs) mark the matrix
+stale through job_events; the next request rebuilds it in the background and
+keeps serving the previous snapshot meanwhile.
+"""
+
+import threading
+import time
+
+import numpy as np
+from flask import current_app
+
+from app.database import db
+from app.models.db_models import Job
+from app.utils import job_events
+from app.utils.skill_taxonomy import RELATED_WEIGHT, canonicalize, related_skills
+from app.utils.skills_cache import skills_cache
+
+
+class SkillMatrix:
+    """Immutable job x skill matrix snapshot"""
+
+    def __init__(self, job_ids, job_skills):
+        # Rows sorted by jobId so page lookups can use searchsorted
+        order = np.argsort(job_ids, kind='stable')
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)[order]
+
+        self.vocabulary = {}
+        postings = []
+        counts = np.zeros(len(self.job_ids), dtype=np.int32)
+        for row, original in enumerate(order):
+            skills = {canonicalize(s) for s in job_skills[original] if s}
+            skills.discard('')
+            counts[row] = len(skills)
+            for skill in skills:
+                skill_id = self.vocabulary.setdefault(skill, len(self.vocabulary))
+                if skill_id == len(postings):
+                    postings.append([])
+                postings[skill_id].append(row)
+
+        self.skill_counts = counts
+        lengths = np.fromiter((len(p) for p in postings), dtype=np.int64, count=len(postings))
+        self.indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.fromiter(
+            (row for posting in postings for row in posting),
+            dtype=np.int32, count=int(self.indptr[-1])
+        )
+
+    def skill_ids(self, skills):
+        """Vocabulary ids for the given skills (unknown skills are dropped)"""
+        ids = {self.vocabulary.get(canonicalize(s)) for s in skills if s}
+        ids.discard(None)
+        return sorted(ids)
+
+    def related_ids(self, skills, exact_ids):
+        """Vocabulary ids of skills related to the given ones, excluding exact matches"""
+        related = set()
+        for skill in skills:
+            if skill:
+                related.update(related_skills(canonicalize(skill)))
+        ids = {self.vocabulary.get(skill) for skill in related}
+        ids.discard(None)
+        return sorted(ids - set(exact_ids))
+
+    def _hits(self, ids):
+        if not ids:
+            return np.zeros(len(self.job_ids), dtype=np.float64)
+        rows = np.concatenate([self.indices[self.indptr[i]:self.indptr[i + 1]] for i in ids])
+        return np.bincount(rows, minlength=len(self.job_ids)).astype(np.float64)
+
+    def overlap(self, skills):
+        """Matching skills for every job (float array aligned with job_ids; related skills count RELATED_WEIGHT)"""
+        exact_ids = self.skill_ids(skills)
+        overlap = self._hits(exact_ids)
+        related_ids = self.related_ids(skills, exact_ids)
+        if related_ids:
+            overlap += RELATED_WEIGHT * self._hits(related_ids)
+        return overlap
+
+    def percent(self, overlap):
+        """Convert an overlap vector into integer match percentages"""
+        # Jobs without skills have zero overlap, so the max(count, 1) guard keeps them at 0
+        return (overlap * 100 // np.maximum(self.skill_counts, 1)).astype(np.int64)
+
+    def scores(self, skills):
+        """Integer match percentage for every job"""
+        return self.percent(self.overlap(skills))
+
+
+class SkillMatcher:
+    """Process-wide skill matrix, rebuilt after Job skill changes or ttl seconds"""
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._built_at = 0.0
+        self._rebuilding = False
+        self._generation = 0  # bumped by every skill change
+        self._built_generation = 0
+
+    def init_app(self, app):
+        job_events.subscribe(self.mark_stale, ('tagsAndSkills',))
+
+    def mark_stale(self, job_ids=None):
+        """Rebuild (in the background) on the next request"""
+        # No lock - the first build holds it, and any bump makes the generations differ
+        self._generation += 1
+
+    def matrix(self):
+        """Current matrix snapshot; a stale one is served while it rebuilds in the background"""
+        if self._matrix is None:
+            with self._lock:
+                if self._matrix is None:
+                    self._built_generation = self._generation
+                    self._matrix = self._build()
+                    self._built_at = time.monotonic()
+        elif (self._built_generation != self._generation
+              or time.monotonic() - self._built_at > self.ttl) and not self._rebuilding:
+            self._rebuilding = True
+            app = current_app._get_current_object()
+            threading.Thread(target=self._rebuild, args=(app,), daemon=True).start()
+        return self._matrix
+
+    def _rebuild(self, app):
+        generation = self._generation
+        with app.app_context():
+            try:
+                matrix = self._build()
+                with self._lock:
+                    self._matrix = matrix
+                    self._built_at = time.monotonic()
+                    # A change committed while building leaves the new matrix stale
+                    self._built_generation = generation
+            except Exception as e:
+                print(f"Skill matrix rebuild failed: {e}")
+            finally:
+                self._rebuilding = False
+
+    @staticmethod
+    def _build(batch_size=5000):
+        job_ids = []
+        job_skills = []
+        rows = db.session.query(Job.jobId, Job.tagsAndSkills).yield_per(batch_size)
+        for job_id, raw in rows:
+            job_ids.append(job_id)
+            job_skills.append(skills_cache.put(job_id, raw))
+        return SkillMatrix(job_ids, job_skills)
+
+    def invalidate(self):
+        """Force a rebuild on the next request"""
+        with self._lock:
+            self._matrix = None
+
+    def scores_for(self, skills, job_ids):
+        """{jobId: match_score} for specific jobs (e.g. one feed page)"""
+        matrix = self.matrix()
+        if not job_ids or not len(matrix.job_ids):
+            return {}
+        scores = matrix.scores(skills)
+        wanted = np.asarray(job_ids, dtype=np.int64)
+        pos = np.searchsorted(matrix.job_ids, wanted)
+        pos = np.minimum(pos, len(matrix.job_ids) - 1)
+        found = matrix.job_ids[pos] == wanted
+        return {int(j): int(scores[p]) for j, p, ok in zip(wanted, pos, found) if ok}
+
+    def top_matches(self, skills, offset=0, limit=10, candidates=None):
+        """Return (jobIds, scores, has_more) ranked by match_score, best first
+
+        Ties are broken by number of matching skills, then newest jobId.
+        Jobs with no overlapping skill are not returned. candidates (jobId
+        array) restricts ranking to those jobs.
+        """
+        matrix = self.matrix()
+        overlap = matrix.overlap(skills)
+        if candidates is not None:
+            overlap = np.where(np.isin(matrix.job_ids, candidates), overlap, 0)
+        scores = matrix.percent(overlap)
+
+        candidates = np.flatnonzero(overlap)
+        end = offset + limit
+        if end < len(candidates):
+            # Only order the top `end` rows - argpartition is O(n)
+            keep = np.argpartition(-scores[candidates], end - 1)[:end]
+            threshold = scores[candidates[keep]].min()
+            candidates = candidates[scores[candidates] >= threshold]
+
+        order = np.lexsort((-matrix.job_ids[candidates], -overlap[candidates], -scores[candidates]))
+        ranked = candidates[order]
+        page = ranked[offset:end]
+        has_more = bool(end < np.count_nonzero(overlap))
+        return matrix.job_ids[page].tolist(), scores[page].tolist(), has_more
+
+
+skill_matcher = SkillMatcher()
@@ -0,0 +1,176 @@
+"""
+Skill / synonym taxonomy
+
+app/data/skill_taxonomy.json has two sections:
+
+- synonyms: canonical skill -> aliases that name the same skill (spelling,
+  abbreviation, version: "postgres" -> "postgresql"). Only these collapse
+  into one key, so an alias must mean that skill wherever it appears - short
+  forms that name something else in free text ("cv" for a resume, "node",
+  "py", "ts", "dl", "sem") are left out.
+- related: parent skill -> narrower skills ("sql" -> "mysql", "postgresql").
+  A related skill is never the same skill; matching gives it RELATED_WEIGHT
+  of an exact match.
+
+They are compiled into:
+
+- a hash of normalized phrases, so canonicalize("ML") == "machine learning"
+- a token trie, so canonical skills can be spotted inside longer text
+  ("Senior ML Engineer") with one left-to-right pass
+- parent / child sets for the related relation
+
+Search indexing and match scoring both go through this module, so expansion
+happens once at index time instead of as extra OR clauses per query.
+"""
+
+import json
+import os
+import re
+import threading
+
+
+# Shared with the job search tokenizer: lowercase alphanumerics, keeping '+'
+# and '#' so c++ / c# survive
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'skill_taxonomy.json')
+
+# Trie node key marking the end of a phrase
+_END = ''
+
+# Credit for a related (parent / child / sibling) skill relative to an exact match
+RELATED_WEIGHT = 0.5
+
+
+def phrase_tokens(text):
+    """Tokenize a skill phrase (no stop-word removal - 'ruby on rails' keeps 'on')"""
+    return tuple(TOKEN_RE.findall(str(text).lower())) if text else ()
+
+
+class SkillTaxonomy:
+    """Compiled alias -> canonical skill normalizer with a parent / child relation"""
+
+    def __init__(self, mapping, related=None):
+        self._canonical = {}  # phrase key -> canonical skill
+        self._trie = {}
+        related = related or {}
+        # Skills only named in the relation are canonical skills without aliases
+        mapping = dict(mapping)
+        for parent, children in related.items():
+            for skill in [parent] + list(children):
+                if skill not in mapping:
+                    mapping[skill] = []
+        for canonical, aliases in mapping.items():
+            canonical = ' '.join(str(canonical).lower().split())
+            for phrase in [canonical] + list(aliases):
+                tokens = phrase_tokens(phrase)
+                if not tokens:
+                    continue
+                # First mapping wins if an alias is listed twice
+                self._canonical.setdefault(' '.join(tokens), canonical)
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END, canonical)
+
+        self._parents = {}  # canonical -> set of canonical parents
+        self._children = {}  # canonical -> set of canonical children
+        for parent, children in related.items():
+            parent = self.canonicalize(parent)
+            for child in children:
+                child = self.canonicalize(child)
+                if child != parent:
+                    self._parents.setdefault(child, set()).add(parent)
+                    self._children.setdefault(parent, set()).add(child)
+
+    @classmethod
+    def load(cls, path=DEFAULT_TAXONOMY_PATH):
+        """Build a taxonomy from a JSON file of {"synonyms": {...}, "related": {...}}
+
+        A plain {canonical: [aliases]} file (no sections) is read as synonyms only.
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if 'synonyms' in data:
+            return cls(data['synonyms'], data.get('related'))
+        return cls(data)
+
+    def canonicalize(self, skill):
+        """Canonical form of one skill string (normalized text if it is not in the taxonomy)"""
+        key = ' '.join(phrase_tokens(skill))
+        return self._canonical.get(key, key)
+
+    def canonicalize_all(self, skills):
+        """Distinct canonical skills for a list, in first-seen order"""
+        seen = {}
+        for skill in skills or ():
+            canonical = self.canonicalize(skill)
+            if canonical:
+                seen.setdefault(canonical, None)
+        return list(seen)
+
+    def parents(self, skill):
+        """Canonical parents of a canonical skill ("mysql" -> {"sql"})"""
+        return frozenset(self._parents.get(skill, ()))
+
+    def related(self, skill):
+        """Canonical skills related to a canonical skill - parents, children and siblings"""
+        related = set(self._parents.get(skill, ()))
+        related.update(self._children.get(skill, ()))
+        for parent in self._parents.get(skill, ()):
+            related.update(self._children[parent])
+        related.discard(skill)
+        return related
+
+    def find(self, tokens):
+        """Canonical skills mentioned in a token sequence (longest match at each position)"""
+        found = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = self._trie
+            match = None
+            j = i
+            while j < n and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    match = (node[_END], j)
+            if match:
+                found.append(match[0])
+                i = match[1]
+            else:
+                i += 1
+        return found
+
+    def __contains__(self, skill):
+        return ' '.join(phrase_tokens(skill)) in self._canonical
+
+
+_taxonomy = None
+_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """Process-wide taxonomy, loaded from the data file on first use"""
+    global _taxonomy
+    if _taxonomy is None:
+        with _lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.load(os.getenv('SKILL_TAXONOMY_PATH', DEFAULT_TAXONOMY_PATH))
+    return _taxonomy
+
+
+def canonicalize(skill):
+    """Canonical form of one skill string"""
+    return get_taxonomy().canonicalize(skill)
+
+
+def canonicalize_all(skills):
+    """Distinct canonical skills for a list"""
+    return get_taxonomy().canonicalize_all(skills)
+
+
+def related_skills(skill):
+    """Canonical skills related to (but not the same as) a canonical skill"""
+    return get_taxonomy().related(skill)
@@ -0,0 +1,129 @@
+"""
+Process-wide parsed skills cache for Job.tagsAndSkills
+
+tagsAndSkills is a VARCHAR(MAX) JSON array that every feed card, detail page
+and match computation used to json.loads again. This cache keeps each job's
+skills as a tuple of interned strings keyed by jobId, bounded by LRU
+eviction, and is invalidated from Job commits. With SKILLS_CACHE_WARMUP the
+newest max_size jobs are bulk-loaded in a background thread at startup, so
+workers do not start cold.
+"""
+
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+from app.database import db
+from app.models.db_models import Job
+from app.utils import job_events
+
+
+_MISSING = object()
+
+
+def parse_skills(raw):
+    """Parse tagsAndSkills (JSON array, falling back to comma-separated text)"""
+    if not raw:
+        return []
+    try:
+        skills = json.loads(raw)
+    except (ValueError, TypeError):
+        return [s.strip() for s in raw.split(',') if s.strip()]
+    if isinstance(skills, list):
+        return [str(s) for s in skills if s]
+    return []
+
+
+def intern_skills(raw):
+    """Parse a tagsAndSkills value into a tuple of interned skill strings"""
+    return tuple(sys.intern(skill.strip()) for skill in parse_skills(raw) if skill.strip())
+
+
+class SkillsCache:
+    """Bounded jobId -> skills tuple cache"""
+
+    def __init__(self, max_size=200000):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._skills = OrderedDict()
+
+    def init_app(self, app):
+        job_events.subscribe(self.invalidate, ['tagsAndSkills'])
+        if app.config.get('SKILLS_CACHE_WARMUP', True):
+            thread = threading.Thread(target=self._warm, args=(app,), daemon=True)
+            thread.start()
+
+    def _warm(self, app):
+        with app.app_context():
+            try:
+                self.warm()
+            except Exception as e:
+                print(f"Skills cache warm-up failed: {e}")
+
+    def put(self, job_id, raw):
+        """Parse and store a raw tagsAndSkills value; returns the parsed tuple"""
+        skills = intern_skills(raw)
+        with self._lock:
+            self._skills[job_id] = skills
+            self._skills.move_to_end(job_id)
+            while len(self._skills) > self.max_size:
+                self._skills.popitem(last=False)
+        return skills
+
+    def get(self, job_id, raw=_MISSING):
+        """Cached skills for a job
+
+        On a miss the raw tagsAndSkills value is parsed when given, otherwise
+        it is loaded from the database.
+        """
+        with self._lock:
+            skills = self._skills.get(job_id)
+            if skills is not None:
+                self._skills.move_to_end(job_id)
+                return skills
+        if raw is _MISSING:
+            return self.get_many([job_id]).get(job_id, ())
+        return self.put(job_id, raw)
+
+    def get_many(self, job_ids, chunk_size=500):
+        """{jobId: skills} for many jobs, loading all misses in chunked queries"""
+        found = {}
+        missing = []
+        with self._lock:
+            for job_id in job_ids:
+                skills = self._skills.get(job_id)
+                if skills is None:
+                    missing.append(job_id)
+                else:
+                    self._skills.move_to_end(job_id)
+                    found[job_id] = skills
+
+        # Chunk the IN list - SQL Server caps a statement at 2100 parameters
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start:start + chunk_size]
+            rows = db.session.query(Job.jobId, Job.tagsAndSkills).filter(Job.jobId.in_(chunk)).all()
+            for job_id, raw in rows:
+                found[job_id] = self.put(job_id, raw)
+        return found
+
+    def warm(self, batch_size=5000):
+        """Bulk-load skills for the whole catalogue (up to max_size jobs)"""
+        rows = db.session.query(Job.jobId, Job.tagsAndSkills).order_by(Job.jobId.desc()).limit(self.max_size)
+        count = 0
+        for job_id, raw in rows.yield_per(batch_size):
+            self.put(job_id, raw)
+            count += 1
+        return count
+
+    def invalidate(self, job_ids):
+        """Drop cached entries for changed jobs"""
+        with self._lock:
+            for job_id in job_ids:
+                self._skills.pop(job_id, None)
+
+    def __len__(self):
+        return len(self._skills)
+
+
+skills_cache = SkillsCache()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Microbenchmark: ORM list queries vs read-only card rows
+
+Times the same page of cards loaded three ways - full ORM instances
+(Model.query), ORM with load_only(card columns), and CardQuery namedtuple rows
+- and reports CPU time and allocated bytes per row (tracemalloc). It then
+times one courses.browse page (12 cards) with every Course column loaded, with
+the deferred column groups, and with the CourseCard projection, and reports
+the bytes the database sends back for each.
+
+    python benchmark_card_reads.py              # against the configured database
+    python benchmark_card_reads.py --synthetic  # in-memory SQLite with generated rows
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+
+
+ROWS = 500
+REPEATS = 20
+BROWSE_PAGE = 12
+
+
+def seed_synthetic(n=ROWS):
+    """Fill an empty in-memory database with n jobs and n courses"""
+    from app.models.db_models import Course, Job
+
+    db.create_all()
+    text = '<p>' + 'Build and maintain data pipelines. ' * 40 + '</p>'
+    db.session.add_all(Job(
+        jobId=i, title=f'Engineer {i}', companyName='Company', companyId=i, location='Bengaluru, Pune',
+        experience='2-5 Yrs', salary='10-15 Lacs PA', currency='INR', minimumSalary=1000000.0,
+        maximumSalary=1500000.0, minimumExperience=2.0, maximumExperience=5.0, ReviewsCount=10.0,
+        AggregateRating=4.1, jobUploaded='1 day ago', jobDescription=text, description_text=text,
+        description_snippet=text[:280], tagsAndSkills='["Python", "SQL"]',
+    ) for i in range(1, n + 1))
+    db.session.add_all(Course(
+        url=f'https://example.com/course/{i}', course_name=f'Course {i}', organization='University',
+        instructor='Instructor', provider='Coursera', rating='4.7', level='Beginner', Duration=20.0,
+        description=text, reviews=text, course_titles=text, owners=text, primary_description=text,
+        tertiary_description=text, secondary_description=text, tags='["python"]',
+    ) for i in range(1, n + 1))
+    db.session.commit()
+
+
+def measure(label, load, rows):
+    """Print ms/page and bytes/row for one loader"""
+    db.session.expunge_all()
+    load()  # warm statement caches
+    db.session.expunge_all()
+
+    start = time.process_time()
+    for _ in range(REPEATS):
+        load()
+        db.session.expunge_all()
+    cpu_ms = (time.process_time() - start) * 1000 / REPEATS
+
+    tracemalloc.start()
+    result = load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.expunge_all()
+
+    print(f"  {label:<24} {cpu_ms:8.2f} ms/page  {peak / max(len(result), 1):8.0f} B/row peak  ({len(result)} rows)")
+    return cpu_ms
+
+
+def payload_bytes(stmt):
+    """Size of the values a statement returns - a proxy for bytes on the wire"""
+    total = 0
+    for row in db.session.execute(stmt):
+        for value in row:
+            if value is None:
+                continue
+            total += len(value.encode('utf-8')) if isinstance(value, str) else 8
+    return total
+
+
+def measure_browse_page():
+    """ms and bytes for one courses.browse page, before and after the card projection"""
+    from sqlalchemy import inspect, select
+    from sqlalchemy.orm import undefer
+    from app.models.db_models import Course
+    from app.routes.courses import course_cards
+
+    attrs = inspect(Course).column_attrs
+    eager = select(*[a.columns[0] for a in attrs if not a.deferred])
+    loaders = (
+        ('every column (before)', Course.query.options(undefer('*')), select(*Course.__table__.columns)),
+        ('deferred groups', Course.query, eager),
+        ('CourseCard projection', course_cards(), course_cards().stmt),
+    )
+    print(f"\ncourses.browse page ({BROWSE_PAGE} rows)")
+    baseline = None
+    for label, query, stmt in loaders:
+        size = payload_bytes(stmt.order_by(Course.url).limit(BROWSE_PAGE))
+        cpu_ms = measure(label, query.order_by(Course.url).limit(BROWSE_PAGE).all, BROWSE_PAGE)
+        baseline = baseline or (size, cpu_ms)
+        print(f"  {'':<24} {size:8d} B/page sent  ({size / baseline[0]:.0%} of bytes, {cpu_ms / baseline[1]:.0%} of ms)")
+
+
+def run_benchmark():
+    """Compare ORM and card-row reads for jobs and courses"""
+    print("=" * 60)
+    print("Card read path benchmark")
+    print("=" * 60)
+
+    synthetic = '--synthetic' in sys.argv
+    app = create_app('testing' if synthetic else 'development')
+
+    with app.app_context():
+        try:
+            from sqlalchemy.orm import load_only
+            from app.models.db_models import Course, Job
+            from app.utils.read_models import CardQuery
+
+            if synthetic:
+                print(f"\nSeeding {ROWS} synthetic jobs and courses...")
+                seed_synthetic()
+
+            for model, key in ((Job, Job.jobId), (Course, Course.url)):
+                columns = model.CARD_COLUMNS
+                print(f"\n{model.__name__} ({len(model.__table__.columns)} mapped columns, {len(columns)} card columns)")
+                orm = measure('ORM (Model.query)', lambda: model.query.order_by(key).limit(ROWS).all(), ROWS)
+                measure('ORM + load_only', lambda: model.query.options(
+                    load_only(*[getattr(model, c) for c in columns])).order_by(key).limit(ROWS).all(), ROWS)
+                card = measure('CardQuery (Core)', lambda: CardQuery(model, columns).order_by(key).limit(ROWS).all(), ROWS)
+                print(f"  → card rows take {card / orm:.0%} of the full ORM CPU time")
+
+            measure_browse_page()
+
+            print("\n✓ Benchmark complete")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Benchmark failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == '__main__':
+    success = run_benchmark()
+    sys.exit(0 if success else 1)
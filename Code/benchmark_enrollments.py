@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+Load benchmark: concurrent enrollments into one event
+
+Fires a burst of enroll requests at a single capped event from a thread pool
+(each request gets its own session, like a web worker) and reports
+throughput, outcomes, errors and oversell - enrolled rows beyond
+max_participants - for two paths:
+
+- legacy: the old events.enroll read-check-count-insert sequence
+- engine: utils/event_enrollment.py (conditional UPDATE seat reservation,
+  FIFO waitlist)
+
+Requests are spread over a pool of benchmark users, so with more requests
+than users the same user also enrolls concurrently (the duplicate case).
+Benchmark users and events are created for the run and deleted afterwards.
+
+    python benchmark_enrollments.py                  # against the configured database
+    python benchmark_enrollments.py --synthetic      # throwaway SQLite file
+    python benchmark_enrollments.py --requests 5000 --workers 32 --seats 100 --users 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+
+
+EMAIL_DOMAIN = 'enroll-benchmark.invalid'
+
+
+def legacy_enroll(user_id, event_id):
+    """events.enroll before the enrollment engine (three queries, no lock)"""
+    from app.models.db_models import Event, EventEnrollment
+
+    event = db.session.get(Event, event_id)
+    existing = EventEnrollment.query.filter_by(event_id=event_id, user_id=user_id).first()
+    if existing:
+        if existing.status == 'enrolled':
+            return 'already_enrolled'
+        existing.status = 'enrolled'
+        db.session.commit()
+        return 'enrolled'
+
+    if event.max_participants:
+        current = EventEnrollment.query.filter_by(event_id=event_id, status='enrolled').count()
+        if current >= event.max_participants:
+            return 'full'
+
+    db.session.add(EventEnrollment(user_id=user_id, event_id=event_id, status='enrolled'))
+    db.session.commit()
+    return 'enrolled'
+
+
+def engine_enroll(user_id, event_id):
+    from app.utils.event_enrollment import enrollment_engine
+    return enrollment_engine.enroll(user_id, event_id).outcome
+
+
+def create_users(count):
+    """Benchmark users (reused across runs); returns their ids"""
+    from app.models.db_models import User
+
+    existing = db.session.query(User.id).filter(User.email.like(f'%@{EMAIL_DOMAIN}')).count()
+    db.session.add_all(
+        User(email=f'user{i}@{EMAIL_DOMAIN}', name=f'Benchmark {i}', password_hash='!')
+        for i in range(existing, count)
+    )
+    db.session.commit()
+    return [user_id for user_id, in db.session.query(User.id).filter(
+        User.email.like(f'%@{EMAIL_DOMAIN}')).order_by(User.id).limit(count)]
+
+
+def cleanup(user_ids, event_ids):
+    from app.models.db_models import Event, EventEnrollment, User
+
+    db.session.query(EventEnrollment).filter(EventEnrollment.event_id.in_(event_ids)).delete(synchronize_session=False)
+    db.session.query(Event).filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
+    for i in range(0, len(user_ids), 500):  # SQL Server caps a statement at 2100 parameters
+        db.session.query(User).filter(User.id.in_(user_ids[i:i + 500])).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def run_burst(app, label, enroll, user_ids, args):
+    """Fire args.requests enrolls at a fresh event; prints and returns the event id"""
+    from app.models.db_models import Event, EventEnrollment
+
+    event = Event(creator_id=user_ids[0], title=f'Enrollment benchmark ({label})',
+                  event_type='workshop', max_participants=args.seats)
+    db.session.add(event)
+    db.session.commit()
+    event_id = event.id
+
+    def request(i):
+        with app.app_context():
+            try:
+                return enroll(user_ids[i % len(user_ids)], event_id)
+            except Exception as e:
+                db.session.rollback()
+                return f'error: {type(e).__name__}'
+            finally:
+                db.session.remove()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        outcomes = Counter(pool.map(request, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    db.session.expire_all()
+    enrolled = EventEnrollment.query.filter_by(event_id=event_id, status='enrolled').count()
+    counter = db.session.get(Event, event_id).enrolled_count
+    oversold = max(enrolled - args.seats, 0)
+    errors = sum(n for outcome, n in outcomes.items() if outcome.startswith('error'))
+
+    print(f"\n{label}")
+    print(f"  {args.requests / elapsed:8.0f} enrolls/s   ({elapsed * 1000:.0f} ms for {args.requests})")
+    print(f"  {enrolled:8d} enrolled of {args.seats} seats   counter {counter}")
+    print(f"  {oversold:8d} oversold   {errors} errors")
+    for outcome, n in sorted(outcomes.items()):
+        print(f"    {outcome:<32} {n:6d}")
+    return event_id, oversold
+
+
+def run_benchmark():
+    """Compare the legacy and engine enroll paths under one burst"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--synthetic', action='store_true', help='use a throwaway SQLite file')
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--seats', type=int, default=100)
+    parser.add_argument('--users', type=int, default=1000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Event enrollment load benchmark")
+    print("=" * 60)
+    print(f"{args.requests} enrolls, {args.workers} workers, {args.seats} seats, {args.users} users")
+
+    if args.synthetic:
+        from app.config import config, TestingConfig
+
+        class BenchmarkConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'enrollments.db')
+            SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 60}}
+
+        config['benchmark'] = BenchmarkConfig
+        app = create_app('benchmark')
+    else:
+        app = create_app('development')
+    app.config['EVENT_SEATS_RECONCILE_INTERVAL'] = 0
+
+    with app.app_context():
+        user_ids, event_ids = [], []
+        try:
+            if args.synthetic:
+                db.create_all()
+            user_ids = create_users(args.users)
+
+            results = {}
+            for label, enroll in (('legacy (read, count, insert)', legacy_enroll),
+                                  ('engine (conditional UPDATE + waitlist)', engine_enroll)):
+                event_id, oversold = run_burst(app, label, enroll, user_ids, args)
+                event_ids.append(event_id)
+                results[label] = oversold
+
+            print(f"\n✓ Benchmark complete - oversold: " +
+                  ", ".join(f"{label.split()[0]} {n}" for label, n in results.items()))
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Benchmark failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+        finally:
+            if user_ids:
+                cleanup(user_ids, event_ids)
+
+
+if __name__ == '__main__':
+    success = run_benchmark()
+    sys.exit(0 if success else 1)
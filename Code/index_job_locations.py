@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Build the job_locations table from jobs.location
+
+Creates job_locations (canonical city ids per job, indexed by city) if it is
+missing and fills it for every job. New and edited jobs are kept in step by
+the ORM hooks in app/utils/job_locations.py (deleted jobs take their rows
+with them); rerun this after bulk loads or deletes that bypass the ORM.
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+from sqlalchemy import text
+
+
+def create_job_locations_table():
+    """Create job_locations and its city index if they do not exist"""
+    db.session.execute(text(
+        "IF NOT EXISTS (SELECT 1 FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = 'job_locations') "
+        "CREATE TABLE job_locations ("
+        "    jobId BIGINT NOT NULL,"
+        "    city NVARCHAR(100) NOT NULL,"
+        "    CONSTRAINT pk_job_locations PRIMARY KEY (jobId, city)"
+        ")"
+    ))
+    db.session.execute(text(
+        "IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'idx_job_locations_city') "
+        "CREATE INDEX idx_job_locations_city ON job_locations (city, jobId)"
+    ))
+    db.session.commit()
+    print("✓ Table job_locations and index idx_job_locations_city are in place")
+
+
+def index_job_locations():
+    """Normalize every job's location into job_locations"""
+    print("=" * 60)
+    print("Indexing job locations")
+    print("=" * 60)
+
+    app = create_app('development')
+
+    with app.app_context():
+        try:
+            print("\nChecking table...")
+            create_job_locations_table()
+
+            print("\nNormalizing locations...")
+            from app.utils.job_locations import index_all, prune_orphans
+            indexed = index_all()
+
+            print("\nRemoving rows of deleted jobs...")
+            pruned = prune_orphans()
+
+            print(f"\n✓ Done - {indexed} jobs indexed, {pruned} orphaned rows removed")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Indexing failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+
+if __name__ == '__main__':
+    success = index_job_locations()
+    sys.exit(0 if success else 1)
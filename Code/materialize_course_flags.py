@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Pack Course has_* content flags into the content_flags bitmask
+
+Adds content_flags and its index to the courses table if missing, then packs
+the eleven has_* columns of every course into it (one set-based UPDATE).
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+from sqlalchemy import text
+
+
+def add_flags_column():
+    """Add content_flags and idx_course_content_flags to the courses table"""
+    result = db.session.execute(text(
+        "SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS "
+        "WHERE TABLE_NAME = 'courses' AND COLUMN_NAME = 'content_flags'"
+    ))
+    if result.fetchone()[0]:
+        print("✓ Column 'content_flags' already exists in courses table")
+    else:
+        db.session.execute(text("ALTER TABLE courses ADD content_flags INT"))
+        db.session.commit()
+        print("✓ Added column 'content_flags' to courses table")
+
+    # url is VARCHAR(MAX) - it cannot be a key column, only an included one
+    db.session.execute(text(
+        "IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'idx_course_content_flags') "
+        "CREATE INDEX idx_course_content_flags ON courses (content_flags) INCLUDE (url)"
+    ))
+    db.session.commit()
+    print("✓ Index 'idx_course_content_flags' is in place")
+
+
+def materialize_course_flags():
+    """Add the column and pack every course's content flags"""
+    print("=" * 60)
+    print("Packing course content flags")
+    print("=" * 60)
+
+    app = create_app('development')
+
+    with app.app_context():
+        try:
+            print("\nChecking column...")
+            add_flags_column()
+
+            print("\nPacking has_* flags...")
+            from app.utils.course_flags import backfill
+            written = backfill()
+
+            print(f"\n✓ Done - {written} courses updated")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Packing failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+
+if __name__ == '__main__':
+    success = materialize_course_flags()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Materialize typed rating / review / enrollment columns for courses
+
+Adds rating_value, review_count and enrollment_count to the courses table
+plus their sort indexes if missing, then parses Course.rating, nu_reviews
+and enrollments into them for every row whose shadow is NULL. Pass --all to
+re-parse every course.
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+from sqlalchemy import text
+
+
+def add_metric_columns():
+    """Add the typed shadow columns and their indexes to the courses table"""
+    columns = {
+        'rating_value': 'FLOAT',
+        'review_count': 'BIGINT',
+        'enrollment_count': 'BIGINT',
+    }
+    for column_name, column_type in columns.items():
+        result = db.session.execute(text(
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS "
+            "WHERE TABLE_NAME = 'courses' AND COLUMN_NAME = :column"
+        ), {'column': column_name})
+        if result.fetchone()[0]:
+            print(f"✓ Column '{column_name}' already exists in courses table")
+            continue
+        db.session.execute(text(f"ALTER TABLE courses ADD {column_name} {column_type}"))
+        db.session.commit()
+        print(f"✓ Added column '{column_name}' to courses table")
+
+    # url is VARCHAR(MAX) - it cannot be a key column, only an included one
+    indexes = {
+        'idx_course_rating_value': 'rating_value',
+        'idx_course_enrollment_count': 'enrollment_count',
+        'idx_course_duration': 'Duration',
+    }
+    for index_name, column_name in indexes.items():
+        db.session.execute(text(
+            f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{index_name}') "
+            f"CREATE INDEX {index_name} ON courses ({column_name}) INCLUDE (url)"
+        ))
+        db.session.commit()
+        print(f"✓ Index '{index_name}' is in place")
+
+
+def materialize_course_metrics(only_missing=True):
+    """Add columns and backfill the parsed course metrics"""
+    print("=" * 60)
+    print("Materializing course metrics")
+    print("=" * 60)
+
+    app = create_app('development')
+
+    with app.app_context():
+        try:
+            print("\nChecking columns...")
+            add_metric_columns()
+
+            print("\nParsing ratings, reviews and enrollments...")
+            from app.utils.course_metrics import backfill
+            written = backfill(only_missing=only_missing)
+
+            print(f"\n✓ Done - {written} course values updated")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Materialization failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+
+if __name__ == '__main__':
+    success = materialize_course_metrics(only_missing='--all' not in sys.argv)
+    sys.exit(0 if success else 1)
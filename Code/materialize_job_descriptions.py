@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Materialize plain-text job descriptions and summary snippets
+
+Adds description_text / description_snippet to the jobs table if missing,
+then fills them for every job whose snippet is NULL (bulk-loaded rows).
+Pass --all to re-render every job.
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+from sqlalchemy import text
+
+
+def add_text_columns():
+    """Add the materialized text columns to the jobs table"""
+    columns = {
+        'description_text': 'NVARCHAR(MAX)',
+        'description_snippet': 'NVARCHAR(300)',
+    }
+    for column_name, column_type in columns.items():
+        result = db.session.execute(text(
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS "
+            "WHERE TABLE_NAME = 'jobs' AND COLUMN_NAME = :column"
+        ), {'column': column_name})
+        if result.fetchone()[0]:
+            print(f"✓ Column '{column_name}' already exists in jobs table")
+            continue
+        db.session.execute(text(f"ALTER TABLE jobs ADD {column_name} {column_type}"))
+        db.session.commit()
+        print(f"✓ Added column '{column_name}' to jobs table")
+
+
+def materialize_job_descriptions(only_missing=True):
+    """Add columns and backfill plain-text descriptions"""
+    print("=" * 60)
+    print("Materializing job descriptions")
+    print("=" * 60)
+
+    app = create_app('development')
+
+    with app.app_context():
+        try:
+            print("\nChecking columns...")
+            add_text_columns()
+
+            print("\nRendering descriptions...")
+            from app.utils.job_text import backfill
+            written = backfill(only_missing=only_missing)
+
+            print(f"\n✓ Done - {written} jobs updated")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Materialization failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+
+if __name__ == '__main__':
+    success = materialize_job_descriptions(only_missing='--all' not in sys.argv)
+    sys.exit(0 if success else 1)
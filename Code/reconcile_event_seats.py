@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Add and reconcile Event.enrolled_count
+
+Adds the enrolled_count column to the events table if missing, then
+recomputes it for every event from the 'enrolled' rows of event_enrollments
+(one set-based UPDATE). Safe to run on a schedule; the app also reconciles
+every EVENT_SEATS_RECONCILE_INTERVAL seconds.
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+from sqlalchemy import text
+
+
+def add_counter_column():
+    """Add enrolled_count to the events table"""
+    result = db.session.execute(text(
+        "SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS "
+        "WHERE TABLE_NAME = 'events' AND COLUMN_NAME = 'enrolled_count'"
+    ))
+    if result.fetchone()[0]:
+        print("✓ Column 'enrolled_count' already exists in events table")
+        return
+    db.session.execute(text(
+        "ALTER TABLE events ADD enrolled_count INT NOT NULL "
+        "CONSTRAINT df_events_enrolled_count DEFAULT 0"
+    ))
+    db.session.commit()
+    print("✓ Added column 'enrolled_count' to events table")
+
+
+def reconcile_event_seats():
+    """Add the column and recompute every event's seat counter"""
+    print("=" * 60)
+    print("Reconciling event seat counters")
+    print("=" * 60)
+
+    app = create_app('development')
+
+    with app.app_context():
+        try:
+            print("\nChecking column...")
+            add_counter_column()
+
+            print("\nRecounting enrollments...")
+            from app.utils.event_seats import reconcile
+            corrected = reconcile()
+
+            print(f"\n✓ Done - {corrected} events corrected")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Reconcile failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+
+if __name__ == '__main__':
+    success = reconcile_event_seats()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Resolve application URLs for jobs in bulk
+
+Fills jobs.application_url so the apply endpoint never resolves (or writes)
+inside a request. By default only jobs where application_url IS NULL are
+processed; pass --all to re-resolve every job.
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+from sqlalchemy import text
+
+
+def add_application_url_index():
+    """Covering index so jobs.apply is a single seek on jobId"""
+    db.session.execute(text(
+        "IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'idx_jobs_jobid_application_url') "
+        "CREATE INDEX idx_jobs_jobid_application_url ON jobs (jobId) INCLUDE (application_url)"
+    ))
+    db.session.commit()
+    print("✓ Index idx_jobs_jobid_application_url is in place")
+
+
+def resolve_application_urls(only_missing=True):
+    """Resolve application URLs for all jobs"""
+    print("=" * 60)
+    print("Resolving job application URLs")
+    print("=" * 60)
+
+    app = create_app('development')
+
+    with app.app_context():
+        try:
+            print("\nChecking index...")
+            add_application_url_index()
+
+            print(f"\nResolving {'missing' if only_missing else 'all'} application URLs...")
+            from app.utils.application_urls import resolve_all
+            written = resolve_all(only_missing=only_missing)
+
+            print(f"\n✓ Done - {written} jobs updated")
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Resolution failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+
+if __name__ == '__main__':
+    success = resolve_application_urls(only_missing='--all' not in sys.argv)
+    sys.exit(0 if success else 1)
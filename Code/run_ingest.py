@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Run the ingest pass for newly loaded jobs and courses
+
+Creates ingest_watermarks if it is missing, then processes every job above
+the stored watermark: renders description_text/description_snippet and sends
+saved-search alerts (see app/utils/ingest.py). Courses have no id to
+watermark; their typed metric shadows and content_flags are filled wherever
+still missing (these sweeps run only here, not in the web workers). Loaders
+that write jobs or courses outside the ORM should call this after each load;
+web workers also run the jobs pass every INGEST_INTERVAL seconds, and
+claimed batches are never processed twice.
+
+Alerts reach connected users only when SOCKETIO_MESSAGE_QUEUE points at the
+message queue the web workers use.
+
+    python run_ingest.py                 # process everything above the watermark
+    python run_ingest.py --since 41000   # first run: start after jobId 41000 instead of the current max
+"""
+
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app
+from app.database import db
+from sqlalchemy import text
+
+
+def create_watermark_table():
+    """Create ingest_watermarks if it does not exist"""
+    db.session.execute(text(
+        "IF NOT EXISTS (SELECT 1 FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = 'ingest_watermarks') "
+        "CREATE TABLE ingest_watermarks ("
+        "    name NVARCHAR(50) NOT NULL PRIMARY KEY,"
+        "    last_id BIGINT NOT NULL,"
+        "    updated_at DATETIME"
+        ")"
+    ))
+    db.session.commit()
+    print("✓ Table ingest_watermarks is in place")
+
+
+def run_ingest():
+    """Process rows loaded since the last pass"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--since', type=int, help='initial watermark when none is stored yet')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Ingest pass")
+    print("=" * 60)
+
+    app = create_app('development')
+
+    with app.app_context():
+        try:
+            print("\nChecking table...")
+            create_watermark_table()
+            if not app.config.get('SOCKETIO_MESSAGE_QUEUE'):
+                print("⚠ SOCKETIO_MESSAGE_QUEUE is not set - saved-search alerts will not reach web clients")
+
+            print("\nProcessing new rows...")
+            from app.utils.ingest import ingest
+            processed = ingest.run(start=args.since, verbose=True, sweeps=True)
+
+            print(f"\n✓ Done - " + ", ".join(f"{n} {name}" for name, n in processed.items()))
+            return True
+
+        except Exception as e:
+            print(f"\n✗ Ingest failed!")
+            print(f"Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            db.session.rollback()
+            return False
+
+
+if __name__ == '__main__':
+    success = run_ingest()
+    sys.exit(0 if success else 1)